@@ -0,0 +1,7 @@
+"""
+Punto de entrada de `python -m sudoku`: exportación masiva de puzzles (ver cli.py)
+"""
+
+from .cli import main
+
+main()
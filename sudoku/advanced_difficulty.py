@@ -5,24 +5,223 @@ Sistema avanzado de dificultad para Sudoku basado en conceptos de Matemáticas D
 3. Combinatoria (principio de inclusión-exclusión y coeficientes binomiales)
 """
 
+import os
 import random
+import time
 import copy
 import math
-from typing import List, Tuple, Dict, Set
+from contextlib import contextmanager
+from multiprocessing import Pool
+from typing import List, Tuple, Dict, Set, Iterator, Optional
 from collections import defaultdict
+from .annealing import ANNEALING_STEPS, SCORE_TOLERANCE, anneal
 from .board import SudokuBoard
+from .digging import dig_holes
+from .symmetry import symmetric_puzzle
+from .grid_index import (ALL_DIGITS_MASK, BOX_OF, BOX_UNITS, CELL_COL, CELL_ROW, MASK_DIGITS, NUM_CELLS,
+                         PEER_MASK, SIZE, peer_digits_mask, unit_masks)
+from .propagation import has_conflicts, propagate
+from .solvers import has_unique_solution
 from itertools import permutations
 
 HIGH_DIFFICULTY_THRESHOLD = 5.7
 
+# Rangos objetivo de final_difficulty según la clasificación
+# Ajustados para crear mayor contraste
+TARGET_RANGES = {
+    'facil': (1, 6.5),  # Puzzles fáciles
+    'dificil': (6.6, 10),  # Puzzles difíciles
+}
+DEFAULT_TARGET_RANGE = (1, 3.5)
+
 CELLS_TO_REMOVE_LOW_DIFFICULTY = 51
 CELLS_TO_REMOVE_HIGH_DIFFICULTY = 51
 
+# Estrategias de remoción de pistas:
+# - 'distribution': quitar un número fijo de celdas según la distribución de la dificultad
+#   (la unicidad se comprueba después, si se exige)
+# - 'dig': quitar pistas una a una conservando la solución única hasta target_clues
+# - 'symmetric': patrón de target_clues pistas simétrico (biblioteca de symmetry.py) y de solución única
+REMOVAL_STRATEGIES = ('distribution', 'dig', 'symmetric')
+DIG_TARGET_CLUES = NUM_CELLS - CELLS_TO_REMOVE_HIGH_DIFFICULTY
+
+# Pesos con que se combinan las métricas (en el orden de los argumentos de _combine_metrics,
+# _combine_graph_metrics y _combine_combinatorial_metrics); calculate_difficulty_batch usa los mismos
+METRIC_WEIGHTS = (
+    0.15,  # Distribución de números
+    0.15,  # Permutaciones de filas
+    0.15,  # Permutaciones de columnas
+    0.11,  # Permutaciones de bloques
+    0.15,  # Teoría de grafos
+    0.15,  # Combinatoria avanzada
+    0.14,  # Espacio de solución
+)
+GRAPH_WEIGHTS = (0.6, 0.4)  # Coeficiente de clustering, densidad del grafo
+COMBINATORIAL_WEIGHTS = (0.4, 0.4, 0.2)  # Inclusión-exclusión, coeficientes binomiales, entropía
+
+# Variaciones creadas y calificadas por cada puzzle generado
+GENERATION_ATTEMPTS = 100
+
+# Variaciones adicionales para encontrar un puzzle de solución única
+UNIQUE_FALLBACK_ATTEMPTS = 1000
+
+# Puntajes de dispersión de _create_difficult_distribution:
+# penalización por cada celda removida a distancia Manhattan <= 2 (muy cerca) o <= 4 (cerca),
+# bonus por estar en el borde y por estar en un bloque con menos de 2 celdas removidas
+NEAR_PENALTY = 3
+MID_PENALTY = 1
+EDGE_BONUS = 2
+SPARSE_BLOCK_BONUS = 1
+SPARSE_BLOCK_LIMIT = 2
+
+
+def _build_dispersion_neighbors() -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """Para cada celda, (vecina, penalización) de las celdas a distancia Manhattan entre 1 y 4"""
+    neighbors = []
+    for i in range(NUM_CELLS):
+        cells = []
+        for j in range(NUM_CELLS):
+            distance = abs(CELL_ROW[i] - CELL_ROW[j]) + abs(CELL_COL[i] - CELL_COL[j])
+            if 0 < distance <= 2:
+                cells.append((j, NEAR_PENALTY))
+            elif 2 < distance <= 4:
+                cells.append((j, MID_PENALTY))
+        neighbors.append(tuple(cells))
+    return tuple(neighbors)
+
+
+DISPERSION_NEIGHBORS = _build_dispersion_neighbors()
+
+# Puntaje inicial (sin celdas removidas) de cada celda
+BASE_DISPERSION_SCORE: Tuple[int, ...] = tuple(
+    (EDGE_BONUS if CELL_ROW[i] in (0, SIZE - 1) or CELL_COL[i] in (0, SIZE - 1) else 0) + SPARSE_BLOCK_BONUS
+    for i in range(NUM_CELLS)
+)
+
+
+@contextmanager
+def _seeded_random(seed: Optional[int]):
+    """Fija la semilla del generador global durante el bloque y restaura su estado al salir"""
+    if seed is None:
+        yield
+        return
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+
+def _mask_cells(mask: int) -> Iterator[int]:
+    """Índices 0-80 de los bits encendidos de un bitset de celdas, en orden creciente"""
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+class GenerationPolicy:
+    """Presupuesto de generate_advanced_puzzle.
+
+    - quality_threshold: la generación se detiene en cuanto un candidato dentro del
+      rango objetivo alcanza este puntaje de selección (distancia desde el borde del
+      rango hacia el extremo: 6.5 - dificultad para 'facil', dificultad - 6.6 para
+      'dificil'). None evalúa todos los intentos.
+    - max_attempts: número máximo de variaciones a evaluar.
+    - max_time: plazo en segundos; al vencer se retorna el mejor puzzle encontrado
+      hasta el momento (o el más cercano al rango si ninguno cayó dentro).
+    """
+
+    def __init__(self, quality_threshold: Optional[float] = None, max_attempts: int = GENERATION_ATTEMPTS,
+                 max_time: Optional[float] = None):
+        self.quality_threshold = quality_threshold
+        self.max_attempts = max_attempts
+        self.max_time = max_time
+
+
+def _dispersed_removal_order(cells_to_remove: int) -> List[int]:
+    """Elige las celdas a remover maximizando la dispersión (índices 0-80, en orden de remoción).
+
+    Cada celda disponible tiene un puntaje entero de dispersión (bonus de borde y de
+    bloque poco removido menos las penalizaciones por cercanía a celdas removidas).
+    En cada ronda se toma al azar una de las celdas de mayor puntaje; si ese puntaje
+    es menor que -1 se toma cualquier celda disponible. Los puntajes se actualizan de
+    forma incremental al remover una celda (solo cambian sus vecinas a distancia <= 4
+    y su bloque) y las celdas se agrupan en cubetas por puntaje, por lo que cada ronda
+    cuesta O(vecinas) en lugar de recalcular todos los puntajes contra todas las
+    celdas removidas.
+    """
+    score = list(BASE_DISPERSION_SCORE)
+    buckets: Dict[int, List[int]] = defaultdict(list)
+    slot = [0] * NUM_CELLS  # Posición de cada celda dentro de su cubeta
+    for cell in range(NUM_CELLS):
+        slot[cell] = len(buckets[score[cell]])
+        buckets[score[cell]].append(cell)
+    available = list(range(NUM_CELLS))
+    available_slot = list(range(NUM_CELLS))
+    removed = [False] * NUM_CELLS
+    block_removals = [0] * SIZE
+
+    def detach(cell: int, items: List[int], slots: List[int]):
+        last = items.pop()
+        if last != cell:
+            items[slots[cell]] = last
+            slots[last] = slots[cell]
+
+    def lower(cell: int, penalty: int):
+        detach(cell, buckets[score[cell]], slot)
+        score[cell] -= penalty
+        bucket = buckets[score[cell]]
+        slot[cell] = len(bucket)
+        bucket.append(cell)
+
+    order = []
+    top = max(score)
+    for _ in range(min(cells_to_remove, NUM_CELLS)):
+        # Los puntajes solo bajan, así que la cubeta máxima nunca sube
+        while not buckets[top]:
+            top -= 1
+        if top >= -1:
+            cell = random.choice(buckets[top])
+        else:
+            cell = random.choice(available)
+
+        detach(cell, buckets[score[cell]], slot)
+        detach(cell, available, available_slot)
+        removed[cell] = True
+        order.append(cell)
+
+        for neighbor, penalty in DISPERSION_NEIGHBORS[cell]:
+            if not removed[neighbor]:
+                lower(neighbor, penalty)
+        block = BOX_OF[cell]
+        block_removals[block] += 1
+        if block_removals[block] == SPARSE_BLOCK_LIMIT:
+            for neighbor in BOX_UNITS[block]:
+                if not removed[neighbor]:
+                    lower(neighbor, SPARSE_BLOCK_BONUS)
+    return order
+
+
+def _evaluate_variation_task(task: Tuple) -> Tuple:
+    """Función de trabajo para el pool de procesos de generate_advanced_puzzle"""
+    complete_board, target_difficulty, require_unique, seed, removal_strategy, target_clues, symmetry = task
+    system = AdvancedDifficultySystem(removal_strategy, target_clues, symmetry)
+    return system._evaluate_variation(complete_board, target_difficulty, require_unique, seed)
+
 class AdvancedDifficultySystem:
     """Sistema avanzado de dificultad con múltiples conceptos de matemáticas discretas"""
     
-    def __init__(self):
+    def __init__(self, removal_strategy: str = 'distribution', target_clues: int = DIG_TARGET_CLUES,
+                 symmetry: Optional[str] = None):
+        if removal_strategy not in REMOVAL_STRATEGIES:
+            raise ValueError(f"Estrategia de remoción desconocida: {removal_strategy!r} "
+                             f"(disponibles: {', '.join(REMOVAL_STRATEGIES)})")
         self.board = SudokuBoard()
+        self.removal_strategy = removal_strategy
+        self.target_clues = target_clues  # Pistas objetivo de las estrategias 'dig' y 'symmetric'
+        self.symmetry = symmetry  # Simetría de la estrategia 'symmetric' (None = una al azar por puzzle)
         self.permutation_difficulty = 1
         self.graph_difficulty = 1
         self.combinatorial_difficulty = 1
@@ -31,14 +230,19 @@ class AdvancedDifficultySystem:
     def calculate_difficulty(self, board_matrix: List[List[int]]) -> int:
         """Calcula la dificultad usando múltiples conceptos de matemáticas discretas"""
         
+        # Máscaras de candidatos de todas las celdas, calculadas una sola vez para todas las métricas
+        candidates = self._candidate_masks(board_matrix)
+        # Validez del tablero completo, compartida por los conteos de permutaciones de bandas y pilas
+        valid = self._is_valid_sudoku_state(board_matrix)
+        
         # 1. DISTRIBUCIÓN DE NÚMEROS (1-9)
         number_distribution = self._measure_number_distribution_uniformity(board_matrix)
         
         # 2. PERMUTACIONES DE FILAS DENTRO DE BLOQUES
-        row_permutations = self._analyze_row_permutations(board_matrix)
+        row_permutations = self._analyze_row_permutations(board_matrix, valid)
         
         # 3. PERMUTACIONES DE COLUMNAS DENTRO DE BLOQUES  
-        col_permutations = self._analyze_column_permutations_perm(board_matrix)
+        col_permutations = self._analyze_column_permutations_perm(board_matrix, valid)
         
         # 4. PERMUTACIONES DE BLOQUES 3x3
         block_permutations = self._analyze_block_permutations(board_matrix)
@@ -47,21 +251,23 @@ class AdvancedDifficultySystem:
         graph_complexity = self._analyze_constraint_graph(board_matrix)
         
         # 6. COMBINATORIA - Inclusión-exclusión y coeficientes binomiales
-        combinatorial_complexity = self._analyze_combinatorial_complexity(board_matrix)
+        combinatorial_complexity = self._analyze_combinatorial_complexity(board_matrix, candidates)
         
         # 7. CÁLCULO COMBINATORIO DE SOLUCIONES POSIBLES
-        solution_space = self._calculate_solution_space_complexity(board_matrix)
+        solution_space = self._calculate_solution_space_complexity(board_matrix, candidates)
+        
+        return self._combine_metrics(number_distribution, row_permutations, col_permutations, block_permutations,
+                                     graph_complexity, combinatorial_complexity, solution_space)
+    
+    def _combine_metrics(self, number_distribution: float, row_permutations: float, col_permutations: float,
+                         block_permutations: float, graph_complexity: float, combinatorial_complexity: float,
+                         solution_space: float) -> float:
+        """Combina las siete métricas en la dificultad 1-10 y almacena las métricas individuales"""
         
         # Combinar todas las métricas con pesos matemáticamente justificados
-        total_complexity = (
-            number_distribution * 0.15 +      # 15% - Distribución de numeros
-            row_permutations * 0.15 +         # 15% - Permutaciones de filas
-            col_permutations * 0.15 +         # 15% - Permutaciones de columnas
-            block_permutations * 0.11 +       # 11% - Permutaciones de bloques
-            graph_complexity * 0.15 +         # 15% - Teoría de grafos
-            combinatorial_complexity * 0.15 + # 15% - Combinatoria avanzada
-            solution_space * 0.14             # 14% - Espacio de solución
-        )
+        metrics = (number_distribution, row_permutations, col_permutations, block_permutations,
+                   graph_complexity, combinatorial_complexity, solution_space)
+        total_complexity = sum(metric * weight for metric, weight in zip(metrics, METRIC_WEIGHTS))
 
         # Convertir a escala 1-10 con rounding apropiado
         difficulty = max(1, min(10, round(total_complexity * 10, 1)))
@@ -73,6 +279,38 @@ class AdvancedDifficultySystem:
         
         return difficulty
     
+    def calculate_difficulty_batch(self, boards) -> Tuple['np.ndarray', Dict[str, 'np.ndarray']]:
+        """Califica un lote de tableros (arreglo (N, 9, 9) o lista de matrices 9x9) con arreglos NumPy.
+
+        Retorna las N dificultades, iguales a las de calculate_difficulty, y un
+        diccionario de arreglos (N,) con cada métrica de vectorized.difficulty_metrics,
+        las siete métricas combinadas ('graph_complexity', 'combinatorial_complexity',
+        ...) y 'permutation_difficulty', 'graph_difficulty' y 'combinatorial_difficulty'.
+        No modifica las métricas individuales del sistema. Requiere NumPy.
+        """
+        import numpy as np
+        from .vectorized import difficulty_metrics
+
+        metrics = difficulty_metrics(boards)
+        metrics['graph_complexity'] = np.minimum(1.0, sum(
+            metrics[name] * weight for name, weight in zip(('clustering', 'density'), GRAPH_WEIGHTS)))
+        metrics['combinatorial_complexity'] = np.minimum(1.0, sum(
+            metrics[name] * weight
+            for name, weight in zip(('inclusion_exclusion', 'binomial', 'entropy'), COMBINATORIAL_WEIGHTS)))
+
+        names = ('number_distribution', 'row_permutations', 'col_permutations', 'block_permutations',
+                 'graph_complexity', 'combinatorial_complexity', 'solution_space')
+        total_complexity = sum(metrics[name] * weight for name, weight in zip(names, METRIC_WEIGHTS))
+        # round de Python (no np.round) para redondear exactamente como calculate_difficulty
+        difficulty = np.array([max(1, min(10, round(value, 1))) for value in (total_complexity * 10).tolist()],
+                              dtype=float)
+
+        metrics['permutation_difficulty'] = (metrics['number_distribution'] + metrics['row_permutations'] +
+                                             metrics['col_permutations'] + metrics['block_permutations']) / 4
+        metrics['graph_difficulty'] = metrics['graph_complexity']
+        metrics['combinatorial_difficulty'] = metrics['combinatorial_complexity']
+        return difficulty, metrics
+    
     def _measure_number_distribution_uniformity(self, board_matrix: List[List[int]]) -> float:
         """Evalúa la uniformidad en la frecuencia de los números del 1 al 9 en el tablero"""
         
@@ -83,6 +321,11 @@ class AdvancedDifficultySystem:
                 if num != 0:
                     number_counts[num] += 1
         
+        return self._distribution_uniformity(number_counts)
+    
+    def _distribution_uniformity(self, number_counts: List[int]) -> float:
+        """Uniformidad a partir de la frecuencia de cada número (number_counts[1..9])"""
+        
         # Calcular distribución de números
         total_numbers = sum(number_counts[1:])
         if total_numbers == 0:
@@ -97,9 +340,11 @@ class AdvancedDifficultySystem:
 
         return min(1.0, variance / max_variance if max_variance > 0 else 0.0)
     
-    def _analyze_row_permutations(self, board_matrix: List[List[int]]) -> float:
+    def _analyze_row_permutations(self, board_matrix: List[List[int]], valid: Optional[bool] = None) -> float:
         """Analiza permutaciones válidas de filas dentro de bloques"""
         complexity_sum = 0.0
+        if valid is None:
+            valid = self._is_valid_sudoku_state(board_matrix)
         
         # Para cada bloque de 3 filas
         for block_row in range(3):
@@ -107,16 +352,18 @@ class AdvancedDifficultySystem:
             rows = [board_matrix[start_row + i] for i in range(3)]
             
             # Calcular cuántas permutaciones de estas 3 filas son válidas
-            valid_perms = self._count_valid_row_permutations(rows, board_matrix, start_row)
+            valid_perms = self._count_valid_row_permutations(rows, board_matrix, start_row, valid)
             
             # Normalizar por 3! = 6 (total de permutaciones posibles)
             complexity_sum += valid_perms / 6.0
         
         return complexity_sum / 3.0  # Promedio de los 3 bloques
     
-    def _analyze_column_permutations_perm(self, board_matrix: List[List[int]]) -> float:
+    def _analyze_column_permutations_perm(self, board_matrix: List[List[int]], valid: Optional[bool] = None) -> float:
         """Analiza permutaciones válidas de columnas dentro de bloques"""
         complexity_sum = 0.0
+        if valid is None:
+            valid = self._is_valid_sudoku_state(board_matrix)
         
         # Para cada bloque de 3 columnas
         for block_col in range(3):
@@ -127,7 +374,7 @@ class AdvancedDifficultySystem:
                 cols.append(col)
             
             # Calcular cuántas permutaciones de estas 3 columnas son válidas
-            valid_perms = self._count_valid_column_permutations(cols, board_matrix, start_col)
+            valid_perms = self._count_valid_column_permutations(cols, board_matrix, start_col, valid)
             
             # Normalizar por 3! = 6 (total de permutaciones posibles)
             complexity_sum += valid_perms / 6.0
@@ -176,103 +423,81 @@ class AdvancedDifficultySystem:
         # Las aristas conectan celdas que no pueden tener el mismo valor
         graph = self._build_constraint_graph()
         
+        # Subgrafo de las celdas vacías como bitset de 81 bits
+        empty_mask = 0
+        for cell in range(NUM_CELLS):
+            if board_matrix[CELL_ROW[cell]][CELL_COL[cell]] == 0:
+                empty_mask |= 1 << cell
+        
         # 1. Calcular coeficiente de clustering (conectividad local)
-        clustering_coefficient = self._calculate_clustering_coefficient(graph, board_matrix)
+        clustering_coefficient = self._calculate_clustering_coefficient(graph, empty_mask)
         
         # 2. Densidad del grafo de celdas vacías
-        empty_cells = sum(row.count(0) for row in board_matrix)
+        empty_cells = empty_mask.bit_count()
+        actual_edges = sum((graph[cell] & empty_mask).bit_count() for cell in _mask_cells(empty_mask)) / 2
+        
+        return self._combine_graph_metrics(clustering_coefficient, actual_edges, empty_cells)
+    
+    def _combine_graph_metrics(self, clustering_coefficient: float, actual_edges: float, empty_cells: int) -> float:
+        """Combina el clustering y la densidad (aristas entre las celdas vacías) del grafo"""
         if empty_cells <= 1:
             graph_density = 0
         else:
             max_edges = empty_cells * (empty_cells - 1) / 2
-            actual_edges = sum(len([n for n in graph[cell] if board_matrix[n[0]][n[1]] == 0]) 
-                             for i in range(9) for j in range(9) 
-                             if board_matrix[i][j] == 0 for cell in [(i, j)]) / 2
             graph_density = actual_edges / max_edges if max_edges > 0 else 0
 
         # Combinar métricas del grafo
-        graph_complexity = (
-            clustering_coefficient * 0.6 +         # Coeficiente de clustering
-            graph_density * 0.4                    # Densidad del grafo
-        )
+        graph_complexity = clustering_coefficient * GRAPH_WEIGHTS[0] + graph_density * GRAPH_WEIGHTS[1]
         
         return min(1.0, graph_complexity)
     
-    def _build_constraint_graph(self) -> Dict[Tuple[int, int], Set[Tuple[int, int]]]:
-        """Construye el grafo de restricciones del Sudoku"""
-        graph = defaultdict(set)
-        
-        for i in range(9):
-            for j in range(9):
-                cell = (i, j)
-                
-                # Conexiones por fila
-                for k in range(9):
-                    if k != j:
-                        graph[cell].add((i, k))
-                
-                # Conexiones por columna
-                for k in range(9):
-                    if k != i:
-                        graph[cell].add((k, j))
-                
-                # Conexiones por caja 3x3
-                box_start_row, box_start_col = 3 * (i // 3), 3 * (j // 3)
-                for r in range(box_start_row, box_start_row + 3):
-                    for c in range(box_start_col, box_start_col + 3):
-                        if (r, c) != cell:
-                            graph[cell].add((r, c))
-        
-        return graph
+    def _build_constraint_graph(self) -> Tuple[int, ...]:
+        """Retorna el grafo de restricciones del Sudoku como bitsets de adyacencia por celda 0-80
+        (precalculado una sola vez en grid_index)"""
+        return PEER_MASK
     
-    def _calculate_clustering_coefficient(self, graph: Dict, board_matrix: List[List[int]]) -> float:
-        """Calcula el coeficiente de clustering del grafo"""
+    def _calculate_clustering_coefficient(self, graph: Tuple[int, ...], empty_mask: int) -> float:
+        """Calcula el coeficiente de clustering del subgrafo de celdas vacías (bitset empty_mask)"""
         clustering_sum = 0
-        empty_cells = []
-        
-        for i in range(9):
-            for j in range(9):
-                if board_matrix[i][j] == 0:
-                    empty_cells.append((i, j))
+        empty_cells = empty_mask.bit_count()
         
-        if len(empty_cells) < 2:
+        if empty_cells < 2:
             return 0.0
         
-        for cell in empty_cells:
-            neighbors = [n for n in graph[cell] if board_matrix[n[0]][n[1]] == 0]
+        for cell in _mask_cells(empty_mask):
+            neighbors = graph[cell] & empty_mask
+            degree = neighbors.bit_count()
             
-            if len(neighbors) < 2:
+            if degree < 2:
                 continue
             
-            # Contar triángulos (conexiones entre vecinos)
-            triangles = 0
-            for i, n1 in enumerate(neighbors):
-                for n2 in neighbors[i+1:]:
-                    if n2 in graph[n1]:
-                        triangles += 1
+            # Contar triángulos (aristas entre vecinos): cada una se cuenta desde sus dos extremos
+            triangles = sum((graph[neighbor] & neighbors).bit_count() for neighbor in _mask_cells(neighbors)) // 2
             
             # Calcular clustering local
-            possible_triangles = len(neighbors) * (len(neighbors) - 1) / 2
+            possible_triangles = degree * (degree - 1) / 2
             local_clustering = triangles / possible_triangles if possible_triangles > 0 else 0
             clustering_sum += local_clustering
         
-        return clustering_sum / len(empty_cells) if empty_cells else 0.0
+        return clustering_sum / empty_cells
     
-    def _analyze_combinatorial_complexity(self, board_matrix: List[List[int]]) -> float:
+    def _analyze_combinatorial_complexity(self, board_matrix: List[List[int]],
+                                          candidates: Optional[List[int]] = None) -> float:
         """COMBINATORIA: Análisis usando inclusión-exclusión y coeficientes binomiales"""
+        if candidates is None:
+            candidates = self._candidate_masks(board_matrix)
         
         empty_cells = []
         for i in range(9):
             for j in range(9):
                 if board_matrix[i][j] == 0:
-                    candidates = self._get_possible_values(board_matrix, i, j)
-                    empty_cells.append((i, j, len(candidates)))
+                    empty_cells.append((i, j, candidates[i * 9 + j].bit_count()))
         
         if not empty_cells:
             return 0.0
         
         # 1. Aplicar Principio de Inclusión-Exclusión
-        inclusion_exclusion_score = self._calculate_inclusion_exclusion(empty_cells, board_matrix)
+        inclusion_exclusion_score = self._calculate_inclusion_exclusion(empty_cells, board_matrix, candidates)
         
         # 2. Calcular Coeficientes Binomiales para elecciones
         binomial_complexity = self._calculate_binomial_complexity(empty_cells)
@@ -283,28 +508,34 @@ class AdvancedDifficultySystem:
             if candidates > 1:
                 entropy += math.log2(candidates)
         
-        max_entropy = len(empty_cells) * math.log2(9)  # Máximo teórico
+        return self._combine_combinatorial_metrics(inclusion_exclusion_score, binomial_complexity, entropy,
+                                                   len(empty_cells))
+    
+    def _combine_combinatorial_metrics(self, inclusion_exclusion_score: float, binomial_complexity: float,
+                                       entropy: float, empty_cells: int) -> float:
+        """Combina inclusión-exclusión, coeficientes binomiales y entropía (sin normalizar)"""
+        max_entropy = empty_cells * math.log2(9)  # Máximo teórico
         normalized_entropy = entropy / max_entropy if max_entropy > 0 else 0
         
         # Combinar métricas combinatoriales
-        combinatorial_score = (
-            inclusion_exclusion_score * 0.4 +    # 40% - Inclusión-exclusión
-            binomial_complexity * 0.4 +          # 40% - Coeficientes binomiales
-            normalized_entropy * 0.2              # 20% - Entropía
-        )
+        combinatorial_score = sum(metric * weight for metric, weight in zip(
+            (inclusion_exclusion_score, binomial_complexity, normalized_entropy), COMBINATORIAL_WEIGHTS))
         
         return min(1.0, combinatorial_score)
     
-    def _calculate_inclusion_exclusion(self, empty_cells: List[Tuple], board_matrix: List[List[int]]) -> float:
+    def _calculate_inclusion_exclusion(self, empty_cells: List[Tuple], board_matrix: List[List[int]],
+                                       candidates: Optional[List[int]] = None) -> float:
         """Aplica el Principio de Inclusión-Exclusión para calcular restricciones"""
         
         if len(empty_cells) < 2:
             return 0.0
+        if candidates is None:
+            candidates = self._candidate_masks(board_matrix)
         
         # Agrupar celdas por región (fila, columna, caja)
         regions = {'rows': defaultdict(list), 'cols': defaultdict(list), 'boxes': defaultdict(list)}
         
-        for i, (row, col, candidates) in enumerate(empty_cells):
+        for i, (row, col, _) in enumerate(empty_cells):
             regions['rows'][row].append(i)
             regions['cols'][col].append(i)
             box_id = (row // 3, col // 3)
@@ -324,13 +555,13 @@ class AdvancedDifficultySystem:
                             cell2 = empty_cells[idx2]
                             
                             # Calcular intersección de candidatos
-                            candidates1 = self._get_possible_values(board_matrix, cell1[0], cell1[1])
-                            candidates2 = self._get_possible_values(board_matrix, cell2[0], cell2[1])
+                            candidates1 = candidates[cell1[0] * 9 + cell1[1]]
+                            candidates2 = candidates[cell2[0] * 9 + cell2[1]]
                             
-                            intersection = len(candidates1 & candidates2)
+                            intersection = (candidates1 & candidates2).bit_count()
 
                             # Aplicar inclusión-exclusión: |A ∪ B| = |A| + |B| - |A ∩ B|
-                            union = (len(candidates1) + len(candidates2) - intersection)
+                            union = (candidates1.bit_count() + candidates2.bit_count() - intersection)
                             
                             ie_value = intersection / union
 
@@ -365,8 +596,11 @@ class AdvancedDifficultySystem:
 
         return binomial_sum / max_binomial if max_binomial > 0 else 0
     
-    def _calculate_solution_space_complexity(self, board_matrix: List[List[int]]) -> float:
+    def _calculate_solution_space_complexity(self, board_matrix: List[List[int]],
+                                             candidates: Optional[List[int]] = None) -> float:
         """Calcula complejidad del espacio de soluciones usando backtracking"""
+        if candidates is None:
+            candidates = self._candidate_masks(board_matrix)
         
         # Contar celdas vacías
         empty_cells = sum(row.count(0) for row in board_matrix)
@@ -379,13 +613,16 @@ class AdvancedDifficultySystem:
         for row in range(9):
             for col in range(9):
                 if board_matrix[row][col] == 0:
-                    possible_values = self._get_possible_values(board_matrix, row, col)
-                    branching_factors.append(len(possible_values))
+                    branching_factors.append(candidates[row * 9 + col].bit_count())
         
         if not branching_factors:
             return 0.0
         
-        avg_branching = sum(branching_factors) / len(branching_factors)
+        return self._solution_space_from_branching(sum(branching_factors), empty_cells)
+    
+    def _solution_space_from_branching(self, total_branching: int, empty_cells: int) -> float:
+        """Complejidad del espacio de soluciones a partir de la suma de candidatos de las celdas vacías"""
+        avg_branching = total_branching / empty_cells
         
         # Calcular complejidad logarítmica del espacio de búsqueda
         search_space_log = empty_cells * math.log(avg_branching) if avg_branching > 1 else 0
@@ -393,38 +630,25 @@ class AdvancedDifficultySystem:
         # Normalizar (máximo teórico: 81 celdas * log(9) ≈ 178)
         return min(1.0, search_space_log / 178.0)
     
-    def _count_valid_row_permutations(self, rows: List[List[int]], board: List[List[int]], start_row: int) -> int:
-        """Cuenta permutaciones válidas de filas que mantienen validez del Sudoku"""
-        
-        valid_count = 0
-        for perm in permutations(range(3)):
-            # Crear tablero temporal con filas permutadas
-            temp_board = copy.deepcopy(board)
-            for i, new_pos in enumerate(perm):
-                temp_board[start_row + i] = rows[new_pos]
-            
-            # Verificar si sigue siendo válido
-            if self._is_valid_sudoku_state(temp_board):
-                valid_count += 1
-        
-        return valid_count
+    def _count_valid_row_permutations(self, rows: List[List[int]], board: List[List[int]], start_row: int,
+                                      valid: Optional[bool] = None) -> int:
+        """Cuenta permutaciones válidas de filas que mantienen validez del Sudoku.
+        
+        valid es la validez ya calculada del tablero completo (None = calcularla aquí).
+        """
+        # Reordenar las filas de una banda no cambia los dígitos de ninguna fila, columna ni
+        # caja: las 3! permutaciones son válidas o inválidas a la vez, sin copiar el tablero
+        if valid is None:
+            valid = self._is_valid_sudoku_state(board)
+        return math.factorial(len(rows)) if valid else 0
     
-    def _count_valid_column_permutations(self, cols: List[List[int]], board: List[List[int]], start_col: int) -> int:
+    def _count_valid_column_permutations(self, cols: List[List[int]], board: List[List[int]], start_col: int,
+                                         valid: Optional[bool] = None) -> int:
         """Cuenta permutaciones válidas de columnas que mantienen validez del Sudoku"""
-        
-        valid_count = 0
-        for perm in permutations(range(3)):
-            # Crear tablero temporal con columnas permutadas
-            temp_board = copy.deepcopy(board)
-            for row in range(9):
-                for i, new_pos in enumerate(perm):
-                    temp_board[row][start_col + i] = cols[new_pos][row]
-            
-            # Verificar si sigue siendo válido
-            if self._is_valid_sudoku_state(temp_board):
-                valid_count += 1
-        
-        return valid_count
+        # Igual que con las filas, reordenar las columnas de una pila no cambia ninguna unidad
+        if valid is None:
+            valid = self._is_valid_sudoku_state(board)
+        return math.factorial(len(cols)) if valid else 0
     
     def _count_valid_block_permutations(self, blocks: List[List[int]], direction: str) -> int:
         """Cuenta permutaciones válidas de bloques 3x3"""
@@ -448,48 +672,25 @@ class AdvancedDifficultySystem:
         
         return valid_count
     
+    def _candidate_masks(self, board: List[List[int]]) -> List[int]:
+        """Máscara de candidatos (bit d - 1 = dígito d posible) de cada celda 0-80; 0 en las llenas"""
+        rows, cols, boxes = unit_masks(board)
+        return [0 if board[CELL_ROW[cell]][CELL_COL[cell]] else
+                ~(rows[CELL_ROW[cell]] | cols[CELL_COL[cell]] | boxes[BOX_OF[cell]]) & ALL_DIGITS_MASK
+                for cell in range(NUM_CELLS)]
+    
     def _get_possible_values(self, board: List[List[int]], row: int, col: int) -> Set[int]:
         """Obtiene valores posibles para una celda"""
-        used_values = set()
-        
-        # Valores en fila
-        used_values.update(board[row])
+        # Valores usados en fila, columna y caja 3x3 (incluida la propia celda)
+        used_values = peer_digits_mask(board, row, col)
+        if board[row][col]:
+            used_values |= 1 << (board[row][col] - 1)
         
-        # Valores en columna
-        for r in range(9):
-            used_values.add(board[r][col])
-        
-        # Valores en caja 3x3
-        box_row, box_col = (row // 3) * 3, (col // 3) * 3
-        for r in range(box_row, box_row + 3):
-            for c in range(box_col, box_col + 3):
-                used_values.add(board[r][c])
-        
-        # Remover 0 y devolver valores posibles
-        used_values.discard(0)
-        return set(range(1, 10)) - used_values
+        return set(MASK_DIGITS[~used_values & ALL_DIGITS_MASK])
     
     def _is_valid_sudoku_state(self, board: List[List[int]]) -> bool:
         """Verifica si el estado del Sudoku es válido"""
-        # Verificar filas, columnas y cajas
-        for i in range(9):
-            if not self._is_valid_group([board[i][j] for j in range(9) if board[i][j] != 0]):
-                return False
-            if not self._is_valid_group([board[j][i] for j in range(9) if board[j][i] != 0]):
-                return False
-        
-        # Verificar cajas 3x3
-        for box_row in range(3):
-            for box_col in range(3):
-                box_values = []
-                for r in range(box_row * 3, (box_row + 1) * 3):
-                    for c in range(box_col * 3, (box_col + 1) * 3):
-                        if board[r][c] != 0:
-                            box_values.append(board[r][c])
-                if not self._is_valid_group(box_values):
-                    return False
-        
-        return True
+        return not has_conflicts(board)
     
     def _is_valid_group(self, values: List[int]) -> bool:
         """Verifica si un grupo no tiene duplicados"""
@@ -500,110 +701,243 @@ class AdvancedDifficultySystem:
         filled_values = [x for x in block if x != 0]
         return self._is_valid_group(filled_values)
     
-    def generate_advanced_puzzle(self, target_difficulty: str = 'facil') -> Tuple[List[List[int]], int, Dict]:
-        """Genera un puzzle con sistema avanzado de dificultad"""
+    def generate_advanced_puzzle(self, target_difficulty: str = 'facil', require_unique: bool = False,
+                                 jobs: Optional[int] = 1, seed: Optional[int] = None,
+                                 policy: Optional['GenerationPolicy'] = None) -> Tuple[List[List[int]], int, Dict]:
+        """Genera un puzzle con sistema avanzado de dificultad (opcionalmente con solución única).
+
+        Con jobs distinto de 1 las variaciones se crean y califican en un pool de
+        procesos (None usa todos los núcleos). Con seed cada intento recibe su
+        propia semilla derivada, de modo que el resultado es reproducible y no
+        depende del número de procesos. policy limita los intentos y el tiempo
+        (ver GenerationPolicy); las métricas incluyen en 'generation' los intentos
+        usados, las variaciones extra del último recurso ('fallback_attempts') y si
+        se alcanzó el umbral de calidad.
+        """
+        
+        policy = policy or GenerationPolicy()
+        deadline = time.perf_counter() + policy.max_time if policy.max_time is not None else None
+        start_time = time.perf_counter()
+        rng = random.Random(seed) if seed is not None else None
         
         # Generar tablero base
-        complete_board = self.board.generate_complete_board()
+        with _seeded_random(rng.getrandbits(64) if rng else None):
+            complete_board = self.board.generate_complete_board()
         
         # Determinar rangos objetivo según la clasificación
-        # Ajustados para crear mayor contraste
-        if target_difficulty == 'facil':
-            target_range = (1, 6.5)  # Puzzles fáciles
-        elif target_difficulty == 'dificil':
-            target_range = (6.6, 10)  # Puzzles difíciles
-        else:  # Default a facil
-            target_range = (1, 3.5)
+        target_range = TARGET_RANGES.get(target_difficulty, DEFAULT_TARGET_RANGE)
+        
+        # Semillas por intento (solo si hay semilla o procesos: sin ellas se usa el generador global)
+        attempt_seeds = None
+        if rng is not None or jobs != 1:
+            attempt_seeds = [(rng or random).getrandbits(64) for _ in range(policy.max_attempts)]
         
         best_puzzle = None
         best_metrics = None
         best_final_difficulty = 0
+        closest = None  # (distancia al rango, puzzle, métricas) del mejor candidato fuera de rango
+        attempts = 0
+        fallback_attempts = 0
+        threshold_met = False
+        deadline_expired = False
         
         # Intentar múltiples variaciones
-        for attempt in range(100):  # 100 para una muy buena cobertura
-            puzzle = self._create_puzzle_variation(complete_board, target_difficulty)
-            
-            # Calcular métricas de cada aspecto (1-10)
-            total_diff = self.calculate_difficulty(puzzle)
-            
-            # Clasificar según rangos ajustados para sistema de 2 niveles con mayor contraste
-            if total_diff <= HIGH_DIFFICULTY_THRESHOLD:
-                classification = 'Fácil'
-            else:
-                classification = 'Difícil'
-            
-            metrics = {
-                'permutation_difficulty': round(self.permutation_difficulty, 2),
-                'graph_difficulty': round(self.graph_difficulty, 2),
-                'combinatorial_difficulty': round(self.combinatorial_difficulty, 2),
-                'final_difficulty': float(total_diff),
-                'target_range': target_range,
-                'classification': classification,
-                'difficulty_breakdown': {
-                    'permutations': round(self.permutation_difficulty, 2),
-                    'graph_theory': round(self.graph_difficulty, 2),
-                    'combinatorics': round(self.combinatorial_difficulty, 2),
-                    'final': float(total_diff)
-                }
-            }
-            
-            # Verificar si está en el rango objetivo
-            if target_range[0] <= total_diff <= target_range[1]:
-                # Preferir puzzles más extremos dentro del rango
-                if target_difficulty == 'facil':
-                    score = 6.5 - total_diff  # Mientras menor, mejor para fácil
-                else:  # dificil
-                    score = total_diff - 6.6  # Mientras mayor, mejor para difícil
+        evaluations = self._evaluate_variations(complete_board, target_difficulty, require_unique,
+                                                policy.max_attempts, attempt_seeds, jobs)
+        try:
+            for puzzle, total_diff, components in evaluations:
+                attempts += 1
+                
+                # Candidato descartado por tener más de una solución
+                if puzzle is not None:
+                    metrics = self._build_metrics(total_diff, components, target_range)
                     
-                if score > best_final_difficulty:
-                    best_puzzle = puzzle
-                    best_metrics = metrics
-                    best_final_difficulty = score
+                    # Verificar si está en el rango objetivo
+                    if target_range[0] <= total_diff <= target_range[1]:
+                        # Preferir puzzles más extremos dentro del rango
+                        if target_difficulty == 'facil':
+                            score = 6.5 - total_diff  # Mientras menor, mejor para fácil
+                        else:  # dificil
+                            score = total_diff - 6.6  # Mientras mayor, mejor para difícil
+                            
+                        if score > best_final_difficulty:
+                            best_puzzle = puzzle
+                            best_metrics = metrics
+                            best_final_difficulty = score
+                    elif deadline is not None:
+                        distance = max(target_range[0] - total_diff, total_diff - target_range[1])
+                        if closest is None or distance < closest[0]:
+                            closest = (distance, puzzle, metrics)
+                
+                # Detenerse en cuanto se alcanza el umbral de calidad o vence el plazo
+                if (policy.quality_threshold is not None and best_puzzle is not None
+                        and best_final_difficulty >= policy.quality_threshold):
+                    threshold_met = True
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    deadline_expired = True
+                    break
+        finally:
+            evaluations.close()
+        
+        # Si vence el plazo sin candidatos en rango, usar el más cercano ya calificado
+        if best_puzzle is None and deadline_expired and closest is not None:
+            _, best_puzzle, best_metrics = closest
         
         # Si no encontramos uno perfecto, usar el mejor
         if best_puzzle is None:
-            puzzle = self._create_puzzle_variation(complete_board, target_difficulty)
+            with _seeded_random(rng.getrandbits(64) if rng else None):
+                if require_unique:
+                    puzzle, fallback_attempts = self._create_unique_variation(complete_board, target_difficulty,
+                                                                              deadline)
+                else:
+                    puzzle = self._create_puzzle_variation(complete_board, target_difficulty)
+                    fallback_attempts = 1
             total_diff = self.calculate_difficulty(puzzle)
             
-            # Clasificar según rangos ajustados para sistema de 2 niveles con mayor contraste
-            if total_diff <= HIGH_DIFFICULTY_THRESHOLD:
-                classification = 'Fácil'
-            else:
-                classification = 'Difícil'
-            
-            best_metrics = {
-                'permutation_difficulty': round(self.permutation_difficulty, 2),
-                'graph_difficulty': round(self.graph_difficulty, 2),
-                'combinatorial_difficulty': round(self.combinatorial_difficulty, 2),
-                'final_difficulty': float(total_diff),
-                'target_range': target_range,
-                'classification': classification,
-                'difficulty_breakdown': {
-                    'permutations': round(self.permutation_difficulty, 2),
-                    'graph_theory': round(self.graph_difficulty, 2),
-                    'combinatorics': round(self.combinatorial_difficulty, 2),
-                    'final': float(total_diff)
-                }
-            }
+            best_metrics = self._build_metrics(total_diff, (self.permutation_difficulty, self.graph_difficulty,
+                                                            self.combinatorial_difficulty), target_range)
             best_puzzle = puzzle
         
+        generation = {
+            'attempts': attempts,
+            'max_attempts': policy.max_attempts,
+            'fallback_attempts': fallback_attempts,
+            'threshold_met': threshold_met,
+            'deadline_expired': deadline_expired,
+            'elapsed': time.perf_counter() - start_time,
+        }
+        return self._finish_generation(best_puzzle, complete_board, best_metrics, generation)
+    
+    def generate_scored_puzzle(self, target_score: float, tolerance: float = SCORE_TOLERANCE,
+                               require_unique: bool = False, seed: Optional[int] = None,
+                               max_steps: int = ANNEALING_STEPS, clue_range: Optional[Tuple[int, int]] = None,
+                               max_time: Optional[float] = None) -> Tuple[List[List[int]], int, Dict]:
+        """Genera un puzzle cuya final_difficulty quede en target_score ± tolerance (p. ej. 5.8 ± 0.1).
+
+        Parte de una sola variación y la ajusta con recocido simulado
+        (annealing.anneal) sobre la misma solución. clue_range=(mín, máx) permite
+        que el número de pistas varíe; por defecto se conserva el de la variación
+        inicial. Si el objetivo no se alcanza en max_steps pasos (o en max_time
+        segundos) retorna el puzzle más cercano; las métricas incluyen en
+        'generation' los pasos, evaluaciones y si convergió.
+        """
+        rng = random.Random(seed) if seed is not None else random
+        deadline = time.perf_counter() + max_time if max_time is not None else None
+        
+        with _seeded_random(rng.getrandbits(64) if seed is not None else None):
+            complete_board = self.board.generate_complete_board()
+            classification = 'dificil' if target_score > HIGH_DIFFICULTY_THRESHOLD else 'facil'
+            if require_unique:
+                puzzle = self._create_unique_distribution(complete_board, classification, self.target_clues)
+            else:
+                puzzle = self._create_puzzle_variation(complete_board, classification)
+        
+        min_clues, max_clues = clue_range if clue_range is not None else (None, None)
+        puzzle, score, generation = anneal(self, complete_board, puzzle, target_score, tolerance, max_steps,
+                                           min_clues, max_clues, require_unique, rng, deadline)
+        
+        total_diff = self.calculate_difficulty(puzzle)
+        metrics = self._build_metrics(total_diff, (self.permutation_difficulty, self.graph_difficulty,
+                                                   self.combinatorial_difficulty),
+                                      (target_score - tolerance, target_score + tolerance))
+        return self._finish_generation(puzzle, complete_board, metrics, generation)
+    
+    def _finish_generation(self, puzzle: List[List[int]], complete_board: List[List[int]], metrics: Dict,
+                           generation: Dict) -> Tuple[List[List[int]], int, Dict]:
+        """Completa las métricas del puzzle elegido y lo carga en el tablero principal"""
+        # Celdas que la propagación (singles desnudos y ocultos) resuelve sin búsqueda
+        metrics['propagation'] = propagate(copy.deepcopy(puzzle))
+        metrics['unique_solution'] = has_unique_solution(puzzle)
+        metrics['generation'] = generation
+        
         # Actualizar el tablero principal
-        self.board.board = copy.deepcopy(best_puzzle)
-        self.board.initial_board = copy.deepcopy(best_puzzle)
+        self.board.board = copy.deepcopy(puzzle)
+        self.board.initial_board = copy.deepcopy(puzzle)
         self.board.solution = copy.deepcopy(complete_board)
         
-        self.permutation_difficulty = best_metrics['permutation_difficulty']
-        self.graph_difficulty = best_metrics['graph_difficulty']
-        self.combinatorial_difficulty = best_metrics['combinatorial_difficulty']
-        self.final_difficulty = best_metrics['final_difficulty']
+        self.permutation_difficulty = metrics['permutation_difficulty']
+        self.graph_difficulty = metrics['graph_difficulty']
+        self.combinatorial_difficulty = metrics['combinatorial_difficulty']
+        self.final_difficulty = metrics['final_difficulty']
+        
+        return puzzle, int(round(metrics['final_difficulty'])), metrics
+    
+    def _build_metrics(self, total_diff: float, components: Tuple[float, float, float],
+                       target_range: Tuple[float, float]) -> Dict:
+        """Arma el diccionario de métricas a partir de la dificultad total y sus tres componentes"""
+        permutation_difficulty, graph_difficulty, combinatorial_difficulty = components
+        
+        # Clasificar según rangos ajustados para sistema de 2 niveles con mayor contraste
+        if total_diff <= HIGH_DIFFICULTY_THRESHOLD:
+            classification = 'Fácil'
+        else:
+            classification = 'Difícil'
         
-        return best_puzzle, int(round(best_metrics['final_difficulty'])), best_metrics
+        return {
+            'permutation_difficulty': round(permutation_difficulty, 2),
+            'graph_difficulty': round(graph_difficulty, 2),
+            'combinatorial_difficulty': round(combinatorial_difficulty, 2),
+            'final_difficulty': float(total_diff),
+            'target_range': target_range,
+            'classification': classification,
+            'difficulty_breakdown': {
+                'permutations': round(permutation_difficulty, 2),
+                'graph_theory': round(graph_difficulty, 2),
+                'combinatorics': round(combinatorial_difficulty, 2),
+                'final': float(total_diff)
+            }
+        }
+    
+    def _evaluate_variation(self, complete_board: List[List[int]], target_difficulty: str,
+                            require_unique: bool, seed: Optional[int] = None) -> Tuple:
+        """Crea y califica una variación; retorna (puzzle, dificultad, componentes).
+
+        Si se exige solución única y la variación no la tiene retorna (None, None, None).
+        """
+        with _seeded_random(seed):
+            puzzle = self._create_puzzle_variation(complete_board, target_difficulty)
+        
+        # Descartar candidatos con más de una solución antes de evaluarlos ('dig' ya la garantiza)
+        if require_unique and self.removal_strategy != 'dig' and not has_unique_solution(puzzle):
+            return None, None, None
+        
+        # Calcular métricas de cada aspecto (1-10)
+        total_diff = self.calculate_difficulty(puzzle)
+        return puzzle, total_diff, (self.permutation_difficulty, self.graph_difficulty, self.combinatorial_difficulty)
+    
+    def _evaluate_variations(self, complete_board: List[List[int]], target_difficulty: str, require_unique: bool,
+                             attempts: int, attempt_seeds: Optional[List[int]], jobs: Optional[int]) -> Iterator[Tuple]:
+        """Evalúa las variaciones en orden de intento, en este proceso o en un pool.
+
+        Cerrar el iterador antes de tiempo termina el pool de procesos.
+        """
+        if attempt_seeds is None:
+            for _ in range(attempts):
+                yield self._evaluate_variation(complete_board, target_difficulty, require_unique)
+            return
+        
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1:
+            for seed in attempt_seeds:
+                yield self._evaluate_variation(complete_board, target_difficulty, require_unique, seed)
+            return
+        
+        tasks = [(complete_board, target_difficulty, require_unique, seed, self.removal_strategy, self.target_clues,
+                  self.symmetry) for seed in attempt_seeds]
+        with Pool(jobs) as pool:
+            yield from pool.imap(_evaluate_variation_task, tasks, max(1, len(tasks) // (jobs * 4)))
     
     def _create_puzzle_variation(self, complete_board: List[List[int]], target_difficulty: str) -> List[List[int]]:
         """Crea una variación del puzzle usando remoción inteligente"""
         
         puzzle = copy.deepcopy(complete_board)
         
+        if self.removal_strategy == 'dig':
+            return self._create_unique_distribution(complete_board, target_difficulty, self.target_clues)
+        if self.removal_strategy == 'symmetric':
+            return self._create_symmetric_distribution(complete_board, self.target_clues)
+        
         # Determinar cuántas celdas remover - MISMO NÚMERO para ambas dificultades
         # La dificultad vendrá de la DISTRIBUCIÓN, no de la cantidad
         
@@ -615,6 +949,26 @@ class AdvancedDifficultySystem:
             
         return puzzle
     
+    def _create_unique_variation(self, complete_board: List[List[int]], target_difficulty: str,
+                                 deadline: Optional[float] = None) -> Tuple[List[List[int]], int]:
+        """Crea variaciones hasta encontrar una con solución única.
+
+        Si se agotan los intentos o el plazo sin encontrarla, quita pistas con
+        HoleDigger desde la solución, que siempre da un puzzle de solución única.
+        Retorna el puzzle y el número de variaciones creadas (incluida la de HoleDigger).
+        """
+        
+        for draws in range(1, UNIQUE_FALLBACK_ATTEMPTS + 1):
+            puzzle = self._create_puzzle_variation(complete_board, target_difficulty)
+            if has_unique_solution(puzzle):
+                return puzzle, draws
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        
+        # Ninguna variación tuvo solución única: cavar hasta las mismas pistas (o el mínimo alcanzable)
+        clues = sum(1 for row in puzzle for num in row if num != 0)
+        return self._create_unique_distribution(complete_board, target_difficulty, clues), draws + 1
+    
     def _create_easy_distribution(self, complete_board: List[List[int]], cells_to_remove: int) -> List[List[int]]:
         """Crea distribución fácil: celdas conectadas y agrupadas"""
         puzzle = copy.deepcopy(complete_board)
@@ -651,70 +1005,32 @@ class AdvancedDifficultySystem:
     def _create_difficult_distribution(self, complete_board: List[List[int]], cells_to_remove: int) -> List[List[int]]:
         """Crea distribución difícil: celdas dispersas y desconectadas"""
         puzzle = copy.deepcopy(complete_board)
-        
-        # ESTRATEGIA SIMPLIFICADA PERO EFECTIVA: 
-        # Remover celdas maximizando dispersión de forma más robusta
-        
-        all_positions = [(r, c) for r in range(9) for c in range(9)]
-        random.shuffle(all_positions)  # Añadir aleatoriedad inicial
-        
-        removed_positions = []
-        
-        for _ in range(cells_to_remove):
-            if len(removed_positions) >= cells_to_remove:
-                break
-                
-            # Encontrar la posición que maximiza la dispersión
-            best_pos = None
-            best_score = -1
-            
-            for pos in all_positions:
-                if pos in removed_positions:
-                    continue
-                    
-                row, col = pos
-                
-                # Calcular score de dispersión simple pero efectivo
-                dispersión_score = 0
-                
-                # Penalizar posiciones cerca de celdas ya removidas
-                for removed_row, removed_col in removed_positions:
-                    distance = abs(row - removed_row) + abs(col - removed_col)
-                    if distance <= 2:  # Muy cerca
-                        dispersión_score -= 3
-                    elif distance <= 4:  # Moderadamente cerca
-                        dispersión_score -= 1
-                
-                # Bonus por estar en bordes (incrementa dificultad)
-                if row == 0 or row == 8 or col == 0 or col == 8:
-                    dispersión_score += 2
-                
-                # Bonus por dispersión en bloques 3x3
-                block_r, block_c = row // 3, col // 3
-                block_removals = sum(1 for r, c in removed_positions 
-                                   if r // 3 == block_r and c // 3 == block_c)
-                if block_removals < 2:  # Preferir dispersar entre bloques
-                    dispersión_score += 1
-                
-                # Añadir componente aleatorio para variabilidad
-                dispersión_score += random.uniform(0, 0.5)
-                
-                if dispersión_score > best_score:
-                    best_score = dispersión_score
-                    best_pos = pos
-            
-            if best_pos:
-                removed_positions.append(best_pos)
-            else:
-                # Fallback: tomar cualquier posición disponible
-                available = [pos for pos in all_positions if pos not in removed_positions]
-                if available:
-                    removed_positions.append(random.choice(available))
-        
-        # Aplicar la remoción
-        for row, col in removed_positions:
-            puzzle[row][col] = 0
-            
+        for cell in _dispersed_removal_order(cells_to_remove):
+            puzzle[CELL_ROW[cell]][CELL_COL[cell]] = 0
+        return puzzle
+    
+    def _create_unique_distribution(self, complete_board: List[List[int]], target_difficulty: str,
+                                    target_clues: int) -> List[List[int]]:
+        """Crea distribución de solución única quitando pistas una a una hasta target_clues.
+
+        Para 'dificil' las celdas se prueban en el orden disperso de
+        _create_difficult_distribution; para 'facil', en orden aleatorio. Si el
+        puzzle se vuelve mínimo antes, conserva más pistas que target_clues.
+        """
+        if target_difficulty == 'facil':
+            order = random.sample(range(NUM_CELLS), NUM_CELLS)
+        else:
+            order = _dispersed_removal_order(NUM_CELLS)
+        return dig_holes(complete_board, target_clues, order)
+    
+    def _create_symmetric_distribution(self, complete_board: List[List[int]], target_clues: int) -> List[List[int]]:
+        """Crea distribución simétrica: un patrón de target_clues pistas con la simetría elegida.
+
+        Los patrones salen de la biblioteca de symmetry.py y se comprueban
+        directamente sobre la solución; si ninguno da solución única se retorna el
+        último probado (y require_unique lo descartará).
+        """
+        puzzle, _ = symmetric_puzzle(complete_board, self.symmetry, target_clues)
         return puzzle
     
     def get_difficulty_metrics(self) -> Dict:
@@ -0,0 +1,125 @@
+"""
+Búsqueda local de puzzles con un puntaje de dificultad exacto
+
+En lugar de crear muchas variaciones al azar y quedarse con la mejor, el
+recocido simulado parte de una sola máscara de pistas y la modifica con
+movimientos pequeños sobre la misma solución:
+- intercambiar una pista por una celda vacía (el número de pistas no cambia),
+- quitar o agregar una pista, si se permite un rango de pistas.
+
+La energía es la distancia entre el puntaje de calculate_difficulty y el
+objetivo. Los movimientos que la reducen se aceptan siempre y los que la
+aumentan con probabilidad exp(-Δ / T), con una temperatura T que baja de forma
+geométrica. La búsqueda termina al llegar a objetivo ± tolerancia.
+
+Cada movimiento cambia una o dos celdas, así que el puntaje se mantiene con un
+evaluator.DifficultyEvaluator que solo actualiza esas celdas y sus vecinos, y
+los puntajes se guardan por máscara de pistas: volver a un estado ya visitado no
+recalcula nada.
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from .grid_index import CELL_COL, CELL_ROW, NUM_CELLS
+from .solvers import has_unique_solution
+
+ANNEALING_STEPS = 400
+START_TEMPERATURE = 0.5
+END_TEMPERATURE = 0.02
+SCORE_TOLERANCE = 0.1
+
+# Margen para comparar puntajes redondeados a un decimal
+SCORE_EPSILON = 1e-9
+
+
+def anneal(system, solution: Sequence[Sequence[int]], puzzle: Sequence[Sequence[int]], target_score: float,
+           tolerance: float = SCORE_TOLERANCE, max_steps: int = ANNEALING_STEPS,
+           min_clues: Optional[int] = None, max_clues: Optional[int] = None, require_unique: bool = False,
+           rng: Optional[random.Random] = None, deadline: Optional[float] = None) -> Tuple[List[List[int]], float, Dict]:
+    """Ajusta las pistas de puzzle hasta que su dificultad quede en target_score ± tolerance.
+
+    system es el AdvancedDifficultySystem que califica; puzzle debe ser un
+    subconjunto de solution. El número de pistas se mantiene entre min_clues y
+    max_clues (por defecto, el del puzzle inicial: solo intercambios). Con
+    require_unique se rechazan los movimientos que dejan más de una solución, por
+    lo que el puzzle inicial también debe tenerla. Retorna el mejor puzzle
+    visitado, su puntaje y estadísticas de la búsqueda.
+    """
+    from .evaluator import DifficultyEvaluator  # evaluator importa advanced_difficulty, que importa este módulo
+
+    rng = rng or random
+    evaluator = DifficultyEvaluator(puzzle, system)
+    board = evaluator.board
+    givens = [cell for cell in range(NUM_CELLS) if board[CELL_ROW[cell]][CELL_COL[cell]]]
+    empty = [cell for cell in range(NUM_CELLS) if not board[CELL_ROW[cell]][CELL_COL[cell]]]
+    min_clues = len(givens) if min_clues is None else min_clues
+    max_clues = len(givens) if max_clues is None else max_clues
+
+    scores: Dict[int, float] = {}  # Máscara de 81 bits de las pistas -> puntaje
+
+    def score(mask: int) -> float:
+        if mask not in scores:
+            scores[mask] = evaluator.difficulty()
+        return scores[mask]
+
+    def move(removed: Optional[int], added: Optional[int]):
+        """Quita la pista removed y agrega la pista added (cualquiera puede ser None)"""
+        if removed is not None:
+            givens.remove(removed)
+            empty.append(removed)
+            evaluator.remove(removed)
+        if added is not None:
+            empty.remove(added)
+            givens.append(added)
+            evaluator.restore(added, solution[CELL_ROW[added]][CELL_COL[added]])
+
+    mask = sum(1 << cell for cell in givens)
+    start_time = time.perf_counter()
+    current = score(mask)
+    best_mask, best_score = mask, current
+    steps = accepted = 0
+
+    while abs(best_score - target_score) > tolerance + SCORE_EPSILON and steps < max_steps:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        temperature = START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** (steps / max(1, max_steps - 1))
+        steps += 1
+
+        # Intercambio, remoción o adición de una pista
+        kinds = ['swap']
+        if len(givens) > min_clues:
+            kinds.append('remove')
+        if len(givens) < max_clues:
+            kinds.append('add')
+        kind = rng.choice(kinds)
+        removed = rng.choice(givens) if kind != 'add' else None
+        added = rng.choice(empty) if kind != 'remove' else None
+        move(removed, added)
+        new_mask = mask ^ (1 << removed if removed is not None else 0) ^ (1 << added if added is not None else 0)
+
+        # Agregar una pista nunca rompe la unicidad
+        if require_unique and removed is not None and not has_unique_solution(board):
+            move(added, removed)
+            continue
+
+        candidate = score(new_mask)
+        delta = abs(candidate - target_score) - abs(current - target_score)
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            mask, current = new_mask, candidate
+            accepted += 1
+            if abs(current - target_score) < abs(best_score - target_score):
+                best_mask, best_score = mask, current
+        else:
+            move(added, removed)
+
+    best = [[solution[r][c] if best_mask >> (r * 9 + c) & 1 else 0 for c in range(9)] for r in range(9)]
+    stats = {
+        'steps': steps,
+        'accepted': accepted,
+        'evaluations': len(scores),
+        'converged': abs(best_score - target_score) <= tolerance + SCORE_EPSILON,
+        'elapsed': time.perf_counter() - start_time,
+    }
+    return best, best_score, stats
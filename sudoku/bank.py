@@ -0,0 +1,204 @@
+"""
+Banco persistente de puzzles en SQLite
+
+Guarda cada puzzle generado con su solución y las métricas completas de
+AdvancedDifficultySystem, indexado por clasificación y final_difficulty, de modo
+que pedir un puzzle con dificultad en un rango es una consulta por índice en
+lugar de generar y calificar desde cero. Los puzzles repetidos se descartan al
+insertar.
+
+Las entradas tienen el mismo formato que las de PuzzlePool: 'puzzle',
+'solution', 'difficulty' (entero) y 'metrics'.
+
+Uso desde la línea de comandos para llenar el banco:
+    python -m sudoku.bank puzzles.db --facil 100 --dificil 100
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence
+from .advanced_difficulty import DEFAULT_TARGET_RANGE, REMOVAL_STRATEGIES, TARGET_RANGES
+from .grid_index import SIZE
+
+# Puzzles generados entre inserciones al llenar el banco
+FILL_BATCH_SIZE = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY,
+    givens TEXT NOT NULL UNIQUE,
+    solution TEXT NOT NULL,
+    classification TEXT NOT NULL,
+    final_difficulty REAL NOT NULL,
+    unique_solution INTEGER NOT NULL,
+    metrics TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_puzzles_difficulty
+    ON puzzles (classification, final_difficulty);
+CREATE INDEX IF NOT EXISTS idx_puzzles_final_difficulty
+    ON puzzles (final_difficulty);
+"""
+
+
+def _encode(board: Sequence[Sequence[int]]) -> str:
+    """Tablero 9x9 a cadena de 81 dígitos ('0' para vacías)"""
+    return ''.join(str(num) for row in board for num in row)
+
+
+def _decode(text: str) -> List[List[int]]:
+    """Cadena de 81 dígitos a tablero 9x9"""
+    return [[int(char) for char in text[r * SIZE:(r + 1) * SIZE]] for r in range(SIZE)]
+
+
+class PuzzleBank:
+    """Almacén de puzzles calificados sobre una base de datos SQLite"""
+
+    def __init__(self, path: str = 'puzzles.db'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'PuzzleBank':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count()
+
+    @staticmethod
+    def _row_values(entry: Dict) -> tuple:
+        metrics = entry['metrics']
+        return (
+            _encode(entry['puzzle']),
+            _encode(entry['solution']),
+            metrics['classification'],
+            metrics['final_difficulty'],
+            int(bool(metrics.get('unique_solution', False))),
+            json.dumps(metrics),
+        )
+
+    @staticmethod
+    def _entry(row: tuple) -> Dict:
+        givens, solution, metrics = row
+        metrics = json.loads(metrics)
+        if 'target_range' in metrics:
+            metrics['target_range'] = tuple(metrics['target_range'])
+        return {
+            'puzzle': _decode(givens),
+            'solution': _decode(solution),
+            'difficulty': int(round(metrics['final_difficulty'])),
+            'metrics': metrics,
+        }
+
+    def add(self, entry: Dict) -> bool:
+        """Inserta una entrada; retorna False si el puzzle ya estaba en el banco"""
+        return self.add_many([entry]) == 1
+
+    def add_many(self, entries: Iterable[Dict]) -> int:
+        """Inserta muchas entradas en una sola transacción; retorna cuántas eran nuevas"""
+        before = self.connection.total_changes
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO puzzles "
+                "(givens, solution, classification, final_difficulty, unique_solution, metrics) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._row_values(entry) for entry in entries))
+        return self.connection.total_changes - before
+
+    @staticmethod
+    def _filters(min_difficulty: Optional[float], max_difficulty: Optional[float],
+                 classification: Optional[str], unique_only: bool) -> tuple:
+        clauses, params = [], []
+        if classification is not None:
+            clauses.append("classification = ?")
+            params.append(classification)
+        if min_difficulty is not None:
+            clauses.append("final_difficulty >= ?")
+            params.append(min_difficulty)
+        if max_difficulty is not None:
+            clauses.append("final_difficulty <= ?")
+            params.append(max_difficulty)
+        if unique_only:
+            clauses.append("unique_solution = 1")
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+    def count(self, min_difficulty: Optional[float] = None, max_difficulty: Optional[float] = None,
+              classification: Optional[str] = None, unique_only: bool = False) -> int:
+        """Número de puzzles que cumplen los filtros"""
+        where, params = self._filters(min_difficulty, max_difficulty, classification, unique_only)
+        return self.connection.execute("SELECT COUNT(*) FROM puzzles" + where, params).fetchone()[0]
+
+    def sample(self, min_difficulty: Optional[float] = None, max_difficulty: Optional[float] = None,
+               classification: Optional[str] = None, unique_only: bool = False, count: int = 1) -> List[Dict]:
+        """Toma al azar hasta count puzzles distintos con final_difficulty en [min, max].
+
+        Cada puzzle del rango tiene la misma probabilidad: se sortean posiciones distintas
+        entre los puzzles que cumplen los filtros y cada una se lee del índice por
+        (final_difficulty, id) con OFFSET, en vez de ordenar al azar todo el rango.
+        """
+        where, params = self._filters(min_difficulty, max_difficulty, classification, unique_only)
+        total = self.connection.execute("SELECT COUNT(*) FROM puzzles" + where, params).fetchone()[0]
+        query = ("SELECT givens, solution, metrics FROM puzzles" + where
+                 + " ORDER BY final_difficulty, id LIMIT 1 OFFSET ?")
+        return [self._entry(self.connection.execute(query, params + [offset]).fetchone())
+                for offset in random.sample(range(total), min(count, total))]
+
+    def sample_for(self, difficulty: str, unique_only: bool = False) -> Optional[Dict]:
+        """Toma al azar un puzzle del rango objetivo de la dificultad ('facil' o 'dificil')"""
+        low, high = TARGET_RANGES.get(difficulty, DEFAULT_TARGET_RANGE)
+        entries = self.sample(low, high, unique_only=unique_only)
+        return entries[0] if entries else None
+
+
+def fill_bank(bank: PuzzleBank, difficulty: str, count: int, require_unique: bool = False,
+              grid_generation: str = 'backtracking', jobs: Optional[int] = 1,
+              removal_strategy: str = 'distribution') -> int:
+    """Genera count puzzles de la dificultad indicada y los guarda; retorna cuántos eran nuevos.
+
+    Se insertan por lotes para no perder lo generado si el proceso se interrumpe.
+    """
+    from .pool import generate_entry
+
+    added = 0
+    entries = []
+    for _ in range(count):
+        entries.append(generate_entry(difficulty, require_unique, grid_generation, jobs,
+                                      removal_strategy=removal_strategy))
+        if len(entries) >= FILL_BATCH_SIZE:
+            added += bank.add_many(entries)
+            entries = []
+    return added + bank.add_many(entries)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Llena el banco de puzzles")
+    parser.add_argument('path', help="archivo SQLite del banco")
+    parser.add_argument('--facil', type=int, default=0, help="puzzles fáciles a generar")
+    parser.add_argument('--dificil', type=int, default=0, help="puzzles difíciles a generar")
+    parser.add_argument('--unique', action='store_true', help="solo puzzles con solución única")
+    parser.add_argument('--grid-generation', default='backtracking', choices=('backtracking', 'transform'))
+    parser.add_argument('--strategy', default='distribution', choices=REMOVAL_STRATEGIES,
+                        help="remoción de pistas ('dig' garantiza solución única)")
+    parser.add_argument('--jobs', type=int, default=1, help="procesos por puzzle (0 = todos los núcleos)")
+    args = parser.parse_args(argv)
+
+    with PuzzleBank(args.path) as bank:
+        for difficulty in ('facil', 'dificil'):
+            count = getattr(args, difficulty)
+            if count:
+                added = fill_bank(bank, difficulty, count, args.unique, args.grid_generation, args.jobs or None,
+                                  args.strategy)
+                print(f"{difficulty}: {added} puzzles nuevos")
+        print(f"Total en el banco: {len(bank)}")
+
+
+if __name__ == '__main__':
+    main()
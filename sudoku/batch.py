@@ -0,0 +1,161 @@
+"""
+Resolución de grandes lotes de puzzles repartida en varios procesos
+
+Los puzzles pueden darse como matrices 9x9 o como cadenas de 81 caracteres
+('0' o '.' para las celdas vacías). Cada resultado es un diccionario con el
+índice del puzzle en la entrada, el estado, la solución, los nodos visitados,
+las estadísticas de la resolución y el tiempo. No se imprime nada por salida estándar.
+"""
+
+import itertools
+import os
+import queue
+import time
+from collections import deque
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from .grid_index import NUM_CELLS, SIZE
+from .solvers import get_solver, solve
+
+Puzzle = Union[str, Sequence[Sequence[int]]]
+
+# Bloques (chunksize puzzles) encargados por proceso antes de esperar el primero
+PREFETCH_PER_JOB = 4
+
+
+def parse_puzzle(text: str) -> List[List[int]]:
+    """Convierte una cadena de 81 caracteres ('0' o '.' para vacías) en una matriz 9x9"""
+    cells = [char for char in text.strip() if not char.isspace()]
+    if len(cells) != NUM_CELLS:
+        raise ValueError(f"Se esperaban {NUM_CELLS} celdas y se recibieron {len(cells)}")
+
+    values = []
+    for char in cells:
+        if char == '.':
+            values.append(0)
+        elif char.isdigit():
+            values.append(int(char))
+        else:
+            raise ValueError(f"Carácter inválido en el puzzle: {char!r}")
+    return [values[r * SIZE:(r + 1) * SIZE] for r in range(SIZE)]
+
+
+def format_puzzle(board: Sequence[Sequence[int]], empty: str = '.') -> str:
+    """Convierte una matriz 9x9 en una cadena de 81 caracteres"""
+    return ''.join(str(num) if num else empty for row in board for num in row)
+
+
+def _to_board(puzzle: Puzzle) -> List[List[int]]:
+    """Normaliza un puzzle de entrada a una matriz 9x9 nueva"""
+    if isinstance(puzzle, str):
+        return parse_puzzle(puzzle)
+    board = [list(row) for row in puzzle]
+    if len(board) != SIZE or any(len(row) != SIZE for row in board):
+        raise ValueError("El tablero debe ser una matriz de 9x9")
+    return board
+
+
+def solve_one(puzzle: Puzzle, solver: str = 'mrv', max_nodes: Optional[int] = None,
+              max_time: Optional[float] = None) -> Dict:
+    """Resuelve un puzzle sin imprimir nada y retorna estado, solución, nodos y tiempo.
+
+    Con presupuesto (max_nodes, max_time) el estado puede ser 'budget_exceeded'.
+    El campo 'stats' contiene el SolveStats completo como diccionario.
+    """
+    start_time = time.perf_counter()
+    try:
+        board = _to_board(puzzle)
+        stats = solve(board, solver, max_nodes=max_nodes, max_time=max_time)
+    except ValueError as error:
+        return {
+            'status': 'error',
+            'error': str(error),
+            'solution': None,
+            'nodes': None,
+            'propagated': None,
+            'stats': None,
+            'time': time.perf_counter() - start_time,
+        }
+
+    return {
+        'status': stats.status,
+        'solution': board if stats.solved else None,
+        'nodes': stats.nodes,
+        'propagated': stats.propagated,
+        'stats': stats.as_dict(),
+        'time': time.perf_counter() - start_time,
+    }
+
+
+def _solve_indexed(task: Tuple[int, Puzzle, str, Optional[int], Optional[float]]) -> Dict:
+    """Función de trabajo para el pool de procesos"""
+    index, puzzle, solver, max_nodes, max_time = task
+    result = solve_one(puzzle, solver, max_nodes, max_time)
+    result['index'] = index
+    return result
+
+
+def _solve_chunk(tasks: List[Tuple]) -> List[Dict]:
+    """Función de trabajo para el pool de procesos: resuelve un bloque de tareas"""
+    return [_solve_indexed(task) for task in tasks]
+
+
+def _chunk_results(results: Union[List[Dict], BaseException]) -> List[Dict]:
+    """Resultados de un bloque terminado; relanza la excepción si el bloque falló"""
+    if isinstance(results, BaseException):
+        raise results
+    return results
+
+
+def solve_many(puzzles: Iterable[Puzzle], jobs: Optional[int] = None, chunksize: Optional[int] = None,
+               ordered: bool = True, solver: str = 'mrv', max_nodes: Optional[int] = None,
+               max_time: Optional[float] = None) -> Iterator[Dict]:
+    """Resuelve muchos puzzles en paralelo y entrega los resultados a medida que llegan.
+
+    jobs es el número de procesos (None usa todos los núcleos; 1 resuelve en el
+    proceso actual). Con ordered=True los resultados salen en el orden de entrada;
+    con ordered=False salen en cuanto terminan y el campo 'index' indica a qué
+    puzzle corresponden. La entrada se consume de forma perezosa: nunca hay más
+    de jobs * PREFETCH_PER_JOB bloques de chunksize puzzles encargados, así que
+    sirve también para entradas enormes o infinitas. max_nodes y max_time son
+    presupuestos por puzzle.
+    """
+    get_solver(solver)  # Validar el nombre antes de lanzar procesos
+    jobs = jobs or os.cpu_count() or 1
+    tasks = ((index, puzzle, solver, max_nodes, max_time) for index, puzzle in enumerate(puzzles))
+
+    if jobs == 1:
+        for task in tasks:
+            yield _solve_indexed(task)
+        return
+
+    if chunksize is None:
+        total = len(puzzles) if hasattr(puzzles, '__len__') else None
+        chunksize = max(1, total // (jobs * 4)) if total else 16
+
+    # Pool.imap leería toda la entrada en un hilo aparte; los bloques se encargan por ventanas
+    chunks = iter(lambda: list(itertools.islice(tasks, chunksize)), [])
+    window = jobs * PREFETCH_PER_JOB
+    with Pool(jobs) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_solve_chunk, (chunk,)))
+                if len(pending) >= window:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+            return
+
+        # Sin orden: cada bloque se entrega en cuanto termina
+        finished = queue.Queue()
+        in_flight = 0
+        for chunk in chunks:
+            pool.apply_async(_solve_chunk, (chunk,), callback=finished.put, error_callback=finished.put)
+            in_flight += 1
+            if in_flight >= window:
+                in_flight -= 1
+                yield from _chunk_results(finished.get())
+        while in_flight:
+            in_flight -= 1
+            yield from _chunk_results(finished.get())
@@ -5,7 +5,11 @@ Lógica principal del tablero de Sudoku con sistema avanzado de dificultad
 import random
 import copy
 import time
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, FrozenSet
+from .grid_index import PEER_CELLS
+from .solve_stats import BUDGET_EXCEEDED, NO_CHECKPOINT, SolveStats
+from .solvers import solve
+from .transforms import random_grid
 
 class SudokuBoard:
     """Maneja la lógica del tablero de Sudoku"""
@@ -18,55 +22,91 @@ class SudokuBoard:
         self.difficulty_level = 1
         self.difficulty_metrics = {}
         self.use_advanced_difficulty = True  # Siempre usar sistema avanzado
+        self.solver_mode = 'bitmask'  # Nombre de un motor registrado en solvers.SOLVERS ('bitmask', 'mrv', 'dlx', 'coloring')
+        self.last_solve_nodes = None  # Nodos visitados por la última resolución (None si el modo no los cuenta)
+        self.use_propagation = True  # Aplicar singles desnudos y ocultos antes de la búsqueda
+        self.last_propagation_stats = None  # Celdas colocadas por cada regla en la última resolución
+        self.require_unique_solution = False  # Descartar puzzles con más de una solución al generar
+        self.max_solve_nodes = None  # Presupuesto de nodos por resolución (None = sin límite)
+        self.max_solve_time = None  # Presupuesto de tiempo por resolución en segundos (None = sin límite)
+        self.last_solve_stats = None  # SolveStats de la última resolución
+        self.grid_generation = 'backtracking'  # Tableros completos: 'backtracking' o 'transform' (simetrías de un tablero base)
+        self.removal_strategy = 'distribution'  # Remoción de pistas: 'distribution' o 'dig' (solución única pista a pista)
+        self.puzzle_pool = None  # PuzzlePool opcional con puzzles generados en segundo plano
+        self.puzzle_bank = None  # PuzzleBank opcional con puzzles guardados en disco
+        self.generation_jobs = 1  # Procesos para calificar las variaciones al generar (None = todos los núcleos)
+        self.generation_policy = None  # GenerationPolicy opcional (umbral de calidad, intentos y plazo)
 
 
-    def get_neighbors(self, row: int, col: int) -> set[tuple[int]]:
-        """Genera un conjunto con todas las celdas que estan en la misma fila, la misma columna o la misma cuadricula 3x3 que la celda indicada"""
-        neighbors = set()
-        # Mismos fila y columna
-        for i in range(self.size):
-            if i != col:
-                neighbors.add((row, i))
-            if i != row:
-                neighbors.add((i, col))
-        # Misma región 3x3
-        start_row = (row // 3) * 3
-        start_col = (col // 3) * 3
-        for i in range(start_row, start_row + 3):
-            for j in range(start_col, start_col + 3):
-                if (i, j) != (row, col):
-                    neighbors.add((i, j))
-        return neighbors
+    def get_neighbors(self, row: int, col: int) -> FrozenSet[Tuple[int, int]]:
+        """Retorna el conjunto (precalculado) de celdas que estan en la misma fila, la misma columna o la misma cuadricula 3x3 que la celda indicada"""
+        return PEER_CELLS[row][col]
     
     def is_proper_coloring_at(self, board: List[List[int]], row: int, col: int, num: int) -> bool:
         """Verifica si una celda (vertice) esta coloreada adecuadamente"""
-        for n_row, n_col in self.get_neighbors(row, col):
+        for n_row, n_col in PEER_CELLS[row][col]:
             if board[n_row][n_col] == num:
                 return False
             
         return True
     
     def solve_backtracking(self, board: List[List[int]]) -> bool:
-        """Resuelve el Sudoku usando backtracking"""
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                if board[i][j] == 0:
-                    for num in range(1, 10):
-                        if self.is_proper_coloring_at(board, i, j, num):
-                            board[i][j] = num
-                            
-                            if self.solve_backtracking(board):
-                                return True
-                            
-                            board[i][j] = 0
-                    
-                    return False
-        
-        return True
+        """Resuelve el Sudoku usando backtracking según el modo de resolución configurado"""
+        stats = solve(board, self.solver_mode, max_nodes=self.max_solve_nodes,
+                      max_time=self.max_solve_time, use_propagation=self.use_propagation)
+        self.last_solve_stats = stats
+        self.last_solve_nodes = stats.nodes
+        self.last_propagation_stats = stats.propagation
+        return stats.solved
+
+    def _solve_backtracking_coloring(self, board: List[List[int]], stats: Optional[SolveStats] = None) -> bool:
+        """Resuelve el Sudoku usando backtracking con verificación de coloración por vecinos.
+
+        Con stats anota nodos, retrocesos y profundidad máxima y respeta sus presupuestos
+        (lanza BudgetExceeded y el tablero queda con la asignación parcial).
+        """
+        # Las celdas vacías se llenan en orden de fila, igual que buscando la primera vacía en cada nivel
+        empty_cells = [(i, j) for i in range(self.size) for j in range(self.size) if board[i][j] == 0]
+        total = len(empty_cells)
+        nodes = backtracks = max_depth = 0
+        checkpoint = stats.next_checkpoint(0) if stats is not None else NO_CHECKPOINT
+
+        def place(index: int) -> bool:
+            nonlocal nodes, backtracks, max_depth, checkpoint
+            nodes += 1
+            if nodes > checkpoint:
+                checkpoint = stats.check(nodes)
+            if index > max_depth:
+                max_depth = index
+            if index == total:
+                return True
+
+            i, j = empty_cells[index]
+            for num in range(1, 10):
+                if self.is_proper_coloring_at(board, i, j, num):
+                    board[i][j] = num
+
+                    if place(index + 1):
+                        return True
+
+                    board[i][j] = 0
+                    backtracks += 1
+
+            return False
+
+        try:
+            return place(0)
+        finally:
+            if stats is not None:
+                stats.nodes, stats.backtracks, stats.max_depth = nodes, backtracks, max_depth
     
     def generate_complete_board(self) -> List[List[int]]:
-        """Genera un tablero completo de Sudoku válido"""
+        """Genera un tablero completo de Sudoku válido según el modo de generación configurado"""
+        if self.grid_generation == 'transform':
+            return random_grid()
+        if self.grid_generation != 'backtracking':
+            raise ValueError(f"Modo de generación desconocido: {self.grid_generation!r} (disponibles: backtracking, transform)")
+
         board = [[0 for _ in range(self.size)] for _ in range(self.size)]
         
         # Llenar diagonal de cuadrados 3x3 primero
@@ -88,7 +128,18 @@ class SudokuBoard:
                 board[row + i][col + j] = nums[i * 3 + j]
     
     def generate_puzzle(self, difficulty: str = 'facil') -> Tuple[List[List[int]], int]:
-        """Genera un puzzle usando el sistema avanzado o básico"""
+        """Genera un puzzle tomándolo del banco o de la reserva si hay uno listo, o con el sistema avanzado"""
+        if self.puzzle_bank is not None:
+            entry = self.puzzle_bank.sample_for(difficulty, unique_only=self.require_unique_solution)
+            if entry is not None:
+                self.load_puzzle(entry['puzzle'], entry['solution'], entry['metrics'])
+                return entry['puzzle'], entry['difficulty']
+        
+        if self.puzzle_pool is not None:
+            entry = self.puzzle_pool.take(difficulty)
+            if entry is not None:
+                self.load_puzzle(entry['puzzle'], entry['solution'], entry['metrics'])
+                return entry['puzzle'], entry['difficulty']
         
         return self.generate_advanced_puzzle(difficulty)
     
@@ -97,13 +148,21 @@ class SudokuBoard:
         
         from .advanced_difficulty import AdvancedDifficultySystem
         
-        advanced_system = AdvancedDifficultySystem()
-        puzzle, final_difficulty, metrics = advanced_system.generate_advanced_puzzle(difficulty)
+        advanced_system = AdvancedDifficultySystem(self.removal_strategy)
+        advanced_system.board.grid_generation = self.grid_generation
+        puzzle, final_difficulty, metrics = advanced_system.generate_advanced_puzzle(
+            difficulty, require_unique=self.require_unique_solution, jobs=self.generation_jobs,
+            policy=self.generation_policy)
         
+        self.load_puzzle(puzzle, advanced_system.board.solution, metrics)
+        return puzzle, final_difficulty
+    
+    def load_puzzle(self, puzzle: List[List[int]], solution: List[List[int]], metrics: Dict):
+        """Carga un puzzle ya generado con su solución y sus métricas de dificultad"""
         # Actualizar el tablero
         self.board = copy.deepcopy(puzzle)
         self.initial_board = copy.deepcopy(puzzle)
-        self.solution = copy.deepcopy(advanced_system.board.solution)
+        self.solution = copy.deepcopy(solution)
         self.difficulty_level = metrics['final_difficulty']  # Usar el valor float directamente
         self.difficulty_metrics = metrics
         
@@ -113,8 +172,6 @@ class SudokuBoard:
             'average': metrics['final_difficulty'],  # Usar el valor float directamente
             'system': 'advanced'
         }
-        
-        return puzzle, final_difficulty
     
     def get_cell_value(self, row: int, col: int) -> int:
         """Obtiene el valor de una celda"""
@@ -155,8 +212,13 @@ class SudokuBoard:
         
         return validity
     
-    def solve_current_board(self):
-        """Resuelve el tablero actual manteniendo los números iniciales"""
+    def solve_current_board(self, solver_mode: Optional[str] = None) -> SolveStats:
+        """Resuelve el tablero actual manteniendo los números iniciales (opcionalmente con otro modo de resolución).
+
+        Retorna las estadísticas de la resolución (SolveStats).
+        """
+        mode = solver_mode if solver_mode is not None else self.solver_mode
+        
         print("=" * 50)
         print("🚀 INICIANDO RESOLUCIÓN DEL SUDOKU")
         print("=" * 50)
@@ -165,7 +227,12 @@ class SudokuBoard:
         self.clear_editable_cells()
         
         temp_board = copy.deepcopy(self.board)
-        solved = self.solve_backtracking(temp_board)
+        previous_mode = self.solver_mode
+        self.solver_mode = mode
+        try:
+            solved = self.solve_backtracking(temp_board)
+        finally:
+            self.solver_mode = previous_mode
         
         end_time = time.time()
         resolution_time = end_time - start_time
@@ -179,6 +246,12 @@ class SudokuBoard:
             
             print("✅ RESULTADO: Sudoku resuelto exitosamente")
             print(f"⏱️  TIEMPO DE RESOLUCIÓN: {resolution_time:.4f} segundos ({resolution_time * 1000:.2f} ms)")
+            if self.last_propagation_stats is not None:
+                stats = self.last_propagation_stats
+                print(f"🧩 PROPAGACIÓN: {stats['naked_singles']} singles desnudos, {stats['hidden_singles']} singles ocultos")
+            if self.last_solve_nodes is not None:
+                solve_stats = self.last_solve_stats
+                print(f"🌳 NODOS VISITADOS ({mode}): {solve_stats.nodes} | RETROCESOS: {solve_stats.backtracks} | PROFUNDIDAD MÁXIMA: {solve_stats.max_depth}")
             
             # Categorizar velocidad
             if resolution_time < 0.001:
@@ -193,12 +266,17 @@ class SudokuBoard:
                 speed_category = "🐌 LENTO"
             
             print(f"📊 VELOCIDAD: {speed_category}")
+        elif self.last_solve_stats.status == BUDGET_EXCEEDED:
+            print("⛔ RESULTADO: Se agotó el presupuesto de resolución")
+            print(f"⏱️  TIEMPO TRANSCURRIDO: {resolution_time:.4f} segundos")
+            print(f"🌳 NODOS VISITADOS ({mode}): {self.last_solve_stats.nodes} (límite: {self.max_solve_nodes}, tiempo límite: {self.max_solve_time})")
         else:
             print("❌ RESULTADO: No se pudo resolver el Sudoku")
             print(f"⏱️  TIEMPO TRANSCURRIDO: {resolution_time:.4f} segundos")
             print("🔍 CAUSA: El puzzle podría no tener solución o estar mal configurado")
         
         print("=" * 50)
+        return self.last_solve_stats
     
     def get_difficulty_level(self) -> float:
         """Retorna el nivel de dificultad actual"""
@@ -0,0 +1,80 @@
+"""
+Exportación masiva de puzzles desde la línea de comandos
+
+Escribe los puzzles a medida que se generan, con memoria acotada, en uno de
+dos formatos:
+- jsonl: un objeto JSON por línea con 'puzzle' y 'solution' (81 caracteres),
+  'difficulty' y 'metrics'.
+- line: solo el puzzle, 81 caracteres por línea ('.' para las celdas vacías).
+
+Uso:
+    python -m sudoku 1000 --difficulty dificil --format line -o dificiles.txt
+    python -m sudoku 0 --seed 7 --jobs 0 | head -n 100   (0 = sin fin)
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from typing import Dict, Optional, Sequence, TextIO
+from .advanced_difficulty import REMOVAL_STRATEGIES
+from .batch import format_puzzle
+from .pool import DIFFICULTIES
+from .stream import iter_puzzles
+
+FORMATS = ('jsonl', 'line')
+
+
+def format_entry(entry: Dict, output_format: str = 'jsonl') -> str:
+    """Convierte una entrada generada en una línea del formato indicado (sin salto de línea)"""
+    if output_format == 'line':
+        return format_puzzle(entry['puzzle'])
+    return json.dumps({
+        'puzzle': format_puzzle(entry['puzzle']),
+        'solution': format_puzzle(entry['solution']),
+        'difficulty': entry['difficulty'],
+        'metrics': entry['metrics'],
+    })
+
+
+def export_puzzles(output: TextIO, count: int, difficulty: str = 'facil', output_format: str = 'jsonl',
+                   seed: Optional[int] = None, jobs: Optional[int] = 1, require_unique: bool = False,
+                   grid_generation: str = 'backtracking', removal_strategy: str = 'distribution') -> int:
+    """Escribe count puzzles (0 = sin fin) en output; retorna cuántos escribió"""
+    generator = iter_puzzles(difficulty, seed, jobs, require_unique, grid_generation, removal_strategy)
+    entries = itertools.islice(generator, count) if count else generator
+
+    written = 0
+    try:
+        for entry in entries:
+            output.write(format_entry(entry, output_format) + '\n')
+            written += 1
+    finally:
+        generator.close()  # Termina el pool de procesos si lo hay
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='python -m sudoku', description="Genera puzzles en flujo continuo")
+    parser.add_argument('count', type=int, help="puzzles a generar (0 = sin fin)")
+    parser.add_argument('--difficulty', default='facil', choices=DIFFICULTIES)
+    parser.add_argument('--format', default='jsonl', choices=FORMATS, dest='output_format')
+    parser.add_argument('-o', '--output', default='-', help="archivo de salida ('-' = salida estándar)")
+    parser.add_argument('--seed', type=int, default=None, help="semilla para una secuencia reproducible")
+    parser.add_argument('--jobs', type=int, default=1, help="procesos generadores (0 = todos los núcleos)")
+    parser.add_argument('--unique', action='store_true', help="solo puzzles con solución única")
+    parser.add_argument('--grid-generation', default='backtracking', choices=('backtracking', 'transform'))
+    parser.add_argument('--strategy', default='distribution', choices=REMOVAL_STRATEGIES,
+                        help="remoción de pistas ('dig' garantiza solución única)")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        export_puzzles(output, args.count, args.difficulty, args.output_format, args.seed, args.jobs or None,
+                       args.unique, args.grid_generation, args.strategy)
+    except BrokenPipeError:
+        # El lector cerró la tubería (p. ej. `| head`): terminar sin traza
+        sys.stderr.close()
+    finally:
+        if output is not sys.stdout:
+            output.close()
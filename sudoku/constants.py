@@ -52,6 +52,34 @@ BUTTON_SPACING = 20
 # Número de celdas iniciales
 INITIAL_CELLS = 30
 
+# Modo de resolución usado por el botón "Resolver": 'mrv', 'bitmask', 'dlx' o 'coloring'
+SOLVER_MODE = 'mrv'
+
+# Resolver sin bloquear el bucle principal con el motor de SOLVER_MODE: con 'mrv' la búsqueda
+# se dibuja paso a paso (StepSolver recorre el mismo árbol), con otro motor corre en un proceso aparte
+ANIMATE_SOLVER = True
+# Presupuesto de tiempo en segundos de cada resolución de la interfaz (None = sin límite)
+SOLVER_MAX_TIME = 30.0
+# Tiempo máximo de búsqueda por cuadro en segundos (a 60 FPS cada cuadro dura ~16 ms)
+SOLVER_FRAME_BUDGET = 0.008
+
+# Generar solo puzzles con solución única en la interfaz
+REQUIRE_UNIQUE_SOLUTION = True
+
+# Generación de tableros completos: 'backtracking' (búsqueda) o 'transform' (simetrías de un tablero base)
+GRID_GENERATION = 'backtracking'
+
+# Remoción de pistas: 'distribution' (según la dificultad) o 'dig' (quitar pistas conservando la solución única)
+REMOVAL_STRATEGY = 'distribution'
+
+# Reserva de puzzles generados en segundo plano (cambio de puzzle instantáneo)
+USE_PUZZLE_POOL = True
+# Puzzles listos que se mantienen por dificultad
+PUZZLE_POOL_WATERMARK = 3
+
+# Banco de puzzles en disco (se usa si el archivo existe; se llena con `python -m sudoku.bank`)
+PUZZLE_BANK_PATH = 'puzzles.db'
+
 # Configuración de dificultad
 DIFFICULTY_LEVELS = {
     'facil': {'range': (1, 6), 'label': 'Fácil'},
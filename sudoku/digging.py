@@ -0,0 +1,159 @@
+"""
+Generación de puzzles de solución única "cavando huecos"
+
+Se parte de un tablero completo y se quitan pistas una a una; cada remoción se
+conserva solo si el puzzle sigue teniendo solución única. Como la solución se
+conoce, basta con buscar una solución alternativa en la que la celda removida
+tenga otro dígito: si no existe, la solución sigue siendo única.
+
+HoleDigger mantiene entre pruebas las máscaras de 9 bits de filas, columnas y
+cajas y la lista de celdas vacías del puzzle actual. Cada prueba coloca y
+deshace dígitos sobre ese mismo estado, en lugar de reconstruir el tablero y
+sus máscaras desde cero como count_solutions. Además, quitar pistas solo puede
+agregar soluciones, así que una celda rechazada no necesita volver a probarse.
+"""
+
+import random
+from typing import Iterable, List, Optional, Sequence
+from .grid_index import ALL_DIGITS_MASK, BOX_OF, CELL_COL, CELL_ROW, NUM_CELLS, unit_masks
+
+# (fila, columna, caja) de cada celda
+CELL_UNITS = tuple((CELL_ROW[i], CELL_COL[i], BOX_OF[i]) for i in range(NUM_CELLS))
+
+
+class HoleDigger:
+    """Puzzle de solución única que se va vaciando a partir de su solución"""
+
+    def __init__(self, solution: Sequence[Sequence[int]]):
+        self.solution = [list(row) for row in solution]
+        self.board = [list(row) for row in solution]
+        self.rows, self.cols, self.boxes = unit_masks(self.board)
+        self.empty: List[int] = []  # Celdas vacías (el orden cambia durante las pruebas)
+        self.probes = 0  # Remociones probadas
+        self.nodes = 0  # Nodos visitados por todas las pruebas
+
+    @property
+    def clues(self) -> int:
+        return NUM_CELLS - len(self.empty)
+
+    def try_remove(self, cell: int) -> bool:
+        """Quita la pista de la celda (0-80) si la solución sigue siendo única; retorna si la quitó"""
+        row, col, box = CELL_ROW[cell], CELL_COL[cell], BOX_OF[cell]
+        bit = 1 << (self.solution[row][col] - 1)
+        if self.board[row][col] == 0:
+            return False
+        self.probes += 1
+
+        self.rows[row] ^= bit
+        self.cols[col] ^= bit
+        self.boxes[box] ^= bit
+
+        # Buscar una solución con otro dígito en la celda
+        alternatives = ~(self.rows[row] | self.cols[col] | self.boxes[box]) & ALL_DIGITS_MASK & ~bit
+        while alternatives:
+            other = alternatives & -alternatives
+            alternatives ^= other
+            if self._has_solution_with(row, col, box, other):
+                self.rows[row] |= bit
+                self.cols[col] |= bit
+                self.boxes[box] |= bit
+                return False
+
+        self.board[row][col] = 0
+        self.empty.append(cell)
+        return True
+
+    def _has_solution_with(self, row: int, col: int, box: int, bit: int) -> bool:
+        """Indica si el puzzle actual tiene solución con el dígito bit en (row, col)"""
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.boxes[box] |= bit
+        try:
+            return self._has_solution()
+        finally:
+            self.rows[row] ^= bit
+            self.cols[col] ^= bit
+            self.boxes[box] ^= bit
+
+    def _has_solution(self) -> bool:
+        """Búsqueda MRV de existencia sobre las celdas vacías; deja el estado como estaba.
+
+        Las celdas con un único candidato se asignan sin ramificar y se deshacen al
+        volver, como en solvers._search_mrv.
+        """
+        self.nodes += 1
+        rows, cols, boxes, empty = self.rows, self.cols, self.boxes, self.empty
+        forced = []
+        found = False
+
+        while True:
+            if not empty:
+                found = True
+                break
+
+            # Celda vacía con menos candidatos
+            best_pos = -1
+            best_mask = 0
+            best_count = 10
+            for pos, cell in enumerate(empty):
+                row, col, box = CELL_UNITS[cell]
+                mask = ~(rows[row] | cols[col] | boxes[box]) & ALL_DIGITS_MASK
+                count = mask.bit_count()
+                if count < best_count:
+                    best_pos, best_mask, best_count = pos, mask, count
+                    if count <= 1:
+                        break
+            if best_count == 0:
+                break
+
+            cell = empty[best_pos]
+            empty[best_pos] = empty[-1]
+            empty.pop()
+            row, col, box = CELL_UNITS[cell]
+
+            if best_count == 1:
+                rows[row] |= best_mask
+                cols[col] |= best_mask
+                boxes[box] |= best_mask
+                forced.append((cell, best_mask))
+                continue
+
+            while best_mask and not found:
+                bit = best_mask & -best_mask
+                best_mask ^= bit
+                rows[row] |= bit
+                cols[col] |= bit
+                boxes[box] |= bit
+                found = self._has_solution()
+                rows[row] ^= bit
+                cols[col] ^= bit
+                boxes[box] ^= bit
+            empty.append(cell)
+            break
+
+        for cell, bit in reversed(forced):
+            row, col, box = CELL_UNITS[cell]
+            rows[row] ^= bit
+            cols[col] ^= bit
+            boxes[box] ^= bit
+            empty.append(cell)
+        return found
+
+    def dig(self, order: Iterable[int], target_clues: int = 0) -> List[List[int]]:
+        """Prueba las celdas en el orden dado hasta dejar target_clues pistas; retorna el puzzle"""
+        for cell in order:
+            if self.clues <= target_clues:
+                break
+            self.try_remove(cell)
+        return [row[:] for row in self.board]
+
+
+def dig_holes(complete_board: Sequence[Sequence[int]], target_clues: int = 0,
+              order: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """Puzzle de solución única con target_clues pistas o, si no se puede, el mínimo alcanzado.
+
+    order es el orden en que se prueban las celdas (0-80); por defecto uno aleatorio.
+    """
+    if order is None:
+        order = random.sample(range(NUM_CELLS), NUM_CELLS)
+    return HoleDigger(complete_board).dig(order, target_clues)
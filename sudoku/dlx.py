@@ -0,0 +1,220 @@
+"""
+Resolución de Sudoku como problema de cobertura exacta (Algoritmo X con Dancing Links)
+
+La matriz de restricciones tiene 324 columnas en cuatro bloques de 81:
+- celda (fila, columna) ocupada,
+- fila con dígito,
+- columna con dígito,
+- caja con dígito.
+
+Cada una de las 729 filas de la matriz corresponde a colocar un dígito en una
+celda y cubre exactamente una columna de cada bloque. Una solución del Sudoku es
+un conjunto de 81 filas que cubre cada columna exactamente una vez.
+"""
+
+from typing import Iterator, List, Optional
+from .grid_index import BOX_OF, CELL_COL, CELL_ROW, NUM_CELLS, SIZE
+from .solve_stats import NO_CHECKPOINT, SolveStats
+
+NUM_COLUMNS = 4 * NUM_CELLS
+
+
+class DancingLinks:
+    """Algoritmo X de Knuth sobre listas doblemente enlazadas almacenadas en arreglos"""
+
+    def __init__(self, board: List[List[int]], stats: Optional[SolveStats] = None):
+        # Nodo 0: raíz; nodos 1..324: cabeceras de columna; resto: unos de la matriz
+        total_headers = NUM_COLUMNS + 1
+        self.left = [i - 1 for i in range(total_headers)]
+        self.right = [i + 1 for i in range(total_headers)]
+        self.up = list(range(total_headers))
+        self.down = list(range(total_headers))
+        self.column = list(range(total_headers))
+        self.row_id = [-1] * total_headers
+        self.size = [0] * total_headers
+        self.left[0] = NUM_COLUMNS
+        self.right[NUM_COLUMNS] = 0
+
+        # Primer nodo de cada fila de la matriz (fila = celda * 9 + dígito - 1)
+        self.row_start = []
+        for cell in range(NUM_CELLS):
+            for digit in range(SIZE):
+                self.row_start.append(self._add_row(cell * SIZE + digit, self._row_columns(cell, digit)))
+
+        self.nodes_visited = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.stats = stats
+        self.checkpoint = stats.next_checkpoint(0) if stats is not None else NO_CHECKPOINT
+        self.valid = True
+        self.givens = {}
+
+        # Los números iniciales se seleccionan de antemano cubriendo sus columnas
+        covered = set()
+        for cell in range(NUM_CELLS):
+            num = board[CELL_ROW[cell]][CELL_COL[cell]]
+            if num == 0:
+                continue
+            columns = self._row_columns(cell, num - 1)
+            if covered.intersection(columns):
+                # Dos números iniciales en conflicto: el tablero no tiene solución
+                self.valid = False
+                return
+            covered.update(columns)
+            self.givens[cell] = num
+            self._select_row(self.row_start[cell * SIZE + num - 1])
+
+    @staticmethod
+    def _row_columns(cell: int, digit: int) -> List[int]:
+        """Columnas (cabeceras 1..324) cubiertas por colocar digit + 1 en la celda"""
+        return [
+            1 + cell,
+            1 + NUM_CELLS + CELL_ROW[cell] * SIZE + digit,
+            1 + 2 * NUM_CELLS + CELL_COL[cell] * SIZE + digit,
+            1 + 3 * NUM_CELLS + BOX_OF[cell] * SIZE + digit,
+        ]
+
+    def _add_row(self, row_id: int, columns: List[int]) -> int:
+        """Agrega una fila de la matriz enlazando un nodo por columna"""
+        first = len(self.left)
+        for k, col in enumerate(columns):
+            node = first + k
+            self.left.append(node - 1 if k > 0 else first + len(columns) - 1)
+            self.right.append(node + 1 if k < len(columns) - 1 else first)
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.column.append(col)
+            self.row_id.append(row_id)
+            self.size[col] += 1
+        return first
+
+    def _cover(self, col: int):
+        """Retira la columna y todas las filas que la intersectan"""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, col: int):
+        """Deshace _cover en orden inverso"""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def _select_row(self, node: int):
+        """Cubre todas las columnas de la fila que contiene al nodo"""
+        self._cover(self.column[node])
+        j = self.right[node]
+        while j != node:
+            self._cover(self.column[j])
+            j = self.right[j]
+
+    def _search(self, partial: List[int]) -> Iterator[List[int]]:
+        """Búsqueda recursiva; restaura la matriz incluso si el iterador se cierra antes de tiempo"""
+        self.nodes_visited += 1
+        if self.nodes_visited > self.checkpoint:
+            self.checkpoint = self.stats.check(self.nodes_visited)
+        if len(partial) > self.max_depth:
+            self.max_depth = len(partial)
+        right, down, size = self.right, self.down, self.size
+
+        if right[0] == 0:
+            yield partial
+            return
+
+        # Heurística de Knuth: columna con menos unos
+        best = right[0]
+        best_size = size[best]
+        col = right[best]
+        while col != 0 and best_size > 1:
+            if size[col] < best_size:
+                best, best_size = col, size[col]
+            col = right[col]
+
+        if best_size == 0:
+            return
+
+        self._cover(best)
+        try:
+            node = down[best]
+            while node != best:
+                partial.append(self.row_id[node])
+                j = right[node]
+                while j != node:
+                    self._cover(self.column[j])
+                    j = right[j]
+                try:
+                    yield from self._search(partial)
+                finally:
+                    j = self.left[node]
+                    while j != node:
+                        self._uncover(self.column[j])
+                        j = self.left[j]
+                    partial.pop()
+                self.backtracks += 1
+                node = down[node]
+        finally:
+            self._uncover(best)
+
+    def _to_board(self, partial: List[int]) -> List[List[int]]:
+        """Convierte las filas seleccionadas (más los números iniciales) en un tablero"""
+        board = [[0 for _ in range(SIZE)] for _ in range(SIZE)]
+        for cell, num in self.givens.items():
+            board[CELL_ROW[cell]][CELL_COL[cell]] = num
+        for row_id in partial:
+            cell, digit = divmod(row_id, SIZE)
+            board[CELL_ROW[cell]][CELL_COL[cell]] = digit + 1
+        return board
+
+    def iter_solutions(self) -> Iterator[List[List[int]]]:
+        """Enumera todas las soluciones de forma perezosa"""
+        if not self.valid:
+            return
+        search = self._search([])
+        try:
+            for partial in search:
+                yield self._to_board(partial)
+        finally:
+            search.close()
+
+    def solve(self) -> Optional[List[List[int]]]:
+        """Retorna la primera solución encontrada o None si no hay solución"""
+        solutions = self.iter_solutions()
+        try:
+            return next(solutions, None)
+        finally:
+            solutions.close()
+
+    def count(self, limit: Optional[int] = None) -> int:
+        """Cuenta soluciones deteniéndose al llegar a limit (None cuenta todas)"""
+        if not self.valid:
+            return 0
+        total = 0
+        search = self._search([])
+        try:
+            for _ in search:
+                total += 1
+                if limit is not None and total >= limit:
+                    break
+        finally:
+            search.close()
+        return total
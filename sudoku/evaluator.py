@@ -0,0 +1,270 @@
+"""
+Evaluación incremental de la dificultad
+
+DifficultyEvaluator está ligado a un tablero y mantiene el estado de todas las
+métricas de AdvancedDifficultySystem.calculate_difficulty. Quitar o restaurar
+una pista (remove / restore) solo actualiza lo que depende de esa celda y de sus
+20 vecinos:
+- frecuencia de cada número y dígitos repetidos por unidad (permutaciones),
+- máscaras de candidatos de los vecinos vacíos y el histograma de cuántos
+  candidatos tiene cada celda vacía (entropía, coeficientes binomiales y espacio
+  de soluciones),
+- grado y triángulos de cada celda en el subgrafo de celdas vacías (clustering y
+  densidad),
+- términos de inclusión-exclusión de los pares que comparten unidad con una celda
+  cuyos candidatos cambiaron.
+
+Las sumas se guardan como enteros (los términos racionales escalados por el
+mínimo común múltiplo de sus denominadores), así que no acumulan error de
+redondeo por muchas ediciones; difficulty() solo combina esos totales. El
+resultado coincide con calculate_difficulty salvo en los últimos bits de las
+métricas, porque las sumas de punto flotante no se hacen en el mismo orden.
+"""
+
+import math
+from typing import Iterator, Optional, Sequence
+from .advanced_difficulty import AdvancedDifficultySystem
+from .grid_index import (ALL_DIGITS_MASK, BOX_SIZE, CELL_COL, CELL_ROW, NUM_CELLS, PEER_MASK, SIZE, UNITS,
+                         UNITS_OF)
+
+# Celdas de cada una de las 27 unidades como bitset
+UNIT_MASK = tuple(sum(1 << cell for cell in unit) for unit in UNITS)
+
+# Índice en UNITS de la primera caja
+FIRST_BOX_UNIT = 2 * SIZE
+
+# Un término de inclusión-exclusión es |A ∩ B| / |A ∪ B| con |A ∪ B| <= 9, y uno de clustering
+# es triángulos / C(grado, 2) con grado <= 20: escalados por el mcm de los denominadores son enteros
+PAIR_SCALE = math.lcm(*range(1, SIZE + 1))
+MAX_DEGREE = 3 * (SIZE - 1) - 2 * (BOX_SIZE - 1)
+CLUSTERING_SCALE = math.lcm(*(math.comb(degree, 2) for degree in range(2, MAX_DEGREE + 1)))
+
+# Aporte de una celda con n candidatos a la entropía y a la suma de coeficientes binomiales
+ENTROPY_TERM = tuple(math.log2(n) if n > 1 else 0.0 for n in range(SIZE + 1))
+BINOMIAL_TERM = tuple(sum(math.comb(n, k) for k in range(1, min(n + 1, 4))) if n > 1 else 0
+                      for n in range(SIZE + 1))
+MAX_BINOMIAL_TERM = sum(math.comb(SIZE, k) for k in range(1, 4))
+
+
+def _mask_cells(mask: int) -> Iterator[int]:
+    """Índices 0-80 de los bits encendidos de un bitset de celdas"""
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+# Término de inclusión-exclusión escalado, indexado por [|A ∩ B|][|A| + |B|] (0 si ambos están vacíos)
+PAIR_TERM = tuple(
+    tuple(PAIR_SCALE * intersection // (sizes - intersection) if sizes > intersection else 0
+          for sizes in range(2 * SIZE + 1))
+    for intersection in range(SIZE + 1)
+)
+
+
+class DifficultyEvaluator:
+    """Dificultad de un tablero que se edita celda por celda"""
+
+    def __init__(self, board: Sequence[Sequence[int]], system: Optional[AdvancedDifficultySystem] = None):
+        self.system = system or AdvancedDifficultySystem()
+        self.board = [list(row) for row in board]
+        self.values = [board[CELL_ROW[cell]][CELL_COL[cell]] for cell in range(NUM_CELLS)]  # Para restore
+
+        self.unit_counts = [[0] * (SIZE + 1) for _ in UNITS]  # Veces que aparece cada dígito por unidad
+        self.unit_used = [0] * len(UNITS)  # Máscara de dígitos presentes por unidad
+        self.duplicates = 0  # Repeticiones sobrantes en todas las unidades
+        self.box_duplicates = [0] * SIZE
+        self.number_counts = [0] * (SIZE + 1)
+
+        self.empty_mask = 0
+        for cell in range(NUM_CELLS):
+            if self.values[cell]:
+                self._count_digit(cell, self.values[cell], 1)
+            else:
+                self.empty_mask |= 1 << cell
+
+        # Estado inicial de las métricas, calculado una sola vez desde cero
+        self.candidates = [self._candidate_mask(cell) if self.empty_mask >> cell & 1 else 0
+                           for cell in range(NUM_CELLS)]
+        self.histogram = [0] * (SIZE + 1)  # Celdas vacías por número de candidatos
+        for cell in _mask_cells(self.empty_mask):
+            self.histogram[self.candidates[cell].bit_count()] += 1
+        self.degree = [(PEER_MASK[cell] & self.empty_mask).bit_count() if self.empty_mask >> cell & 1 else 0
+                       for cell in range(NUM_CELLS)]
+        self.triangles = [self._count_triangles(cell) if self.empty_mask >> cell & 1 else 0
+                          for cell in range(NUM_CELLS)]
+        self.edges = sum(self.degree)  # Suma de grados (dos veces el número de aristas)
+        self.clustering_total = sum(self._clustering_term(cell) for cell in range(NUM_CELLS))
+        self.pair_total = self._pairs_touching(self.empty_mask)
+
+    @property
+    def empty_cells(self) -> int:
+        return self.empty_mask.bit_count()
+
+    def remove(self, cell: int):
+        """Quita la pista de la celda (0-80); restore la vuelve a colocar"""
+        value = self.board[CELL_ROW[cell]][CELL_COL[cell]]
+        if not value:
+            raise ValueError(f"La celda {cell} ya está vacía")
+        self.values[cell] = value
+        self._update(cell, 0)
+
+    def restore(self, cell: int, value: Optional[int] = None):
+        """Coloca value en la celda vacía (por defecto, el último número que tuvo)"""
+        if self.board[CELL_ROW[cell]][CELL_COL[cell]]:
+            raise ValueError(f"La celda {cell} no está vacía")
+        value = value or self.values[cell]
+        if not value:
+            raise ValueError(f"La celda {cell} nunca tuvo un número que restaurar")
+        self.values[cell] = value
+        self._update(cell, value)
+
+    def difficulty(self) -> float:
+        """Dificultad 1-10 del tablero actual, igual que calculate_difficulty.
+
+        Como calculate_difficulty, deja las métricas individuales en system
+        (permutation_difficulty, graph_difficulty y combinatorial_difficulty).
+        """
+        system = self.system
+        empty_cells = self.empty_cells
+
+        number_distribution = system._distribution_uniformity(self.number_counts)
+
+        # Reordenar filas o columnas dentro de una banda o pila no cambia ninguna unidad
+        band_permutations = 1.0 if self.duplicates == 0 else 0.0
+        valid_row_perms = sum(6 for band in range(BOX_SIZE)
+                              if not any(self.box_duplicates[band * BOX_SIZE:(band + 1) * BOX_SIZE]))
+        valid_col_perms = sum(6 for stack in range(BOX_SIZE) if not any(self.box_duplicates[stack::BOX_SIZE]))
+        block_permutations = ((valid_row_perms / 3) / 6.0 + (valid_col_perms / 3) / 6.0) / 2.0
+
+        clustering = self.clustering_total / CLUSTERING_SCALE / empty_cells if empty_cells >= 2 else 0.0
+        graph_complexity = system._combine_graph_metrics(clustering, self.edges / 2, empty_cells)
+
+        if empty_cells == 0:
+            combinatorial_complexity = 0.0
+            solution_space = 1.0
+        else:
+            max_restrictions = empty_cells * (empty_cells - 1) / 2
+            inclusion_exclusion = self.pair_total / PAIR_SCALE / max_restrictions if empty_cells >= 2 else 0.0
+            binomial_complexity = (sum(count * BINOMIAL_TERM[n] for n, count in enumerate(self.histogram))
+                                   / (empty_cells * MAX_BINOMIAL_TERM))
+            entropy = sum(count * ENTROPY_TERM[n] for n, count in enumerate(self.histogram))
+            combinatorial_complexity = system._combine_combinatorial_metrics(
+                inclusion_exclusion, binomial_complexity, entropy, empty_cells)
+            total_branching = sum(count * n for n, count in enumerate(self.histogram))
+            solution_space = system._solution_space_from_branching(total_branching, empty_cells)
+
+        return system._combine_metrics(number_distribution, band_permutations, band_permutations,
+                                       block_permutations, graph_complexity, combinatorial_complexity,
+                                       solution_space)
+
+    def _update(self, cell: int, value: int):
+        """Cambia la celda entre vacía y value, actualizando todas las métricas por diferencia"""
+        old_value = self.board[CELL_ROW[cell]][CELL_COL[cell]]
+        bit = 1 << cell
+
+        # 1. Conteos por unidad, repeticiones y frecuencia de números
+        if old_value:
+            self._count_digit(cell, old_value, -1)
+        if value:
+            self._count_digit(cell, value, 1)
+        self.board[CELL_ROW[cell]][CELL_COL[cell]] = value
+
+        # 2. Celdas vacías cuyos candidatos cambian: la propia celda y algunos de sus vecinos
+        new_empty = self.empty_mask & ~bit if value else self.empty_mask | bit
+        changed = bit
+        new_candidates = {cell: self._candidate_mask(cell) if not value else 0}
+        for peer in _mask_cells(PEER_MASK[cell] & self.empty_mask):
+            candidates = self._candidate_mask(peer)
+            if candidates != self.candidates[peer]:
+                new_candidates[peer] = candidates
+                changed |= 1 << peer
+
+        # 3. Quitar los aportes viejos, cambiar el estado y sumar los nuevos
+        self.pair_total -= self._pairs_touching(changed)
+        for changed_cell, candidates in new_candidates.items():
+            if self.empty_mask >> changed_cell & 1:
+                self.histogram[self.candidates[changed_cell].bit_count()] -= 1
+            if new_empty >> changed_cell & 1:
+                self.histogram[candidates.bit_count()] += 1
+            self.candidates[changed_cell] = candidates
+
+        if new_empty != self.empty_mask:
+            self._update_graph(cell, new_empty)
+        self.empty_mask = new_empty
+        self.pair_total += self._pairs_touching(changed)
+
+    def _count_digit(self, cell: int, value: int, delta: int):
+        """Suma (delta = 1) o resta (delta = -1) una aparición de value en las unidades de la celda"""
+        self.number_counts[value] += delta
+        for unit in UNITS_OF[cell]:
+            counts = self.unit_counts[unit]
+            if delta < 0:
+                counts[value] -= 1
+            if counts[value]:
+                # Una repetición más (o menos) en la unidad
+                self.duplicates += delta
+                if unit >= FIRST_BOX_UNIT:
+                    self.box_duplicates[unit - FIRST_BOX_UNIT] += delta
+            if delta > 0:
+                counts[value] += 1
+            if counts[value]:
+                self.unit_used[unit] |= 1 << (value - 1)
+            else:
+                self.unit_used[unit] &= ~(1 << (value - 1))
+
+    def _candidate_mask(self, cell: int) -> int:
+        row, col, box = UNITS_OF[cell]
+        return ~(self.unit_used[row] | self.unit_used[col] | self.unit_used[box]) & ALL_DIGITS_MASK
+
+    def _update_graph(self, cell: int, new_empty: int):
+        """Actualiza grados, triángulos y clustering cuando la celda entra o sale del subgrafo vacío"""
+        peers = PEER_MASK[cell] & new_empty
+        affected = [cell] + list(_mask_cells(peers))
+        self.clustering_total -= sum(self._clustering_term(other) for other in affected)
+
+        # Una arista nueva (o perdida) entre la celda y cada vecino vacío, y un triángulo por cada
+        # vecino vacío que ambos comparten
+        sign = 1 if new_empty >> cell & 1 else -1
+        for peer in _mask_cells(peers):
+            self.degree[peer] += sign
+            self.triangles[peer] += sign * (PEER_MASK[peer] & peers).bit_count()
+        self.edges += 2 * sign * peers.bit_count()
+        self.empty_mask = new_empty
+        self.degree[cell] = peers.bit_count() if sign > 0 else 0
+        self.triangles[cell] = self._count_triangles(cell) if sign > 0 else 0
+
+        self.clustering_total += sum(self._clustering_term(other) for other in affected)
+
+    def _count_triangles(self, cell: int) -> int:
+        """Aristas entre los vecinos vacíos de la celda (cada una se cuenta desde sus dos extremos)"""
+        neighbors = PEER_MASK[cell] & self.empty_mask
+        return sum((PEER_MASK[neighbor] & neighbors).bit_count() for neighbor in _mask_cells(neighbors)) // 2
+
+    def _clustering_term(self, cell: int) -> int:
+        """Clustering local de una celda vacía, escalado por CLUSTERING_SCALE (0 con grado < 2)"""
+        degree = self.degree[cell]
+        if degree < 2 or not self.empty_mask >> cell & 1:
+            return 0
+        return self.triangles[cell] * CLUSTERING_SCALE // math.comb(degree, 2)
+
+    def _pairs_touching(self, cells: int) -> int:
+        """Suma escalada de los términos de inclusión-exclusión de los pares con alguna celda de cells.
+
+        Como en _calculate_inclusion_exclusion, un par se cuenta una vez por cada
+        unidad (fila, columna o caja) que comparte.
+        """
+        candidates = self.candidates
+        empty_mask = self.empty_mask
+        total = 0
+        for cell in _mask_cells(cells & empty_mask):
+            mask = candidates[cell]
+            size = mask.bit_count()
+            # Los pares con celdas anteriores de cells ya se contaron desde la otra celda
+            others = empty_mask & ~(cells & ((2 << cell) - 1))
+            for unit in UNITS_OF[cell]:
+                for other in UNITS[unit]:
+                    if others >> other & 1:
+                        other_mask = candidates[other]
+                        total += PAIR_TERM[(mask & other_mask).bit_count()][size + other_mask.bit_count()]
+        return total
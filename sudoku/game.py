@@ -57,7 +57,7 @@ class SudokuGame:
     
     def update(self):
         """Actualiza el estado del juego"""
-        pass  # Por ahora no hay lógica de actualización adicional
+        self.gui.update()  # Avanza la resolución paso a paso, si hay una en curso
     
     def draw(self):
         """Dibuja el juego"""
@@ -72,5 +72,8 @@ class SudokuGame:
             self.draw()
             self.clock.tick(FPS)
         
+        if self.gui.puzzle_pool is not None:
+            self.gui.puzzle_pool.stop(timeout=0)
+        self.gui.close_solver()
         pygame.quit()
         sys.exit()
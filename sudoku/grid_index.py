@@ -0,0 +1,117 @@
+"""
+Índice estático de la cuadrícula de Sudoku (grafo de restricciones precalculado)
+
+Las celdas se numeran de 0 a 80 en orden fila-mayor (índice = fila * 9 + columna).
+Todas las tablas se construyen una sola vez al importar el módulo y son inmutables,
+de modo que el tablero, las pistas y el sistema de dificultad pueden compartirlas
+sin reconstruir el grafo en cada llamada.
+"""
+
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, Tuple
+
+SIZE = 9
+BOX_SIZE = 3
+NUM_CELLS = SIZE * SIZE
+
+# Máscara con los 9 dígitos (bit d - 1 representa al dígito d)
+ALL_DIGITS_MASK = (1 << SIZE) - 1
+
+
+def cell_index(row: int, col: int) -> int:
+    """Convierte coordenadas (fila, columna) al índice lineal de la celda"""
+    return row * SIZE + col
+
+
+def _build_units() -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """Construye las unidades de filas, columnas y cajas como tuplas de índices"""
+    rows = tuple(tuple(cell_index(r, c) for c in range(SIZE)) for r in range(SIZE))
+    cols = tuple(tuple(cell_index(r, c) for r in range(SIZE)) for c in range(SIZE))
+    boxes = tuple(
+        tuple(cell_index(br * BOX_SIZE + i, bc * BOX_SIZE + j)
+              for i in range(BOX_SIZE) for j in range(BOX_SIZE))
+        for br in range(BOX_SIZE) for bc in range(BOX_SIZE)
+    )
+    return rows, cols, boxes
+
+
+ROW_UNITS, COL_UNITS, BOX_UNITS = _build_units()
+
+# Las 27 unidades: 0-8 filas, 9-17 columnas, 18-26 cajas
+UNITS: Tuple[Tuple[int, ...], ...] = ROW_UNITS + COL_UNITS + BOX_UNITS
+
+CELL_ROW: Tuple[int, ...] = tuple(i // SIZE for i in range(NUM_CELLS))
+CELL_COL: Tuple[int, ...] = tuple(i % SIZE for i in range(NUM_CELLS))
+BOX_OF: Tuple[int, ...] = tuple(
+    (CELL_ROW[i] // BOX_SIZE) * BOX_SIZE + CELL_COL[i] // BOX_SIZE for i in range(NUM_CELLS)
+)
+
+# Para cada celda, los índices de sus tres unidades (fila, columna, caja) dentro de UNITS
+UNITS_OF: Tuple[Tuple[int, int, int], ...] = tuple(
+    (CELL_ROW[i], SIZE + CELL_COL[i], 2 * SIZE + BOX_OF[i]) for i in range(NUM_CELLS)
+)
+
+
+def _build_peers() -> Tuple[Tuple[int, ...], ...]:
+    """Calcula los 20 vecinos de cada celda (misma fila, columna o caja)"""
+    peers = []
+    for i in range(NUM_CELLS):
+        cells = set()
+        for unit_id in UNITS_OF[i]:
+            cells.update(UNITS[unit_id])
+        cells.discard(i)
+        peers.append(tuple(sorted(cells)))
+    return tuple(peers)
+
+
+PEERS: Tuple[Tuple[int, ...], ...] = _build_peers()
+
+# Vecinos como bitsets de 81 bits (bit i representa a la celda i)
+PEER_MASK: Tuple[int, ...] = tuple(sum(1 << p for p in PEERS[i]) for i in range(NUM_CELLS))
+
+# Vecinos en coordenadas (fila, columna), indexados por [fila][columna]
+PEER_CELLS: Tuple[Tuple[FrozenSet[Tuple[int, int]], ...], ...] = tuple(
+    tuple(
+        frozenset((CELL_ROW[p], CELL_COL[p]) for p in PEERS[cell_index(r, c)])
+        for c in range(SIZE)
+    )
+    for r in range(SIZE)
+)
+
+# Grafo de restricciones completo: (fila, columna) -> vecinos en coordenadas
+CONSTRAINT_GRAPH: Mapping[Tuple[int, int], FrozenSet[Tuple[int, int]]] = MappingProxyType({
+    (r, c): PEER_CELLS[r][c] for r in range(SIZE) for c in range(SIZE)
+})
+
+# Dígitos contenidos en cada máscara de 9 bits, en orden creciente
+MASK_DIGITS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(d for d in range(1, SIZE + 1) if mask & (1 << (d - 1)))
+    for mask in range(ALL_DIGITS_MASK + 1)
+)
+
+
+def unit_masks(board: List[List[int]]) -> Tuple[List[int], List[int], List[int]]:
+    """Calcula las máscaras de dígitos usados por fila, columna y caja de un tablero"""
+    rows = [0] * SIZE
+    cols = [0] * SIZE
+    boxes = [0] * SIZE
+    for r in range(SIZE):
+        board_row = board[r]
+        for c in range(SIZE):
+            num = board_row[c]
+            if num:
+                bit = 1 << (num - 1)
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[BOX_OF[r * SIZE + c]] |= bit
+    return rows, cols, boxes
+
+
+def peer_digits_mask(board: List[List[int]], row: int, col: int) -> int:
+    """Máscara de los dígitos presentes en los vecinos de una celda (sin contar la celda)"""
+    used = 0
+    for p in PEERS[row * SIZE + col]:
+        num = board[CELL_ROW[p]][CELL_COL[p]]
+        if num:
+            used |= 1 << (num - 1)
+    return used
@@ -2,10 +2,29 @@
 Interfaz gráfica de usuario para el juego de Sudoku
 """
 
+import os
 import pygame
+import time
+from multiprocessing import Pool
 from typing import List, Tuple, Optional
 from .constants import *
+from .bank import PuzzleBank
 from .board import SudokuBoard
+from .pool import PuzzlePool, init_worker_process
+from .solve_stats import BUDGET_EXCEEDED, SolveStats
+from .solvers import solve
+from .step_solver import SOLVED, StepSolver
+
+# Motores cuya búsqueda reproduce StepSolver y que por eso se pueden dibujar paso a paso
+STEP_SOLVER_MODES = ('mrv', 'step')
+
+
+def _solve_task(board: List[List[int]], solver_mode: str, max_nodes: Optional[int], max_time: Optional[float],
+                use_propagation: bool) -> Tuple[List[List[int]], SolveStats]:
+    """Función de trabajo para resolver en un proceso aparte; retorna el tablero y sus estadísticas"""
+    stats = solve(board, solver_mode, max_nodes=max_nodes, max_time=max_time, use_propagation=use_propagation)
+    return board, stats
+
 
 class SudokuGUI:
     """Maneja la interfaz gráfica del juego"""
@@ -13,9 +32,25 @@ class SudokuGUI:
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
         self.board = SudokuBoard()
+        self.board.require_unique_solution = REQUIRE_UNIQUE_SOLUTION
+        self.board.grid_generation = GRID_GENERATION
+        self.board.removal_strategy = REMOVAL_STRATEGY
+        self.puzzle_pool = None
+        if os.path.exists(PUZZLE_BANK_PATH):
+            self.board.puzzle_bank = PuzzleBank(PUZZLE_BANK_PATH)
+        if USE_PUZZLE_POOL:
+            self.puzzle_pool = PuzzlePool(watermark=PUZZLE_POOL_WATERMARK,
+                                          require_unique=REQUIRE_UNIQUE_SOLUTION,
+                                          grid_generation=GRID_GENERATION,
+                                          removal_strategy=REMOVAL_STRATEGY)
+            self.board.puzzle_pool = self.puzzle_pool
         self.selected_cell = None
         self.verification_results = None
         self.current_difficulty = 'facil'
+        self.step_solver = None  # Resolución paso a paso en curso (StepSolver) con ANIMATE_SOLVER y SOLVER_MODE 'mrv'
+        self.solve_result = None  # Resolución en curso en el proceso aparte (AsyncResult) con los demás motores
+        self.solve_pool = None
+        self.solve_start_time = 0.0
         
         # Inicializar fuentes
         self.font = pygame.font.Font(None, FONT_SIZE)
@@ -26,8 +61,10 @@ class SudokuGUI:
         # Crear botones
         self.buttons = self.create_buttons()
         
-        # Generar puzzle inicial
+        # Generar puzzle inicial (la reserva aún está vacía) y luego empezar a rellenarla
         self.board.generate_puzzle(self.current_difficulty)
+        if self.puzzle_pool is not None:
+            self.puzzle_pool.start()
     
     def create_buttons(self) -> List[dict]:
         """Crea los botones de la interfaz en el panel lateral"""
@@ -101,7 +138,7 @@ class SudokuGUI:
     
     def handle_key(self, key: int) -> bool:
         """Maneja las teclas presionadas"""
-        if self.selected_cell is None:
+        if self.selected_cell is None or self.solving:
             return False
         
         row, col = self.selected_cell
@@ -123,6 +160,9 @@ class SudokuGUI:
     
     def handle_button_action(self, action: str):
         """Maneja las acciones de los botones"""
+        # Cualquier acción interrumpe una resolución en curso
+        self.cancel_solver()
+        
         if action.startswith('difficulty_'):
             difficulty = action.split('_')[1]
             self.current_difficulty = difficulty
@@ -145,7 +185,10 @@ class SudokuGUI:
             self.selected_cell = None
         
         elif action == 'resolver':
-            self.board.solve_current_board()
+            if ANIMATE_SOLVER:
+                self.start_solver()
+            else:
+                self.board.solve_current_board(SOLVER_MODE)
             self.verification_results = None
             self.selected_cell = None
         
@@ -158,6 +201,84 @@ class SudokuGUI:
             self.verification_results = None
             self.selected_cell = None
     
+    @property
+    def solving(self) -> bool:
+        """Indica si hay una resolución no bloqueante en curso"""
+        return self.step_solver is not None or self.solve_result is not None
+    
+    def start_solver(self):
+        """Inicia una resolución no bloqueante con el motor configurado que avanza en cada cuadro"""
+        self.board.clear_editable_cells()
+        self.solve_start_time = time.time()
+        if SOLVER_MODE in STEP_SOLVER_MODES:
+            self.step_solver = StepSolver(self.board.board)
+            return
+        
+        if self.solve_pool is None:
+            self.solve_pool = Pool(1, initializer=init_worker_process)
+        self.solve_result = self.solve_pool.apply_async(
+            _solve_task, (self.board.board, SOLVER_MODE, self.board.max_solve_nodes,
+                          SOLVER_MAX_TIME, self.board.use_propagation))
+    
+    def cancel_solver(self):
+        """Interrumpe la resolución en curso y descarta los valores parciales"""
+        if self.step_solver is not None:
+            self.step_solver = None
+            self.board.clear_editable_cells()
+        if self.solve_result is not None:
+            # Terminar el proceso es la única forma de detener un motor a mitad de la búsqueda
+            self.solve_result = None
+            self.close_solver()
+    
+    def close_solver(self):
+        """Termina el proceso de resolución, si existe"""
+        if self.solve_pool is not None:
+            self.solve_pool.terminate()
+            self.solve_pool = None
+    
+    def update(self):
+        """Avanza la resolución en curso sin exceder el presupuesto de tiempo del cuadro"""
+        if self.step_solver is not None:
+            self._update_step_solver()
+        elif self.solve_result is not None and self.solve_result.ready():
+            self._finish_background_solve()
+    
+    def _update_step_solver(self):
+        """Avanza StepSolver dentro del presupuesto del cuadro y lo detiene al agotar SOLVER_MAX_TIME"""
+        finished = self.step_solver.run_for(SOLVER_FRAME_BUDGET)
+        resolution_time = time.time() - self.solve_start_time
+        if finished:
+            if self.step_solver.status == SOLVED:
+                print(f"✅ Sudoku resuelto en {resolution_time:.4f} segundos ({self.step_solver.steps} pasos)")
+            else:
+                print(f"❌ No se pudo resolver el Sudoku ({resolution_time:.4f} segundos)")
+            self.step_solver = None
+        elif SOLVER_MAX_TIME is not None and resolution_time >= SOLVER_MAX_TIME:
+            print(f"⛔ Se agotó el presupuesto de {SOLVER_MAX_TIME} segundos ({self.step_solver.steps} pasos)")
+            self.cancel_solver()
+    
+    def _finish_background_solve(self):
+        """Copia al tablero el resultado de la resolución en el proceso aparte"""
+        solved_board, stats = self.solve_result.get()
+        self.solve_result = None
+        self.board.last_solve_stats = stats
+        self.board.last_solve_nodes = stats.nodes
+        self.board.last_propagation_stats = stats.propagation
+        
+        resolution_time = time.time() - self.solve_start_time
+        mode = SOLVER_MODE
+        if stats.solved:
+            # Solo actualizar celdas editables
+            for i in range(self.board.size):
+                for j in range(self.board.size):
+                    if self.board.is_cell_editable(i, j):
+                        self.board.board[i][j] = solved_board[i][j]
+            print(f"✅ Sudoku resuelto en {resolution_time:.4f} segundos ({mode}: {stats.nodes} nodos)")
+        elif stats.status == BUDGET_EXCEEDED:
+            print(f"⛔ Se agotó el presupuesto de resolución ({mode}: {resolution_time:.4f} segundos)")
+        else:
+            print(f"❌ No se pudo resolver el Sudoku ({resolution_time:.4f} segundos)")
+    
     def draw_board(self):
         """Dibuja el tablero de Sudoku en posición fija"""
         
@@ -180,6 +301,11 @@ class SudokuGUI:
                 if self.selected_cell == (row, col):
                     cell_color = LIGHT_BLUE
                 
+                # Resaltar la última celda modificada por la resolución en curso
+                if self.step_solver is not None and self.step_solver.last_change is not None:
+                    if self.step_solver.last_change[:2] == (row, col):
+                        cell_color = LIGHT_GREEN
+                
                 # Verificar resultados de verificación
                 if self.verification_results is not None:
                     if self.verification_results[row][col]:
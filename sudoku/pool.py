@@ -0,0 +1,155 @@
+"""
+Reserva de puzzles generados en segundo plano
+
+PuzzlePool mantiene una cola de puzzles ya generados y calificados por cada
+dificultad y la rellena hasta la marca de nivel (watermark). La generación corre
+en un pool de procesos, un trabajador por dificultad, para que no compita por el
+GIL con el bucle de dibujo; en este proceso solo se encola el resultado, de modo
+que tomar un puzzle es O(1) y no congela la interfaz. Puede usarse también fuera
+de la interfaz gráfica.
+
+Cada entrada es un diccionario con 'puzzle', 'solution', 'difficulty' (entero)
+y 'metrics' (métricas completas de AdvancedDifficultySystem).
+"""
+
+import signal
+import threading
+from collections import deque
+from multiprocessing import Pool
+from typing import Deque, Dict, Iterable, Optional, Set
+from .advanced_difficulty import AdvancedDifficultySystem, GenerationPolicy
+
+DIFFICULTIES = ('facil', 'dificil')
+
+
+def init_worker_process():
+    """Inicializador de los procesos de trabajo lanzados desde la interfaz.
+
+    SDL (pygame) instala su propio manejador de SIGTERM y los procesos creados con fork
+    lo heredan, de modo que Pool.terminate() esperaría para siempre a que terminen.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def generate_entry(difficulty: str, require_unique: bool = False, grid_generation: str = 'backtracking',
+                   jobs: Optional[int] = 1, seed: Optional[int] = None,
+                   policy: Optional[GenerationPolicy] = None, removal_strategy: str = 'distribution') -> Dict:
+    """Genera y califica un puzzle de forma síncrona"""
+    system = AdvancedDifficultySystem(removal_strategy)
+    system.board.grid_generation = grid_generation
+    puzzle, final_difficulty, metrics = system.generate_advanced_puzzle(
+        difficulty, require_unique=require_unique, jobs=jobs, seed=seed, policy=policy)
+    return {
+        'puzzle': puzzle,
+        'solution': system.board.solution,
+        'difficulty': final_difficulty,
+        'metrics': metrics,
+    }
+
+
+class PuzzlePool:
+    """Colas de puzzles por dificultad rellenadas por un pool de procesos en segundo plano"""
+
+    def __init__(self, difficulties: Iterable[str] = DIFFICULTIES, watermark: int = 3,
+                 require_unique: bool = False, grid_generation: str = 'backtracking',
+                 removal_strategy: str = 'distribution'):
+        self.watermark = watermark
+        self.require_unique = require_unique
+        self.grid_generation = grid_generation
+        self.removal_strategy = removal_strategy
+        self.queues: Dict[str, Deque[Dict]] = {difficulty: deque() for difficulty in difficulties}
+        self.generated = 0  # Puzzles generados por el pool de procesos
+        self.misses = 0  # Veces que get() tuvo que generar de forma síncrona
+        self._condition = threading.Condition()
+        self._pool = None
+        self._pending: Set[str] = set()  # Dificultades con un puzzle en generación
+        self._stopped = False
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None and not self._stopped
+
+    def start(self) -> 'PuzzlePool':
+        """Lanza el pool de procesos de relleno (no hace nada si ya está en marcha)"""
+        with self._condition:
+            if self._pool is not None:
+                return self
+            self._stopped = False
+            self._pool = Pool(len(self.queues), initializer=init_worker_process)
+            for difficulty in self.queues:
+                self._refill(difficulty)
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Termina el pool de procesos; los puzzles que se estén generando se descartan.
+
+        Con timeout=0 no se espera a que los procesos terminen de cerrarse.
+        """
+        with self._condition:
+            self._stopped = True
+            pool, self._pool = self._pool, None
+            self._pending.clear()
+            self._condition.notify_all()
+        if pool is not None:
+            pool.terminate()
+            if timeout != 0:
+                pool.join()
+
+    def _refill(self, difficulty: str):
+        """Encarga un puzzle al pool si la cola no llega a la marca (llamar con el candado tomado)"""
+        if (self._stopped or self._pool is None or difficulty in self._pending
+                or len(self.queues[difficulty]) >= self.watermark):
+            return
+        self._pending.add(difficulty)
+        self._pool.apply_async(
+            generate_entry, (difficulty, self.require_unique, self.grid_generation),
+            {'removal_strategy': self.removal_strategy},
+            callback=lambda entry: self._deliver(difficulty, entry),
+            error_callback=lambda error: self._discard(difficulty))
+
+    def _deliver(self, difficulty: str, entry: Dict):
+        """Encola un puzzle recibido del pool y encarga el siguiente"""
+        with self._condition:
+            if self._stopped:
+                return
+            self._pending.discard(difficulty)
+            self.queues[difficulty].append(entry)
+            self.generated += 1
+            self._condition.notify_all()
+            self._refill(difficulty)
+
+    def _discard(self, difficulty: str):
+        """La generación falló: se vuelve a intentar cuando se tome un puzzle de la cola"""
+        with self._condition:
+            self._pending.discard(difficulty)
+
+    def size(self, difficulty: str) -> int:
+        """Número de puzzles listos para la dificultad indicada"""
+        return len(self.queues[difficulty])
+
+    def take(self, difficulty: str) -> Optional[Dict]:
+        """Toma un puzzle listo en O(1) sin bloquear; retorna None si la cola está vacía"""
+        with self._condition:
+            queue = self.queues.get(difficulty)
+            if not queue:
+                if queue is not None:
+                    self._refill(difficulty)
+                return None
+            entry = queue.popleft()
+            self._refill(difficulty)  # Encargar el reemplazo
+            return entry
+
+    def get(self, difficulty: str) -> Dict:
+        """Toma un puzzle listo o, si no hay ninguno, lo genera de forma síncrona"""
+        entry = self.take(difficulty)
+        if entry is None:
+            self.misses += 1
+            entry = generate_entry(difficulty, self.require_unique, self.grid_generation,
+                                   removal_strategy=self.removal_strategy)
+        return entry
+
+    def wait_until_full(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que todas las colas alcancen la marca; retorna False si vence el tiempo"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: all(len(queue) >= self.watermark for queue in self.queues.values()), timeout)
@@ -0,0 +1,158 @@
+"""
+Propagación de restricciones para Sudoku: singles desnudos y singles ocultos
+
+- Single desnudo (naked single): una celda vacía con un único candidato.
+- Single oculto (hidden single): un dígito que solo puede ir en una celda de una
+  fila, columna o caja.
+
+Ambas reglas solo colocan valores que toda solución del tablero comparte, por lo
+que aplicarlas antes de la búsqueda no cambia el conjunto de soluciones.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from .grid_index import (
+    ALL_DIGITS_MASK, BOX_OF, CELL_COL, CELL_ROW, NUM_CELLS, SIZE, UNITS, unit_masks
+)
+
+
+def has_conflicts(board: List[List[int]]) -> bool:
+    """Indica si algún dígito se repite en una fila, columna o caja"""
+    for unit in UNITS:
+        seen = 0
+        for cell in unit:
+            num = board[CELL_ROW[cell]][CELL_COL[cell]]
+            if num:
+                bit = 1 << (num - 1)
+                if seen & bit:
+                    return True
+                seen |= bit
+    return False
+
+
+def propagate(board: List[List[int]]) -> Dict:
+    """Aplica singles desnudos y ocultos in-place hasta que no haya cambios.
+
+    Retorna estadísticas con las celdas colocadas por cada regla, el número de
+    rondas, las celdas que siguen vacías y si se detectó una contradicción
+    (en cuyo caso el tablero no tiene solución y puede quedar a medio propagar).
+    """
+    stats = {
+        'naked_singles': 0,
+        'hidden_singles': 0,
+        'rounds': 0,
+        'remaining': 0,
+        'contradiction': False,
+    }
+
+    if has_conflicts(board):
+        stats['contradiction'] = True
+        stats['remaining'] = sum(row.count(0) for row in board)
+        return stats
+
+    rows, cols, boxes = unit_masks(board)
+    empty = {cell for cell in range(NUM_CELLS) if board[CELL_ROW[cell]][CELL_COL[cell]] == 0}
+
+    def candidates(cell: int) -> int:
+        return ~(rows[CELL_ROW[cell]] | cols[CELL_COL[cell]] | boxes[BOX_OF[cell]]) & ALL_DIGITS_MASK
+
+    def place(cell: int, bit: int, rule: str):
+        rows[CELL_ROW[cell]] |= bit
+        cols[CELL_COL[cell]] |= bit
+        boxes[BOX_OF[cell]] |= bit
+        board[CELL_ROW[cell]][CELL_COL[cell]] = bit.bit_length()
+        empty.discard(cell)
+        stats[rule] += 1
+
+    def unit_used(unit_id: int) -> int:
+        if unit_id < SIZE:
+            return rows[unit_id]
+        if unit_id < 2 * SIZE:
+            return cols[unit_id - SIZE]
+        return boxes[unit_id - 2 * SIZE]
+
+    while empty:
+        stats['rounds'] += 1
+        progress = False
+
+        # 1. Singles desnudos
+        for cell in sorted(empty):
+            mask = candidates(cell)
+            if mask == 0:
+                stats['contradiction'] = True
+                break
+            if mask & (mask - 1) == 0:
+                place(cell, mask, 'naked_singles')
+                progress = True
+
+        if stats['contradiction']:
+            break
+
+        # 2. Singles ocultos por fila, columna y caja
+        for unit_id, unit in enumerate(UNITS):
+            unit_cells = [cell for cell in unit if cell in empty]
+            if not unit_cells:
+                continue
+
+            # once: dígitos posibles en al menos una celda; twice: en al menos dos
+            once = twice = 0
+            for cell in unit_cells:
+                mask = candidates(cell)
+                twice |= once & mask
+                once |= mask
+
+            if (once | unit_used(unit_id)) != ALL_DIGITS_MASK:
+                # Algún dígito faltante no cabe en ninguna celda de la unidad
+                stats['contradiction'] = True
+                break
+
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                target = next((cell for cell in unit_cells if cell in empty and candidates(cell) & bit), None)
+                if target is None:
+                    stats['contradiction'] = True
+                    break
+                place(target, bit, 'hidden_singles')
+                progress = True
+
+            if stats['contradiction']:
+                break
+
+        if stats['contradiction'] or not progress:
+            break
+
+    stats['remaining'] = len(empty)
+    return stats
+
+
+def find_single(board: List[List[int]]) -> Optional[Tuple[int, int, int, str]]:
+    """Busca la próxima celda deducible sin modificar el tablero.
+
+    Retorna (fila, columna, valor, regla) priorizando los singles desnudos en
+    orden fila-mayor y luego los singles ocultos, o None si no hay ninguno.
+    """
+    rows, cols, boxes = unit_masks(board)
+    masks = {}
+    for cell in range(NUM_CELLS):
+        if board[CELL_ROW[cell]][CELL_COL[cell]] == 0:
+            masks[cell] = ~(rows[CELL_ROW[cell]] | cols[CELL_COL[cell]] | boxes[BOX_OF[cell]]) & ALL_DIGITS_MASK
+
+    for cell, mask in masks.items():
+        if mask and mask & (mask - 1) == 0:
+            return CELL_ROW[cell], CELL_COL[cell], mask.bit_length(), 'naked_single'
+
+    for unit in UNITS:
+        once = twice = 0
+        for cell in unit:
+            mask = masks.get(cell, 0)
+            twice |= once & mask
+            once |= mask
+        hidden = once & ~twice
+        if hidden:
+            bit = hidden & -hidden
+            for cell in unit:
+                if masks.get(cell, 0) & bit:
+                    return CELL_ROW[cell], CELL_COL[cell], bit.bit_length(), 'hidden_single'
+
+    return None
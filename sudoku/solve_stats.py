@@ -0,0 +1,97 @@
+"""
+Estadísticas y presupuestos de una resolución
+
+SolveStats acumula el esfuerzo de un motor (nodos expandidos, retrocesos,
+profundidad máxima, celdas colocadas por propagación y tiempo) y aplica los
+presupuestos opcionales de nodos y de tiempo. Cuando un presupuesto se agota el
+motor recibe BudgetExceeded y la resolución termina con estado BUDGET_EXCEEDED.
+"""
+
+import sys
+import time
+from typing import Dict, Optional
+
+# Estados de una resolución
+RUNNING = 'running'
+SOLVED = 'solved'
+UNSOLVABLE = 'unsolvable'
+BUDGET_EXCEEDED = 'budget_exceeded'
+
+# Cada cuántos nodos se consulta el reloj cuando hay presupuesto de tiempo
+TIME_CHECK_INTERVAL = 256
+
+# Punto de control que nunca se alcanza (sin presupuesto)
+NO_CHECKPOINT = sys.maxsize
+
+
+class BudgetExceeded(Exception):
+    """Se agotó el presupuesto de nodos o de tiempo de la resolución"""
+
+
+class SolveStats:
+    """Esfuerzo y resultado de una resolución"""
+
+    def __init__(self, solver: str, max_nodes: Optional[int] = None, max_time: Optional[float] = None):
+        self.solver = solver
+        self.status = RUNNING
+        self.nodes: Optional[int] = 0  # None si el motor no cuenta nodos
+        self.backtracks = 0
+        self.max_depth = 0
+        self.propagated = 0  # Celdas colocadas por el pre-paso de propagación
+        self.propagation: Optional[Dict] = None  # Estadísticas completas de propagate()
+        self.elapsed = 0.0
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + max_time if max_time is not None else None
+
+    @property
+    def solved(self) -> bool:
+        return self.status == SOLVED
+
+    @property
+    def has_budget(self) -> bool:
+        return self.max_nodes is not None or self.deadline is not None
+
+    def next_checkpoint(self, nodes: int) -> int:
+        """Número de nodos a partir del cual el motor debe volver a llamar a check()"""
+        checkpoint = NO_CHECKPOINT
+        if self.max_nodes is not None:
+            checkpoint = self.max_nodes
+        if self.deadline is not None:
+            checkpoint = min(checkpoint, nodes + TIME_CHECK_INTERVAL)
+        return checkpoint
+
+    def check(self, nodes: int) -> int:
+        """Registra los nodos expandidos y lanza BudgetExceeded si se agotó algún presupuesto.
+
+        Retorna el siguiente punto de control (ver next_checkpoint).
+        """
+        self.nodes = nodes
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            raise BudgetExceeded(f"Se superó el presupuesto de {self.max_nodes} nodos")
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise BudgetExceeded(f"Se superó el presupuesto de {self.max_time} segundos")
+        return self.next_checkpoint(nodes)
+
+    def finish(self, status: str):
+        """Fija el estado final y el tiempo transcurrido"""
+        self.status = status
+        self.elapsed = time.perf_counter() - self.start_time
+
+    def as_dict(self) -> Dict:
+        """Representación como diccionario (para registros y resultados en lote)"""
+        return {
+            'solver': self.solver,
+            'status': self.status,
+            'nodes': self.nodes,
+            'backtracks': self.backtracks,
+            'max_depth': self.max_depth,
+            'propagated': self.propagated,
+            'elapsed': self.elapsed,
+        }
+
+    def __repr__(self) -> str:
+        return (f"SolveStats(solver={self.solver!r}, status={self.status!r}, nodes={self.nodes}, "
+                f"backtracks={self.backtracks}, max_depth={self.max_depth}, "
+                f"propagated={self.propagated}, elapsed={self.elapsed:.6f})")
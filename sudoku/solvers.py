@@ -0,0 +1,295 @@
+"""
+Motores de resolución de Sudoku y registro de motores por nombre
+
+Cada motor recibe un tablero 9x9 y, opcionalmente, un SolveStats donde anotar
+su esfuerzo y cuyos presupuestos debe respetar (lanzando BudgetExceeded). Lo
+resuelve in-place y retorna una tupla (resuelto, nodos visitados). Si no hay
+solución el tablero queda como estaba. solve() es el punto de entrada que
+combina propagación, motor y presupuestos y retorna un SolveStats.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from .dlx import DancingLinks
+from .grid_index import ALL_DIGITS_MASK, BOX_OF, CELL_COL, CELL_ROW, NUM_CELLS, SIZE, unit_masks
+from .propagation import has_conflicts, propagate
+from .solve_stats import (
+    BUDGET_EXCEEDED, NO_CHECKPOINT, SOLVED, UNSOLVABLE, BudgetExceeded, SolveStats
+)
+from .step_solver import solve_step
+
+SolverFunction = Callable[..., Tuple[bool, Optional[int]]]
+
+
+def solve_bitmask(board: List[List[int]], stats: Optional[SolveStats] = None) -> Tuple[bool, int]:
+    """Backtracking con máscaras de 9 bits por fila, columna y caja.
+
+    El bit (num - 1) de cada máscara indica que el número ya está usado en esa
+    unidad, por lo que los candidatos de una celda son ~(fila | columna | caja) & 0x1FF.
+    Colocar y deshacer un número son operaciones O(1) y las celdas vacías se
+    recorren en el mismo orden que el backtracking clásico, de modo que ambos
+    modos encuentran la misma solución.
+    """
+    rows, cols, boxes = unit_masks(board)
+    empty_cells = [(CELL_ROW[cell], CELL_COL[cell], BOX_OF[cell]) for cell in range(NUM_CELLS)
+                   if board[CELL_ROW[cell]][CELL_COL[cell]] == 0]
+    total = len(empty_cells)
+    nodes = backtracks = max_depth = 0
+    checkpoint = stats.next_checkpoint(0) if stats is not None else NO_CHECKPOINT
+
+    def place(index: int) -> bool:
+        nonlocal nodes, backtracks, max_depth, checkpoint
+        nodes += 1
+        if nodes > checkpoint:
+            checkpoint = stats.check(nodes)
+        if index > max_depth:
+            max_depth = index
+        if index == total:
+            return True
+
+        i, j, box = empty_cells[index]
+        candidates = ~(rows[i] | cols[j] | boxes[box]) & ALL_DIGITS_MASK
+
+        while candidates:
+            # Probar candidatos en orden creciente (bit menos significativo primero)
+            bit = candidates & -candidates
+            candidates ^= bit
+
+            rows[i] |= bit
+            cols[j] |= bit
+            boxes[box] |= bit
+
+            if place(index + 1):
+                board[i][j] = bit.bit_length()
+                return True
+
+            rows[i] ^= bit
+            cols[j] ^= bit
+            boxes[box] ^= bit
+            backtracks += 1
+
+        return False
+
+    try:
+        return place(0), nodes
+    finally:
+        if stats is not None:
+            stats.nodes, stats.backtracks, stats.max_depth = nodes, backtracks, max_depth
+
+
+def _search_mrv(board: List[List[int]], limit: int, stats: Optional[SolveStats] = None) -> Tuple[int, int]:
+    """Búsqueda MRV in-place que se detiene al encontrar limit soluciones.
+
+    En cada nodo se elige la celda vacía con menos candidatos (heurística MRV,
+    "minimum remaining values"). Si alguna celda se queda sin candidatos el nodo
+    falla de inmediato, y las celdas con un único candidato se asignan sin
+    ramificar. Retorna (soluciones encontradas, nodos visitados). Si se alcanza
+    el límite el tablero queda con la última solución encontrada; si no, queda
+    como estaba (salvo si se agota el presupuesto de stats).
+    """
+    rows, cols, boxes = unit_masks(board)
+    empty_cells = [cell for cell in range(NUM_CELLS) if board[CELL_ROW[cell]][CELL_COL[cell]] == 0]
+    total = len(empty_cells)
+    nodes = found = backtracks = max_depth = 0
+    checkpoint = stats.next_checkpoint(0) if stats is not None else NO_CHECKPOINT
+
+    def place(cell: int, bit: int):
+        nonlocal max_depth
+        # La profundidad es el número de celdas asignadas por la búsqueda
+        if total - len(empty_cells) > max_depth:
+            max_depth = total - len(empty_cells)
+        rows[CELL_ROW[cell]] |= bit
+        cols[CELL_COL[cell]] |= bit
+        boxes[BOX_OF[cell]] |= bit
+        board[CELL_ROW[cell]][CELL_COL[cell]] = bit.bit_length()
+
+    def unplace(cell: int, bit: int):
+        rows[CELL_ROW[cell]] ^= bit
+        cols[CELL_COL[cell]] ^= bit
+        boxes[BOX_OF[cell]] ^= bit
+        board[CELL_ROW[cell]][CELL_COL[cell]] = 0
+
+    def search() -> bool:
+        """Retorna True cuando se alcanzó el límite de soluciones"""
+        nonlocal nodes, found, backtracks, checkpoint
+        nodes += 1
+        if nodes > checkpoint:
+            checkpoint = stats.check(nodes)
+        forced = []
+
+        while True:
+            if not empty_cells:
+                found += 1
+                if found >= limit:
+                    return True
+                break
+
+            # Buscar la celda vacía con menos candidatos
+            best_pos = -1
+            best_mask = 0
+            best_count = 10
+            for pos, cell in enumerate(empty_cells):
+                mask = ~(rows[CELL_ROW[cell]] | cols[CELL_COL[cell]] | boxes[BOX_OF[cell]]) & ALL_DIGITS_MASK
+                count = mask.bit_count()
+                if count < best_count:
+                    best_pos, best_mask, best_count = pos, mask, count
+                    if count <= 1:
+                        break
+
+            if best_count == 0:
+                # Contradicción
+                break
+
+            cell = empty_cells[best_pos]
+            empty_cells[best_pos] = empty_cells[-1]
+            empty_cells.pop()
+
+            if best_count == 1:
+                # Celda forzada: asignar sin ramificar
+                place(cell, best_mask)
+                forced.append((cell, best_mask))
+                continue
+
+            # Ramificar sobre los candidatos de la celda más restringida
+            while best_mask:
+                bit = best_mask & -best_mask
+                best_mask ^= bit
+                place(cell, bit)
+                if search():
+                    return True
+                unplace(cell, bit)
+                backtracks += 1
+
+            empty_cells.append(cell)
+            break
+
+        # Deshacer las asignaciones forzadas de este nodo
+        for forced_cell, bit in reversed(forced):
+            unplace(forced_cell, bit)
+            empty_cells.append(forced_cell)
+        return False
+
+    try:
+        search()
+    finally:
+        if stats is not None:
+            stats.nodes, stats.backtracks, stats.max_depth = nodes, backtracks, max_depth
+    return found, nodes
+
+
+def solve_mrv(board: List[List[int]], stats: Optional[SolveStats] = None) -> Tuple[bool, int]:
+    """Resuelve el tablero in-place ramificando siempre en la celda más restringida"""
+    found, nodes = _search_mrv(board, 1, stats)
+    return found == 1, nodes
+
+
+def count_solutions(board: List[List[int]], limit: int = 2) -> int:
+    """Cuenta las soluciones del tablero deteniéndose en cuanto encuentra limit.
+
+    Con el límite por defecto (2) basta para saber si la solución es única:
+    el resultado es 0 (sin solución), 1 (única) o 2 (varias). El tablero no se
+    modifica; la búsqueda parte de la propagación de singles y continúa con MRV.
+    """
+    work_board = [row[:] for row in board]
+    if propagate(work_board)['contradiction']:
+        return 0
+    found, _ = _search_mrv(work_board, limit)
+    return found
+
+
+def has_unique_solution(board: List[List[int]]) -> bool:
+    """Indica si el tablero tiene exactamente una solución"""
+    return count_solutions(board, limit=2) == 1
+
+
+def solve_dlx(board: List[List[int]], stats: Optional[SolveStats] = None) -> Tuple[bool, int]:
+    """Resuelve el tablero como cobertura exacta con Dancing Links"""
+    dlx = DancingLinks(board, stats)
+    try:
+        solution = dlx.solve()
+    finally:
+        if stats is not None:
+            stats.nodes, stats.backtracks, stats.max_depth = dlx.nodes_visited, dlx.backtracks, dlx.max_depth
+    if solution is None:
+        return False, dlx.nodes_visited
+
+    for r in range(SIZE):
+        board[r][:] = solution[r]
+    return True, dlx.nodes_visited
+
+
+def solve_coloring(board: List[List[int]], stats: Optional[SolveStats] = None) -> Tuple[bool, int]:
+    """Resuelve el tablero con el backtracking clásico por coloración de vecinos"""
+    from .board import SudokuBoard
+
+    if has_conflicts(board):
+        return False, 0
+    stats = stats if stats is not None else SolveStats('coloring')
+    return SudokuBoard()._solve_backtracking_coloring(board, stats), stats.nodes
+
+
+SOLVERS: Dict[str, SolverFunction] = {
+    'bitmask': solve_bitmask,
+    'mrv': solve_mrv,
+    'dlx': solve_dlx,
+    'coloring': solve_coloring,
+    'step': solve_step,
+}
+
+
+def register_solver(name: str, solver: SolverFunction):
+    """Registra (o reemplaza) un motor de resolución bajo el nombre indicado.
+
+    El motor debe aceptar (tablero, stats=None) y retornar (resuelto, nodos).
+    """
+    SOLVERS[name] = solver
+
+
+def get_solver(name: str) -> SolverFunction:
+    """Obtiene un motor de resolución por nombre"""
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Motor de resolución desconocido: {name!r} (disponibles: {', '.join(sorted(SOLVERS))})") from None
+
+
+def solve(board: List[List[int]], solver: str = 'mrv', max_nodes: Optional[int] = None,
+          max_time: Optional[float] = None, use_propagation: bool = True) -> SolveStats:
+    """Resuelve el tablero con el motor indicado y retorna sus estadísticas.
+
+    Aplica el pre-paso de propagación (si use_propagation) y luego el motor sobre
+    una copia; el tablero solo se modifica si se encuentra solución. max_nodes y
+    max_time (segundos, incluida la propagación) son presupuestos opcionales: al
+    agotarse la resolución termina con estado BUDGET_EXCEEDED.
+    """
+    engine = get_solver(solver)
+    stats = SolveStats(solver, max_nodes=max_nodes, max_time=max_time)
+    work_board = [row[:] for row in board]
+
+    if use_propagation:
+        stats.propagation = propagate(work_board)
+        stats.propagated = stats.propagation['naked_singles'] + stats.propagation['hidden_singles']
+        if stats.propagation['contradiction']:
+            stats.finish(UNSOLVABLE)
+            return stats
+
+    try:
+        solved, stats.nodes = engine(work_board, stats)
+    except BudgetExceeded:
+        stats.finish(BUDGET_EXCEEDED)
+        return stats
+
+    if solved:
+        for r in range(SIZE):
+            board[r][:] = work_board[r]
+    stats.finish(SOLVED if solved else UNSOLVABLE)
+    return stats
+
+
+def count_solutions_dlx(board: List[List[int]], limit: Optional[int] = None) -> int:
+    """Cuenta soluciones con Dancing Links deteniéndose al llegar a limit"""
+    return DancingLinks(board).count(limit)
+
+
+def iter_solutions_dlx(board: List[List[int]]):
+    """Enumera perezosamente todas las soluciones con Dancing Links"""
+    return DancingLinks(board).iter_solutions()
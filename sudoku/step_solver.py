@@ -0,0 +1,146 @@
+"""
+Resolución iterativa y reanudable de Sudoku
+
+StepSolver recorre el mismo árbol de búsqueda que el motor MRV, pero con una pila
+explícita en lugar de recursión: cada llamada a step() avanza un número acotado de
+pasos y devuelve el control. Así la interfaz puede resolver dentro de un
+presupuesto de tiempo por cuadro y dibujar la búsqueda mientras ocurre, y la
+profundidad no depende del límite de recursión de Python.
+"""
+
+import time
+from typing import List, Optional, Tuple
+from .grid_index import ALL_DIGITS_MASK, BOX_OF, CELL_COL, CELL_ROW, NUM_CELLS, unit_masks
+from .solve_stats import RUNNING, SOLVED, UNSOLVABLE, SolveStats
+
+
+class StepSolver:
+    """Backtracking MRV con pila explícita que modifica el tablero in-place"""
+
+    def __init__(self, board: List[List[int]]):
+        self.board = board
+        self.rows, self.cols, self.boxes = unit_masks(board)
+        self.empty_cells = [cell for cell in range(NUM_CELLS) if board[CELL_ROW[cell]][CELL_COL[cell]] == 0]
+        # Cada marco de la pila: [celda, candidatos pendientes, bit colocado]
+        self.stack: List[List[int]] = []
+        self.steps = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.status = RUNNING
+        self.last_change: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def finished(self) -> bool:
+        """Indica si la búsqueda terminó (con o sin solución)"""
+        return self.status != RUNNING
+
+    def _place(self, cell: int, bit: int):
+        self.rows[CELL_ROW[cell]] |= bit
+        self.cols[CELL_COL[cell]] |= bit
+        self.boxes[BOX_OF[cell]] |= bit
+        self.board[CELL_ROW[cell]][CELL_COL[cell]] = bit.bit_length()
+        self.last_change = (CELL_ROW[cell], CELL_COL[cell], bit.bit_length())
+
+    def _unplace(self, cell: int, bit: int):
+        self.rows[CELL_ROW[cell]] ^= bit
+        self.cols[CELL_COL[cell]] ^= bit
+        self.boxes[BOX_OF[cell]] ^= bit
+        self.board[CELL_ROW[cell]][CELL_COL[cell]] = 0
+        self.last_change = (CELL_ROW[cell], CELL_COL[cell], 0)
+
+    def _backtrack(self):
+        """Deshace decisiones hasta encontrar un candidato alternativo pendiente"""
+        self.backtracks += 1
+        stack = self.stack
+        while stack:
+            frame = stack[-1]
+            cell, remaining, bit = frame
+            self._unplace(cell, bit)
+            if remaining:
+                bit = remaining & -remaining
+                frame[1] = remaining ^ bit
+                frame[2] = bit
+                self._place(cell, bit)
+                return
+            stack.pop()
+            self.empty_cells.append(cell)
+        self.status = UNSOLVABLE
+
+    def _advance(self):
+        """Un paso: asignar la celda más restringida o retroceder ante una contradicción"""
+        self.steps += 1
+        empty_cells = self.empty_cells
+        if not empty_cells:
+            self.status = SOLVED
+            return
+
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        best_pos = -1
+        best_mask = 0
+        best_count = 10
+        for pos, cell in enumerate(empty_cells):
+            mask = ~(rows[CELL_ROW[cell]] | cols[CELL_COL[cell]] | boxes[BOX_OF[cell]]) & ALL_DIGITS_MASK
+            count = mask.bit_count()
+            if count < best_count:
+                best_pos, best_mask, best_count = pos, mask, count
+                if count <= 1:
+                    break
+
+        if best_count == 0:
+            self._backtrack()
+            return
+
+        cell = empty_cells[best_pos]
+        empty_cells[best_pos] = empty_cells[-1]
+        empty_cells.pop()
+
+        bit = best_mask & -best_mask
+        self.stack.append([cell, best_mask ^ bit, bit])
+        self._place(cell, bit)
+        if len(self.stack) > self.max_depth:
+            self.max_depth = len(self.stack)
+
+        if not empty_cells:
+            self.status = SOLVED
+
+    def step(self, max_steps: int = 1) -> bool:
+        """Avanza hasta max_steps pasos; retorna True si la búsqueda terminó"""
+        for _ in range(max_steps):
+            if self.status != RUNNING:
+                break
+            self._advance()
+        return self.finished
+
+    def run_for(self, seconds: float, check_every: int = 32) -> bool:
+        """Avanza durante un presupuesto de tiempo; retorna True si la búsqueda terminó"""
+        deadline = time.perf_counter() + seconds
+        while not self.step(check_every):
+            if time.perf_counter() >= deadline:
+                break
+        return self.finished
+
+    def run(self) -> bool:
+        """Avanza hasta terminar; retorna True si encontró solución"""
+        while not self.step(1024):
+            pass
+        return self.status == SOLVED
+
+
+def solve_step(board: List[List[int]], stats: Optional[SolveStats] = None) -> Tuple[bool, int]:
+    """Resuelve el tablero con StepSolver hasta terminar.
+
+    Si se agota el presupuesto de stats el tablero queda con la asignación parcial.
+    """
+    solver = StepSolver(board)
+    if stats is None:
+        solved = solver.run()
+        return solved, solver.steps
+
+    try:
+        checkpoint = stats.next_checkpoint(0)
+        while not solver.step(min(1024, max(1, checkpoint - solver.steps + 1))):
+            if solver.steps > checkpoint:
+                checkpoint = stats.check(solver.steps)
+    finally:
+        stats.nodes, stats.backtracks, stats.max_depth = solver.steps, solver.backtracks, solver.max_depth
+    return solver.status == SOLVED, solver.steps
@@ -0,0 +1,64 @@
+"""
+Generación perezosa de puzzles en flujo continuo
+
+iter_puzzles entrega entradas (el mismo formato que PuzzlePool y PuzzleBank:
+'puzzle', 'solution', 'difficulty' y 'metrics') una a una y sin fin, de modo que
+se pueden producir corpus de cualquier tamaño sin guardarlos en memoria. La
+generación puede repartirse en un pool de procesos; solo se mantiene una
+ventana acotada de puzzles en curso.
+"""
+
+import os
+import random
+from collections import deque
+from multiprocessing import Pool
+from typing import Dict, Iterator, Optional, Tuple
+from .pool import generate_entry
+
+# Puzzles encargados por proceso antes de esperar el primero
+PREFETCH_PER_JOB = 4
+
+
+def _generate_task(task: Tuple) -> Dict:
+    """Función de trabajo para el pool de procesos de iter_puzzles"""
+    difficulty, seed, require_unique, grid_generation, removal_strategy = task
+    return generate_entry(difficulty, require_unique, grid_generation, seed=seed,
+                          removal_strategy=removal_strategy)
+
+
+def iter_puzzles(difficulty: str = 'facil', seed: Optional[int] = None, jobs: Optional[int] = 1,
+                 require_unique: bool = False, grid_generation: str = 'backtracking',
+                 removal_strategy: str = 'distribution') -> Iterator[Dict]:
+    """Genera puzzles de la dificultad indicada de forma perezosa e indefinida.
+
+    Con seed cada puzzle recibe su propia semilla derivada, así que la secuencia
+    es reproducible e independiente de jobs. jobs es el número de procesos (None
+    usa todos los núcleos); los puzzles salen en orden y nunca hay más de
+    jobs * PREFETCH_PER_JOB en curso.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    rng = random.Random(seed) if seed is not None else None
+
+    def tasks() -> Iterator[Tuple]:
+        while True:
+            # Sin semilla, los procesos heredarían el mismo estado del generador global
+            if rng is not None:
+                puzzle_seed = rng.getrandbits(64)
+            elif jobs != 1:
+                puzzle_seed = random.getrandbits(64)
+            else:
+                puzzle_seed = None
+            yield difficulty, puzzle_seed, require_unique, grid_generation, removal_strategy
+
+    if jobs == 1:
+        for task in tasks():
+            yield _generate_task(task)
+        return
+
+    # Pool.imap consumiría la secuencia infinita de tareas; se encargan por ventanas
+    pending = deque()
+    with Pool(jobs) as pool:
+        for task in tasks():
+            pending.append(pool.apply_async(_generate_task, (task,)))
+            if len(pending) >= jobs * PREFETCH_PER_JOB:
+                yield pending.popleft().get()
@@ -0,0 +1,249 @@
+"""
+Puzzles con patrones de pistas simétricos
+
+Un patrón es una máscara de 81 bits (bit r * 9 + c = la celda tiene pista) que
+es invariante bajo una simetría del tablero:
+- 'rotation': giro de 180° alrededor del centro,
+- 'mirror': reflejo respecto de la columna central,
+- 'diagonal': reflejo respecto de la diagonal principal,
+- 'double_mirror': reflejo respecto de la fila y de la columna centrales.
+Cada simetría reparte las celdas en órbitas (celdas que se transforman entre
+sí); una máscara simétrica es una unión de órbitas.
+
+MASK_LIBRARY guarda patrones de LIBRARY_CLUES pistas ya seleccionados (ver
+curate_masks) con una tasa alta de solución única sobre tableros al azar. La
+comprobación rápida de una máscara sobre una solución descarta primero, solo
+con operaciones de bits, las máscaras que dejan vacío algún conjunto inevitable
+de la solución (dos dígitos completos o un rectángulo intercambiable) y solo
+entonces busca una segunda solución. El puzzle siempre es resoluble porque sus
+pistas salen de la solución.
+"""
+
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+from .grid_index import BOX_OF, BOX_SIZE, CELL_COL, CELL_ROW, NUM_CELLS, SIZE, cell_index
+from .solvers import has_unique_solution
+
+SYMMETRIES = ('rotation', 'mirror', 'diagonal', 'double_mirror')
+
+# Pistas de los patrones de la biblioteca (INITIAL_CELLS de constants.py)
+LIBRARY_CLUES = 30
+
+# Intentos para construir una máscara al azar balanceada
+RANDOM_MASK_ATTEMPTS = 1000
+
+# Máscaras que symmetric_puzzle prueba por defecto antes de desistir
+SYMMETRIC_MASK_ATTEMPTS = 200
+
+
+def _images(cell: int, symmetry: str) -> Tuple[int, ...]:
+    """Celdas a las que la simetría lleva la celda (incluida ella misma)"""
+    row, col = CELL_ROW[cell], CELL_COL[cell]
+    last = SIZE - 1
+    if symmetry == 'rotation':
+        cells = [(row, col), (last - row, last - col)]
+    elif symmetry == 'mirror':
+        cells = [(row, col), (row, last - col)]
+    elif symmetry == 'diagonal':
+        cells = [(row, col), (col, row)]
+    else:  # 'double_mirror'
+        cells = [(row, col), (row, last - col), (last - row, col), (last - row, last - col)]
+    return tuple(cell_index(r, c) for r, c in cells)
+
+
+def _build_orbits() -> Dict[str, Tuple[int, ...]]:
+    """Órbitas de cada simetría como máscaras de bits"""
+    orbits = {}
+    for symmetry in SYMMETRIES:
+        masks = set()
+        for cell in range(NUM_CELLS):
+            masks.add(sum(1 << image for image in set(_images(cell, symmetry))))
+        orbits[symmetry] = tuple(sorted(masks))
+    return orbits
+
+
+ORBITS = _build_orbits()
+
+
+def _orbits(symmetry: str) -> Tuple[int, ...]:
+    if symmetry not in ORBITS:
+        raise ValueError(f"Simetría desconocida: {symmetry!r} (disponibles: {', '.join(SYMMETRIES)})")
+    return ORBITS[symmetry]
+
+
+def is_symmetric(mask: int, symmetry: str) -> bool:
+    """Indica si la máscara es una unión de órbitas de la simetría"""
+    return all(mask & orbit in (0, orbit) for orbit in _orbits(symmetry))
+
+
+def is_balanced(mask: int) -> bool:
+    """Toda fila y columna tiene alguna pista y toda caja al menos dos"""
+    rows, cols, boxes = [0] * SIZE, [0] * SIZE, [0] * SIZE
+    for cell in range(NUM_CELLS):
+        if mask >> cell & 1:
+            rows[CELL_ROW[cell]] += 1
+            cols[CELL_COL[cell]] += 1
+            boxes[BOX_OF[cell]] += 1
+    return min(rows) >= 1 and min(cols) >= 1 and min(boxes) >= 2
+
+
+def random_symmetric_mask(symmetry: str, clues: int = LIBRARY_CLUES,
+                          rng: Optional[random.Random] = None) -> int:
+    """Máscara simétrica y balanceada con exactamente clues pistas, elegida al azar"""
+    rng = rng or random
+    orbits = list(_orbits(symmetry))
+    for _ in range(RANDOM_MASK_ATTEMPTS):
+        rng.shuffle(orbits)
+        mask = count = 0
+        for orbit in orbits:
+            size = orbit.bit_count()
+            if count + size <= clues:
+                mask |= orbit
+                count += size
+        if count == clues and is_balanced(mask):
+            return mask
+    raise ValueError(f"No hay máscaras balanceadas con simetría {symmetry!r} y {clues} pistas")
+
+
+def apply_mask(solution: Sequence[Sequence[int]], mask: int) -> List[List[int]]:
+    """Puzzle con las pistas de la máscara tomadas de la solución"""
+    return [[solution[r][c] if mask >> cell_index(r, c) & 1 else 0 for c in range(SIZE)] for r in range(SIZE)]
+
+
+def unavoidable_sets(solution: Sequence[Sequence[int]]) -> List[int]:
+    """Conjuntos inevitables pequeños de la solución, como máscaras de bits.
+
+    Un puzzle sin ninguna pista dentro de uno de ellos tiene otra solución:
+    - las 18 celdas de dos dígitos (se pueden intercambiar en todo el tablero),
+    - rectángulos a b / b a que ocupan exactamente dos cajas.
+    """
+    sets = []
+    digit_cells = [0] * (SIZE + 1)
+    for cell in range(NUM_CELLS):
+        digit_cells[solution[CELL_ROW[cell]][CELL_COL[cell]]] |= 1 << cell
+    for a in range(1, SIZE + 1):
+        for b in range(a + 1, SIZE + 1):
+            sets.append(digit_cells[a] | digit_cells[b])
+
+    for r1 in range(SIZE):
+        for r2 in range(r1 + 1, SIZE):
+            same_band = r1 // BOX_SIZE == r2 // BOX_SIZE
+            for c1 in range(SIZE):
+                for c2 in range(c1 + 1, SIZE):
+                    # Dos cajas: filas en la misma banda o columnas en la misma pila (no ambas)
+                    if same_band == (c1 // BOX_SIZE == c2 // BOX_SIZE):
+                        continue
+                    if solution[r1][c1] == solution[r2][c2] and solution[r1][c2] == solution[r2][c1]:
+                        sets.append((1 << cell_index(r1, c1)) | (1 << cell_index(r1, c2)) |
+                                    (1 << cell_index(r2, c1)) | (1 << cell_index(r2, c2)))
+    return sets
+
+
+def has_unique_mask(solution: Sequence[Sequence[int]], mask: int,
+                    unavoidable: Optional[Sequence[int]] = None) -> bool:
+    """Indica si las pistas de la máscara determinan la solución de forma única.
+
+    unavoidable permite reutilizar unavoidable_sets(solution) entre máscaras.
+    """
+    if unavoidable is None:
+        unavoidable = unavoidable_sets(solution)
+    if not all(mask & cells for cells in unavoidable):
+        return False
+    return has_unique_solution(apply_mask(solution, mask))
+
+
+def curate_masks(symmetry: str, clues: int = LIBRARY_CLUES, count: int = 16, seed: int = 0,
+                 sample_grids: int = 60, iterations: int = 150) -> Tuple[int, ...]:
+    """Selecciona máscaras con alta tasa de solución única (así se construyó MASK_LIBRARY).
+
+    Cada máscara parte de una al azar y se mejora intercambiando órbitas del
+    mismo tamaño mientras no baje la fracción de sample_grids tableros al azar
+    en los que el puzzle resultante tiene solución única.
+    """
+    from .transforms import random_grid
+
+    rng = random.Random(seed)
+    grids = [random_grid(rng) for _ in range(sample_grids)]
+    grid_sets = [unavoidable_sets(grid) for grid in grids]
+
+    def unique_rate(mask: int) -> int:
+        return sum(has_unique_mask(grid, mask, sets) for grid, sets in zip(grids, grid_sets))
+
+    masks = []
+    for _ in range(count):
+        mask = random_symmetric_mask(symmetry, clues, rng)
+        rate = unique_rate(mask)
+        for _ in range(iterations):
+            inside = [orbit for orbit in _orbits(symmetry) if mask & orbit]
+            outside = [orbit for orbit in _orbits(symmetry) if not mask & orbit]
+            removed, added = rng.choice(inside), rng.choice(outside)
+            if removed.bit_count() != added.bit_count():
+                continue
+            candidate = mask ^ removed ^ added
+            if not is_balanced(candidate):
+                continue
+            candidate_rate = unique_rate(candidate)
+            if candidate_rate >= rate:
+                mask, rate = candidate, candidate_rate
+        masks.append(mask)
+    return tuple(masks)
+
+
+# Patrones de LIBRARY_CLUES pistas por simetría, generados con curate_masks(simetría)
+MASK_LIBRARY: Dict[str, Tuple[int, ...]] = {
+    'rotation': (
+        0x109913c1c844270791321, 0x9470c8a24c648a261c52, 0x11605ad044c64416b40d1, 0x113464544d0164544c591,
+        0x1232c98a628ca3269890, 0x240d526a682cac956048, 0xda624304a82a41848cb6, 0x18449ab03183181ab2443,
+        0xd405ca865014c2a74056, 0x1615a429822883284b50d, 0xb4808ac4d45646a2025a, 0xb155411a5014b105551a,
+        0xac48919d10117312246a, 0x4538a2939013928a3944, 0x74c10243d2978481065c, 0xa5851ca288228a71434a,
+    ),
+    'mirror': (
+        0x38a2a4a22c6141b30654, 0x54141b0897d80aaa0329, 0x19388ca52529082498c38, 0x111551b1052988950d892,
+        0x129c9a498c38081132654, 0x3888e0c50106b31a8b29, 0xaa2a446526c080a28ad6, 0x44416ae22aa1c1b10545,
+        0x1393e040896d888a12492, 0x101144e70711aa9115492, 0x822a0e3079355110f901, 0x82888e0d97d360e20301,
+        0x111222a8a892a2db58c10, 0xd6495162238494445145, 0xc62a55554282a0a35610, 0x6c5d150a892809525292,
+    ),
+    'diagonal': (
+        0x12044972246c68950468b, 0x1e190c2b28292a0b08591, 0x4c31e5122688b52114a1, 0x8ac19504c45849c3429a,
+        0x11534209632644c54a12c, 0x5216435171070b124469, 0x15240438451c2d946d00d, 0x6654c43404c4b4661485,
+        0x19887180e92ac82952405, 0x6c4545a4640c6531c421, 0x2c28a2628b8aa4a80ac3, 0xb68a90e2a48194611ac,
+        0x1224c1160294471661666, 0xe1d0c532471049104599, 0x413963148892a9a90919, 0x16150c43104a1a82c2b8e,
+    ),
+    'double_mirror': (
+        0x6c2a20851ef14208a86c, 0x101551515545551515501, 0x384144672c69cc450438, 0x1392220b2628c9a088939,
+        0x129084a525c7494a42129, 0x1013624b066cc1a48d901, 0x44494a4f9013e4a52444, 0x9249043566cd58412492,
+        0x823651471831c514d882, 0x5449208d9ab362092454, 0xba220a3066cc18a088ba, 0x13936112228288910d939,
+        0x11114359056d413585111, 0x44c19b124aa491b30644, 0x922264c51ab1464c8892, 0x1832a0a32628c98a0a983,
+    ),
+}
+
+
+def symmetric_masks(symmetry: str, clues: int = LIBRARY_CLUES) -> Tuple[int, ...]:
+    """Patrones de la biblioteca para la simetría (vacío si no hay para ese número de pistas)"""
+    _orbits(symmetry)
+    if clues != LIBRARY_CLUES:
+        return ()
+    return MASK_LIBRARY.get(symmetry, ())
+
+
+def symmetric_puzzle(solution: Sequence[Sequence[int]], symmetry: Optional[str] = None,
+                     clues: int = LIBRARY_CLUES, max_masks: int = SYMMETRIC_MASK_ATTEMPTS,
+                     rng: Optional[random.Random] = None) -> Tuple[List[List[int]], bool]:
+    """Puzzle simétrico de solución única con clues pistas; retorna (puzzle, es_único).
+
+    Prueba los patrones de la biblioteca en orden aleatorio y luego máscaras al
+    azar, hasta max_masks en total. symmetry=None elige una simetría al azar. Si
+    ninguna máscara da solución única retorna la última probada.
+    """
+    rng = rng or random
+    symmetry = symmetry or rng.choice(SYMMETRIES)
+    unavoidable = unavoidable_sets(solution)
+    library = list(symmetric_masks(symmetry, clues))
+    rng.shuffle(library)
+
+    mask = None
+    for attempt in range(max_masks):
+        mask = library[attempt] if attempt < len(library) else random_symmetric_mask(symmetry, clues, rng)
+        if has_unique_mask(solution, mask, unavoidable):
+            return apply_mask(solution, mask), True
+    return apply_mask(solution, mask), False
@@ -0,0 +1,85 @@
+"""
+Generación de tableros completos por transformaciones de simetría
+
+Toda transformación del grupo de simetría del Sudoku convierte una solución
+válida en otra solución válida:
+- reetiquetar los dígitos (permutación de 1..9),
+- permutar filas dentro de una banda y permutar las bandas,
+- permutar columnas dentro de una pila y permutar las pilas,
+- transponer el tablero.
+
+Partiendo de una pequeña biblioteca de tableros base, cada tablero nuevo se
+obtiene componiendo transformaciones aleatorias en una sola pasada, sin búsqueda.
+"""
+
+import random
+from typing import List, Optional, Sequence
+from .grid_index import BOX_SIZE, SIZE
+
+# Biblioteca de tableros completos válidos (81 caracteres, fila por fila)
+BASE_GRIDS = (
+    '123456789456789123789123456234567891567891234891234567345678912678912345912345678',
+    '147236598295178346638459172364912857529387614781645239912564783856793421473821965',
+    '526413879318279564749856123293145687681397452475628931837964215164532798952781346',
+    '835162479691473582247589361326941857714856923589327614472638195163295748958714236',
+    '513462879247891365896357124165238947428719536379546218982673451634185792751924683',
+    '172354689398126547645789213517862394429531876863947152256478931934215768781693425',
+    '253416897418729365796358142524873916137695428689142573945237681362981754871564239',
+)
+
+
+def parse_grid(text: str) -> List[List[int]]:
+    """Convierte un tablero de 81 dígitos en una matriz 9x9"""
+    return [[int(char) for char in text[r * SIZE:(r + 1) * SIZE]] for r in range(SIZE)]
+
+
+def random_line_order(rng: random.Random) -> List[int]:
+    """Orden aleatorio de filas (o columnas): permuta las bandas y las líneas dentro de cada banda"""
+    bands = list(range(BOX_SIZE))
+    rng.shuffle(bands)
+    order = []
+    for band in bands:
+        lines = [band * BOX_SIZE + offset for offset in range(BOX_SIZE)]
+        rng.shuffle(lines)
+        order.extend(lines)
+    return order
+
+
+def relabel_digits(grid: Sequence[Sequence[int]], mapping: Sequence[int]) -> List[List[int]]:
+    """Reemplaza cada dígito d por mapping[d] (mapping[0] debe ser 0)"""
+    return [[mapping[num] for num in row] for row in grid]
+
+
+def permute_rows(grid: Sequence[Sequence[int]], order: Sequence[int]) -> List[List[int]]:
+    """La fila r del resultado es la fila order[r] del tablero"""
+    return [list(grid[r]) for r in order]
+
+
+def permute_columns(grid: Sequence[Sequence[int]], order: Sequence[int]) -> List[List[int]]:
+    """La columna c del resultado es la columna order[c] del tablero"""
+    return [[row[c] for c in order] for row in grid]
+
+
+def transpose(grid: Sequence[Sequence[int]]) -> List[List[int]]:
+    """Intercambia filas y columnas"""
+    return [list(column) for column in zip(*grid)]
+
+
+def random_grid(rng: Optional[random.Random] = None,
+                base: Optional[Sequence[Sequence[int]]] = None) -> List[List[int]]:
+    """Genera un tablero completo aplicando una simetría aleatoria a un tablero base.
+
+    Si no se indica base se elige uno de BASE_GRIDS. rng permite reproducir la
+    secuencia; por defecto se usa el generador global del módulo random.
+    """
+    rng = rng or random
+    if base is None:
+        base = parse_grid(rng.choice(BASE_GRIDS))
+
+    mapping = [0] + rng.sample(range(1, SIZE + 1), SIZE)
+    row_order = random_line_order(rng)
+    col_order = random_line_order(rng)
+
+    if rng.random() < 0.5:
+        return [[mapping[base[r][c]] for r in row_order] for c in col_order]
+    return [[mapping[base[r][c]] for c in col_order] for r in row_order]
@@ -5,6 +5,8 @@ Utilidades adicionales para el juego de Sudoku
 import pygame
 import time
 from typing import List, Tuple
+from .grid_index import ALL_DIGITS_MASK, MASK_DIGITS, peer_digits_mask
+from .propagation import find_single
 
 class SudokuValidator:
     """Clase para validar puzzles de Sudoku"""
@@ -105,13 +107,11 @@ class SudokuHints:
     
     def get_hint(self) -> Tuple[int, int, int]:
         """Obtiene una pista para el jugador"""
-        # Buscar la primera celda vacía que tenga una solución única
-        for row in range(9):
-            for col in range(9):
-                if self.board.get_cell_value(row, col) == 0:
-                    possible_values = self.get_possible_values(row, col)
-                    if len(possible_values) == 1:
-                        return row, col, possible_values[0]
+        # Buscar una celda deducible: single desnudo (candidato único) o single oculto
+        single = find_single(self.board.board)
+        if single is not None:
+            row, col, value, _ = single
+            return row, col, value
         
         # Si no hay soluciones únicas, devolver cualquier celda vacía con su valor correcto
         for row in range(9):
@@ -124,11 +124,8 @@ class SudokuHints:
     
     def get_possible_values(self, row: int, col: int) -> List[int]:
         """Obtiene los valores posibles para una celda"""
-        possible = []
-        for num in range(1, 10):
-            if self.board.is_proper_coloring_at(self.board.board, row, col, num):
-                possible.append(num)
-        return possible
+        used = peer_digits_mask(self.board.board, row, col)
+        return list(MASK_DIGITS[~used & ALL_DIGITS_MASK])
     
     def count_mistakes(self) -> int:
         """Cuenta el número de errores en el tablero actual"""
@@ -0,0 +1,313 @@
+"""
+Cálculo vectorizado con NumPy sobre lotes de tableros
+
+Los tableros se representan como un arreglo (N, 9, 9) de uint8 (0 = vacía) y las
+máscaras de dígitos como uint16 con el bit d - 1 para el dígito d, igual que en
+grid_index. Todas las operaciones procesan el lote completo a la vez, sin bucles
+de Python por celda; este módulo es la base del calificado y la generación en lote.
+
+Requiere NumPy (no es necesario para jugar).
+"""
+
+import math
+from itertools import combinations
+from typing import Dict, Iterable, Sequence, Tuple
+import numpy as np
+
+from .grid_index import ALL_DIGITS_MASK, NUM_CELLS, PEERS, SIZE, UNITS
+
+# Número de bits encendidos para cada máscara de 9 bits
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(ALL_DIGITS_MASK + 1)], dtype=np.uint8)
+
+# Dígito representado por cada máscara de un solo bit (0 para el resto)
+SINGLE_DIGIT = np.zeros(ALL_DIGITS_MASK + 1, dtype=np.uint8)
+for _digit in range(1, SIZE + 1):
+    SINGLE_DIGIT[1 << (_digit - 1)] = _digit
+
+# Bit de cada dígito (índice 0 = celda vacía)
+BIT_OF_DIGIT = np.array([0] + [1 << (digit - 1) for digit in range(1, SIZE + 1)], dtype=np.uint16)
+
+# Marca de una celda forzada a dos dígitos distintos por singles ocultos
+CONFLICT = 255
+
+# Tableros por bloque en difficulty_metrics (acota la memoria de las tablas (N, 81, 82))
+DIFFICULTY_CHUNK = 4096
+
+# Vecinos de cada celda, forma (81, 20)
+PEER_INDEX = np.array(PEERS, dtype=np.intp)
+
+# Pares de vecinos adyacentes entre sí de cada celda (los triángulos del grafo completo), forma (81, 82)
+_triangles = [[(u, w) for u, w in combinations(PEERS[cell], 2) if w in PEERS[u]] for cell in range(NUM_CELLS)]
+TRIANGLE_A = np.array([[u for u, _ in pairs] for pairs in _triangles], dtype=np.intp)
+TRIANGLE_B = np.array([[w for _, w in pairs] for pairs in _triangles], dtype=np.intp)
+
+# Pares de celdas de cada unidad, una vez por unidad compartida (27 * 36 pares)
+UNIT_PAIRS = np.array([pair for unit in UNITS for pair in combinations(unit, 2)], dtype=np.intp)
+
+# Término de inclusión-exclusión |A ∩ B| / |A ∪ B| indexado por |A ∩ B| * PAIR_STRIDE + |A| + |B|
+# (0 si ambas celdas se quedaron sin candidatos). Como |A ∪ B| <= 9, escalado por PAIR_SCALE es
+# entero y la suma no depende del orden ni del tamaño de los bloques
+PAIR_STRIDE = 2 * SIZE + 1
+PAIR_SCALE = math.lcm(*range(1, SIZE + 1))
+PAIR_TERM = np.array([PAIR_SCALE * intersection // (sizes - intersection) if sizes > intersection else 0
+                      for intersection in range(SIZE + 1) for sizes in range(PAIR_STRIDE)], dtype=np.int64)
+
+# Aporte de una celda con n candidatos a la suma de coeficientes binomiales
+BINOMIAL_TERM = np.array([sum(math.comb(n, k) for k in range(1, min(n + 1, 4))) if n > 1 else 0
+                          for n in range(SIZE + 1)], dtype=np.int64)
+MAX_BINOMIAL_TERM = sum(math.comb(SIZE, k) for k in range(1, 4))
+
+
+def to_array(boards: Iterable[Sequence[Sequence[int]]]) -> np.ndarray:
+    """Convierte una colección de tableros 9x9 en un arreglo (N, 9, 9) de uint8"""
+    array = np.asarray(boards if isinstance(boards, np.ndarray) else list(boards), dtype=np.uint8)
+    if array.ndim == 2:
+        array = array[np.newaxis]
+    if array.shape[1:] != (SIZE, SIZE):
+        raise ValueError(f"Se esperaba un arreglo (N, 9, 9) y se recibió {array.shape}")
+    return array
+
+
+def digit_bits(boards: np.ndarray) -> np.ndarray:
+    """Máscara de un bit por celda llena (0 en las vacías), forma (N, 9, 9)"""
+    return BIT_OF_DIGIT[boards]
+
+
+def _boxes_view(array: np.ndarray) -> np.ndarray:
+    """Reordena (N, 9, 9) para que el eje 1 sea la caja y el eje 2 la celda dentro de ella.
+
+    La transformación es su propia inversa.
+    """
+    n = array.shape[0]
+    return array.reshape(n, 3, 3, 3, 3).swapaxes(2, 3).reshape(n, SIZE, SIZE)
+
+
+def _unit_views(array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vistas (N, unidad, celda) de las filas, columnas y cajas de un arreglo (N, 9, 9)"""
+    return array, array.swapaxes(1, 2), _boxes_view(array)
+
+
+def _or_cells(units: np.ndarray) -> np.ndarray:
+    """OR de las 9 celdas de cada unidad, forma (N, 9)"""
+    result = units[:, :, 0].copy()
+    for k in range(1, SIZE):
+        result |= units[:, :, k]
+    return result
+
+
+def _once_twice(units: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Dígitos presentes en al menos una y en al menos dos celdas de cada unidad"""
+    once = units[:, :, 0].copy()
+    twice = np.zeros_like(once)
+    for k in range(1, SIZE):
+        twice |= once & units[:, :, k]
+        once |= units[:, :, k]
+    return once, twice
+
+
+def _per_cell(rows: np.ndarray, cols: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Combina con OR máscaras por fila, columna y caja (N, 9) en una máscara por celda (N, 9, 9)"""
+    box_per_cell = np.repeat(np.repeat(boxes.reshape(-1, 3, 3), 3, axis=1), 3, axis=2)
+    return rows[:, :, np.newaxis] | cols[:, np.newaxis, :] | box_per_cell
+
+
+def unit_used_masks(boards: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Máscaras de dígitos usados por fila, columna y caja, cada una de forma (N, 9)"""
+    bits = digit_bits(boards)
+    rows, cols, boxes = (_or_cells(units) for units in _unit_views(bits))
+    return rows, cols, boxes
+
+
+def candidate_masks(boards: np.ndarray) -> np.ndarray:
+    """Máscara de candidatos de cada celda vacía (0 en las llenas), forma (N, 9, 9)"""
+    candidates = ~_per_cell(*unit_used_masks(boards)) & ALL_DIGITS_MASK
+    return np.where(boards == 0, candidates, 0).astype(np.uint16)
+
+
+def candidate_counts(boards: np.ndarray) -> np.ndarray:
+    """Número de candidatos por celda (0 en las llenas), forma (N, 9, 9)"""
+    return POPCOUNT[candidate_masks(boards)]
+
+
+def has_conflicts(boards: np.ndarray) -> np.ndarray:
+    """Indica por tablero si algún dígito se repite en una fila, columna o caja, forma (N,)"""
+    conflicts = np.zeros(boards.shape[0], dtype=bool)
+    for units in _unit_views(digit_bits(boards)):
+        # Un dígito repetido aparece en dos celdas de la misma unidad
+        _, twice = _once_twice(units)
+        conflicts |= (twice != 0).any(axis=1)
+    return conflicts
+
+
+def _hidden_singles(candidates: np.ndarray) -> np.ndarray:
+    """Valores forzados por singles ocultos en filas, columnas y cajas, forma (N, 9, 9).
+
+    Las celdas forzadas a dos dígitos distintos se marcan con CONFLICT.
+    """
+    hidden = []
+    for units in _unit_views(candidates):
+        once, twice = _once_twice(units)
+        hidden.append(once & ~twice)
+    forced = candidates & _per_cell(*hidden)
+    values = SINGLE_DIGIT[forced]
+    values[(forced != 0) & (values == 0)] = CONFLICT
+    return values
+
+
+def _dead_ends(boards: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Tableros con una celda vacía sin candidatos o un dígito faltante que no cabe en su unidad"""
+    dead = ((boards == 0) & (candidates == 0)).any(axis=(1, 2))
+    # Dígitos colocados o aún posibles en cada fila, columna y caja
+    covered = digit_bits(boards) | candidates
+    for units in _unit_views(covered):
+        dead |= (_or_cells(units) != ALL_DIGITS_MASK).any(axis=1)
+    return dead
+
+
+def propagate_batch(boards: np.ndarray, max_rounds: int = 81) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Aplica singles desnudos y ocultos a todo el lote hasta que no haya cambios.
+
+    Retorna una copia propagada del lote y estadísticas por tablero:
+    'naked_singles', 'hidden_singles', 'remaining' y 'contradiction'. Los
+    tableros con contradicción dejan de modificarse.
+    """
+    boards = to_array(boards).copy()
+    n = boards.shape[0]
+    naked_total = np.zeros(n, dtype=np.int32)
+    hidden_total = np.zeros(n, dtype=np.int32)
+    contradiction = has_conflicts(boards)
+
+    # Solo se procesan los tableros que siguen cambiando y sin contradicción
+    active = np.flatnonzero(~contradiction)
+    for _ in range(max_rounds):
+        if active.size == 0:
+            break
+        work = boards[active]
+        dead = np.zeros(active.size, dtype=bool)
+
+        # 1. Singles desnudos
+        candidates = candidate_masks(work)
+        dead |= _dead_ends(work, candidates)
+        naked = SINGLE_DIGIT[candidates]
+        naked[dead] = 0
+        work = np.where(naked > 0, naked, work)
+        naked_placed = (naked > 0).sum(axis=(1, 2))
+        dead |= has_conflicts(work)
+
+        # 2. Singles ocultos, con los candidatos ya actualizados
+        candidates = candidate_masks(work)
+        dead |= _dead_ends(work, candidates)
+        hidden = _hidden_singles(candidates)
+        # Una celda forzada a dos dígitos distintos es una contradicción
+        dead |= (hidden == CONFLICT).any(axis=(1, 2))
+        hidden[dead] = 0
+        work = np.where(hidden > 0, hidden, work)
+        hidden_placed = (hidden > 0).sum(axis=(1, 2))
+        dead |= has_conflicts(work)
+
+        boards[active] = work
+        naked_total[active] += naked_placed
+        hidden_total[active] += hidden_placed
+        contradiction[active] = dead
+        active = active[~dead & ((naked_placed + hidden_placed) > 0)]
+
+    stats = {
+        'naked_singles': naked_total,
+        'hidden_singles': hidden_total,
+        'remaining': (boards == 0).sum(axis=(1, 2)),
+        'contradiction': contradiction,
+    }
+    return boards, stats
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray, where: np.ndarray) -> np.ndarray:
+    """numerator / denominator donde where es verdadero y 0.0 en el resto"""
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=where)
+
+
+def _difficulty_metrics_chunk(boards: np.ndarray) -> Dict[str, np.ndarray]:
+    """Métricas de dificultad de un bloque de tableros (ver difficulty_metrics)"""
+    n = boards.shape[0]
+    flat = boards.reshape(n, NUM_CELLS)
+    empty = flat == 0
+    empty_cells = empty.sum(axis=1)
+
+    # 1. Distribución de números: varianza de las frecuencias, sumada en el mismo orden que la versión escalar
+    counts = np.stack([(flat == digit).sum(axis=1) for digit in range(1, SIZE + 1)], axis=1)
+    total = counts.sum(axis=1)
+    average = total / 9.0
+    variance = np.zeros(n)
+    for digit in range(SIZE):
+        variance = variance + (counts[:, digit] - average) ** 2
+    variance /= 9.0
+    max_variance = (total ** 2 + 8 * (0 - average) ** 2) / 9.0
+    number_distribution = np.minimum(1.0, _divide(variance, max_variance, max_variance > 0))
+
+    # 2-4. Permutaciones: reordenar filas o columnas de una banda o pila no cambia ninguna unidad, así
+    # que dependen solo de si el tablero (o cada caja) tiene dígitos repetidos
+    band_permutations = np.where(has_conflicts(boards), 0.0, 1.0)
+    _, twice = _once_twice(_boxes_view(digit_bits(boards)))
+    valid_boxes = (twice == 0).reshape(n, 3, 3)
+    valid_row_perms = 6 * valid_boxes.all(axis=2).sum(axis=1)
+    valid_col_perms = 6 * valid_boxes.all(axis=1).sum(axis=1)
+    block_permutations = ((valid_row_perms / 3) / 6.0 + (valid_col_perms / 3) / 6.0) / 2.0
+
+    # 5. Grafo de celdas vacías: grado y triángulos de cada celda
+    degree = empty[:, PEER_INDEX].sum(axis=2) * empty
+    triangles = (empty[:, TRIANGLE_A] & empty[:, TRIANGLE_B]).sum(axis=2) * empty
+    local_clustering = _divide(triangles, degree * (degree - 1) / 2, degree >= 2)
+    clustering_sum = np.zeros(n)
+    for cell in range(NUM_CELLS):
+        clustering_sum = clustering_sum + local_clustering[:, cell]
+    clustering = _divide(clustering_sum, empty_cells, empty_cells >= 2)
+    density = _divide(degree.sum(axis=1) / 2, empty_cells * (empty_cells - 1) / 2, empty_cells > 1)
+
+    # 6. Combinatoria: inclusión-exclusión sobre los pares de cada unidad, binomiales y entropía
+    masks = candidate_masks(boards).reshape(n, NUM_CELLS)
+    candidates = POPCOUNT[masks]
+    first, second = UNIT_PAIRS[:, 0], UNIT_PAIRS[:, 1]
+    intersection = POPCOUNT[masks[:, first] & masks[:, second]].astype(np.intp)
+    pair_terms = PAIR_TERM[intersection * PAIR_STRIDE + candidates[:, first] + candidates[:, second]]
+    pair_terms *= empty[:, first] & empty[:, second]
+    inclusion_exclusion = _divide(pair_terms.sum(axis=1) / PAIR_SCALE, empty_cells * (empty_cells - 1) / 2,
+                                  empty_cells >= 2)
+    binomial = _divide(BINOMIAL_TERM[candidates].sum(axis=1), empty_cells * MAX_BINOMIAL_TERM, empty_cells > 0)
+    entropy = np.zeros(n)
+    for count in range(2, SIZE + 1):
+        entropy = entropy + (candidates == count).sum(axis=1) * math.log2(count)
+    entropy = _divide(entropy, empty_cells * math.log2(9), empty_cells > 0)
+
+    # 7. Espacio de soluciones: log del factor de ramificación promedio
+    average_branching = _divide(candidates.sum(axis=1, dtype=np.int64), empty_cells, empty_cells > 0)
+    search_space_log = empty_cells * np.log(np.maximum(average_branching, 1.0))
+    solution_space = np.where(empty_cells == 0, 1.0, np.minimum(1.0, search_space_log / 178.0))
+
+    return {
+        'number_distribution': number_distribution,
+        'row_permutations': band_permutations,
+        'col_permutations': band_permutations.copy(),
+        'block_permutations': block_permutations,
+        'clustering': clustering,
+        'density': density,
+        'inclusion_exclusion': inclusion_exclusion,
+        'binomial': binomial,
+        'entropy': entropy,
+        'solution_space': solution_space,
+        'empty_cells': empty_cells,
+    }
+
+
+def difficulty_metrics(boards: np.ndarray, chunk_size: int = DIFFICULTY_CHUNK) -> Dict[str, np.ndarray]:
+    """Métricas de AdvancedDifficultySystem.calculate_difficulty para todo el lote, cada una de forma (N,).
+
+    Retorna las cuatro métricas de permutaciones, el espacio de soluciones y los
+    términos sin ponderar del grafo ('clustering', 'density') y de la combinatoria
+    ('inclusion_exclusion', 'binomial', 'entropy' ya normalizada), además de
+    'empty_cells'. calculate_difficulty_batch las combina con los pesos de
+    advanced_difficulty. Los tableros se procesan en bloques de chunk_size.
+    """
+    boards = to_array(boards)
+    chunks = [_difficulty_metrics_chunk(boards[start:start + chunk_size])
+              for start in range(0, boards.shape[0], chunk_size)] or [_difficulty_metrics_chunk(boards)]
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
@@ -0,0 +1,386 @@
+"""
+Pruebas cruzadas de los motores de resolución registrados
+"""
+
+import itertools
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sudoku.board import SudokuBoard
+from sudoku.dlx import DancingLinks
+from sudoku.propagation import find_single, propagate
+from sudoku.solve_stats import BUDGET_EXCEEDED, SolveStats
+from sudoku.solvers import SOLVERS, count_solutions, get_solver, solve
+from sudoku.advanced_difficulty import AdvancedDifficultySystem
+from sudoku.batch import PREFETCH_PER_JOB, format_puzzle, parse_puzzle, solve_many, solve_one
+from sudoku.step_solver import SOLVED, UNSOLVABLE, StepSolver
+from sudoku.vectorized import candidate_counts, candidate_masks, difficulty_metrics, propagate_batch, to_array
+
+# Puzzle clásico con solución única
+UNIQUE_PUZZLE = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+
+# Puzzle que exige miles de nodos de búsqueda sin el pre-paso de propagación
+HARD_PUZZLE = parse_puzzle("..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9")
+
+
+class TestSolverRegistry(unittest.TestCase):
+    """Pruebas para el registro de motores y el motor de Dancing Links"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.board = SudokuBoard()
+
+    def test_all_solvers_agree_on_unique_puzzle(self):
+        """Todos los motores deben encontrar la misma solución de un puzzle único"""
+        solutions = {}
+        for name in SOLVERS:
+            test_board = [row[:] for row in UNIQUE_PUZZLE]
+            solved, _ = get_solver(name)(test_board)
+            self.assertTrue(solved, name)
+            solutions[name] = test_board
+
+        reference = solutions['bitmask']
+        for name, solution in solutions.items():
+            self.assertEqual(solution, reference, name)
+
+    def test_dlx_cross_checks_backtracking(self):
+        """La solución de Dancing Links debe ser válida y respetar los números iniciales"""
+        self.board.generate_puzzle('dificil')
+
+        dlx_board = [row[:] for row in self.board.initial_board]
+        self.board.solver_mode = 'dlx'
+        self.assertTrue(self.board.solve_backtracking(dlx_board))
+
+        for i in range(9):
+            for j in range(9):
+                self.assertTrue(self.board.is_proper_coloring_at(dlx_board, i, j, dlx_board[i][j]))
+                if self.board.initial_board[i][j] != 0:
+                    self.assertEqual(dlx_board[i][j], self.board.initial_board[i][j])
+
+    def test_dlx_count_and_enumerate(self):
+        """Los modos contar y enumerar deben coincidir y no alterar la matriz"""
+        puzzle = [row[:] for row in UNIQUE_PUZZLE]
+        # Quitar pistas hasta tener varias soluciones
+        puzzle[0][0] = puzzle[0][1] = puzzle[1][0] = puzzle[4][0] = 0
+
+        dlx = DancingLinks(puzzle)
+        total = dlx.count()
+        self.assertGreater(total, 1)
+        self.assertEqual(dlx.count(limit=2), 2)
+        self.assertEqual(len(list(dlx.iter_solutions())), total)
+        self.assertEqual(dlx.count(), total)
+
+        self.assertEqual(DancingLinks(UNIQUE_PUZZLE).count(limit=2), 1)
+
+    def test_conflicting_givens(self):
+        """Un tablero con números iniciales en conflicto no tiene solución"""
+        test_board = [[0 for _ in range(9)] for _ in range(9)]
+        test_board[0][0] = test_board[0][5] = 3
+
+        self.assertEqual(DancingLinks(test_board).count(), 0)
+        self.assertIsNone(DancingLinks(test_board).solve())
+
+    def test_unknown_solver(self):
+        """Un nombre de motor desconocido debe producir un error claro"""
+        with self.assertRaises(ValueError):
+            get_solver('inexistente')
+
+    def test_count_solutions_early_exit(self):
+        """count_solutions coincide con Dancing Links hasta el límite y no altera el tablero"""
+        puzzle = [row[:] for row in UNIQUE_PUZZLE]
+        self.assertEqual(count_solutions(puzzle), 1)
+
+        puzzle[0][0] = puzzle[0][1] = puzzle[1][0] = puzzle[4][0] = 0
+        original = [row[:] for row in puzzle]
+        self.assertEqual(count_solutions(puzzle, limit=2), 2)
+        self.assertEqual(count_solutions(puzzle, limit=1000), DancingLinks(puzzle).count())
+        self.assertEqual(puzzle, original)
+
+    def test_generator_rejects_non_unique(self):
+        """Con require_unique el generador solo entrega puzzles de solución única"""
+        system = AdvancedDifficultySystem()
+        puzzle, _, metrics = system.generate_advanced_puzzle('facil', require_unique=True)
+
+        self.assertTrue(metrics['unique_solution'])
+        self.assertEqual(count_solutions(puzzle), 1)
+        self.assertEqual(sum(row.count(0) for row in puzzle), 51)
+
+    def test_step_solver_is_resumable(self):
+        """StepSolver avanza por tramos y llega a la misma solución que MRV"""
+        puzzle = [row[:] for row in UNIQUE_PUZZLE]
+        solver = StepSolver(puzzle)
+
+        self.assertFalse(solver.step(5))
+        self.assertEqual(solver.steps, 5)
+        while not solver.step(3):
+            pass
+
+        expected = [row[:] for row in UNIQUE_PUZZLE]
+        get_solver('mrv')(expected)
+        self.assertEqual(solver.status, SOLVED)
+        self.assertEqual(puzzle, expected)
+
+    def test_step_solver_unsolvable(self):
+        """StepSolver deja el tablero intacto cuando no hay solución"""
+        test_board = [[0 for _ in range(9)] for _ in range(9)]
+        test_board[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+        test_board[1][8] = 9
+        original = [row[:] for row in test_board]
+
+        solver = StepSolver(test_board)
+        self.assertFalse(solver.run())
+        self.assertEqual(solver.status, UNSOLVABLE)
+        self.assertEqual(test_board, original)
+
+
+class TestSolveStats(unittest.TestCase):
+    """Pruebas para las estadísticas y los presupuestos de resolución"""
+
+    def test_stats_report_effort(self):
+        """Cada motor reporta nodos, retrocesos, profundidad y estado"""
+        empty_cells = sum(row.count(0) for row in UNIQUE_PUZZLE)
+        for name in ('bitmask', 'mrv', 'dlx', 'coloring', 'step'):
+            with self.subTest(solver=name):
+                puzzle = [row[:] for row in UNIQUE_PUZZLE]
+                stats = solve(puzzle, name, use_propagation=False)
+
+                self.assertIsInstance(stats, SolveStats)
+                self.assertTrue(stats.solved)
+                self.assertGreater(stats.nodes, 0)
+                self.assertGreaterEqual(stats.backtracks, 0)
+                self.assertEqual(stats.max_depth, empty_cells)
+                self.assertEqual(stats.propagated, 0)
+                self.assertGreaterEqual(stats.elapsed, 0)
+                self.assertNotIn(0, [num for row in puzzle for num in row])
+
+        stats = solve([row[:] for row in UNIQUE_PUZZLE], 'mrv')
+        self.assertEqual(stats.propagated, empty_cells)
+
+    def test_node_budget(self):
+        """Al agotar el presupuesto de nodos la resolución termina sin tocar el tablero"""
+        for name in ('bitmask', 'mrv', 'coloring', 'step'):
+            with self.subTest(solver=name):
+                puzzle = [row[:] for row in HARD_PUZZLE]
+                stats = solve(puzzle, name, max_nodes=100, use_propagation=False)
+
+                self.assertEqual(stats.status, BUDGET_EXCEEDED)
+                self.assertEqual(stats.nodes, 101)
+                self.assertEqual(puzzle, HARD_PUZZLE)
+
+        stats = solve([row[:] for row in HARD_PUZZLE], 'mrv', max_nodes=10000, use_propagation=False)
+        self.assertTrue(stats.solved)
+
+    def test_time_budget(self):
+        """Un presupuesto de tiempo agotado aborta la búsqueda"""
+        for name in ('mrv', 'coloring'):
+            stats = solve([row[:] for row in HARD_PUZZLE], name, max_time=0.0, use_propagation=False)
+            self.assertEqual(stats.status, BUDGET_EXCEEDED)
+
+    def test_coloring_counts_like_bitmask(self):
+        """La coloración recorre el mismo árbol que las máscaras de bits (mismo orden de celdas y dígitos)"""
+        coloring = solve([row[:] for row in UNIQUE_PUZZLE], 'coloring', use_propagation=False)
+        bitmask = solve([row[:] for row in UNIQUE_PUZZLE], 'bitmask', use_propagation=False)
+        self.assertEqual((coloring.nodes, coloring.backtracks), (bitmask.nodes, bitmask.backtracks))
+
+    def test_board_and_batch_budgets(self):
+        """El tablero y la resolución en lote exponen las estadísticas y el presupuesto"""
+        board = SudokuBoard()
+        board.solver_mode = 'mrv'
+        board.use_propagation = False
+        board.max_solve_nodes = 50
+
+        self.assertFalse(board.solve_backtracking([row[:] for row in HARD_PUZZLE]))
+        self.assertEqual(board.last_solve_stats.status, BUDGET_EXCEEDED)
+
+        board.max_solve_nodes = None
+        self.assertTrue(board.solve_backtracking([row[:] for row in HARD_PUZZLE]))
+        self.assertEqual(board.last_solve_nodes, board.last_solve_stats.nodes)
+
+        result = solve_one(format_puzzle(UNIQUE_PUZZLE), 'bitmask', max_nodes=1)
+        self.assertEqual(result['status'], 'solved')  # La propagación resuelve sin buscar
+        self.assertEqual(result['stats']['propagated'], 51)
+
+
+class TestPropagation(unittest.TestCase):
+    """Pruebas para el pre-paso de singles desnudos y ocultos"""
+
+    def test_propagation_solves_simple_puzzle(self):
+        """Un puzzle sencillo se resuelve solo con propagación"""
+        puzzle = [row[:] for row in UNIQUE_PUZZLE]
+        stats = propagate(puzzle)
+
+        self.assertFalse(stats['contradiction'])
+        self.assertEqual(stats['remaining'], 0)
+        self.assertEqual(stats['naked_singles'] + stats['hidden_singles'], 51)
+
+        expected = [row[:] for row in UNIQUE_PUZZLE]
+        get_solver('bitmask')(expected)
+        self.assertEqual(puzzle, expected)
+
+    def test_propagation_detects_contradiction(self):
+        """Una celda sin candidatos se reporta como contradicción"""
+        test_board = [[0 for _ in range(9)] for _ in range(9)]
+        test_board[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+        test_board[1][8] = 9
+
+        self.assertTrue(propagate(test_board)['contradiction'])
+
+    def test_prepass_keeps_solution(self):
+        """El pre-paso no cambia la solución encontrada por el backtracking"""
+        board = SudokuBoard()
+        board.generate_puzzle('facil')
+
+        with_propagation = [row[:] for row in board.initial_board]
+        without_propagation = [row[:] for row in board.initial_board]
+
+        board.use_propagation = True
+        self.assertTrue(board.solve_backtracking(with_propagation))
+        board.use_propagation = False
+        self.assertTrue(board.solve_backtracking(without_propagation))
+
+        self.assertEqual(with_propagation, without_propagation)
+
+    def test_find_single_does_not_modify_board(self):
+        """find_single retorna una deducción válida sin tocar el tablero"""
+        puzzle = [row[:] for row in UNIQUE_PUZZLE]
+        row, col, value, rule = find_single(puzzle)
+
+        self.assertEqual(puzzle, UNIQUE_PUZZLE)
+        self.assertEqual(puzzle[row][col], 0)
+        self.assertIn(rule, ('naked_single', 'hidden_single'))
+
+        solution = [row[:] for row in UNIQUE_PUZZLE]
+        get_solver('dlx')(solution)
+        self.assertEqual(solution[row][col], value)
+
+
+class TestBatchSolve(unittest.TestCase):
+    """Pruebas para la resolución de lotes"""
+
+    def test_parse_and_format(self):
+        """El formato de 81 caracteres se convierte en ambos sentidos"""
+        text = format_puzzle(UNIQUE_PUZZLE)
+        self.assertEqual(len(text), 81)
+        self.assertEqual(parse_puzzle(text), UNIQUE_PUZZLE)
+        self.assertEqual(parse_puzzle(text.replace('.', '0')), UNIQUE_PUZZLE)
+
+    def test_solve_many_in_order(self):
+        """Los resultados conservan el orden de entrada y reportan estado y tiempo"""
+        unsolvable = [[0 for _ in range(9)] for _ in range(9)]
+        unsolvable[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+        unsolvable[1][8] = 9
+        puzzles = [UNIQUE_PUZZLE, format_puzzle(unsolvable), '123', format_puzzle(UNIQUE_PUZZLE)]
+
+        for jobs in (1, 2):
+            results = list(solve_many(puzzles, jobs=jobs, chunksize=1))
+            self.assertEqual([r['index'] for r in results], [0, 1, 2, 3])
+            self.assertEqual([r['status'] for r in results], ['solved', 'unsolvable', 'error', 'solved'])
+            self.assertEqual(results[0]['solution'], results[3]['solution'])
+            self.assertGreaterEqual(results[0]['time'], 0)
+
+    def test_solve_many_unordered(self):
+        """En modo no ordenado cada resultado indica a qué puzzle corresponde"""
+        results = list(solve_many([UNIQUE_PUZZLE] * 4, jobs=2, ordered=False))
+        self.assertEqual(sorted(r['index'] for r in results), [0, 1, 2, 3])
+
+    def test_solve_many_consumes_input_lazily(self):
+        """Con varios procesos solo se lee una ventana acotada de una entrada infinita"""
+        consumed = 0
+
+        def puzzles():
+            nonlocal consumed
+            while True:
+                consumed += 1
+                yield UNIQUE_PUZZLE
+
+        for ordered in (True, False):
+            consumed = 0
+            results = solve_many(puzzles(), jobs=2, chunksize=2, ordered=ordered)
+            first = list(itertools.islice(results, 5))
+            results.close()
+            self.assertTrue(all(r['status'] == 'solved' for r in first))
+            # La ventana de bloques de 2 puzzles más los 3 bloques ya entregados
+            self.assertLessEqual(consumed, 2 * (2 * PREFETCH_PER_JOB + 3))
+
+
+
+class TestVectorized(unittest.TestCase):
+    """Pruebas para el cálculo vectorizado sobre lotes"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.difficulty_system = AdvancedDifficultySystem()
+        self.puzzles = [self.difficulty_system.generate_advanced_puzzle(level)[0]
+                        for level in ('facil', 'dificil')]
+
+        contradictory = [[0 for _ in range(9)] for _ in range(9)]
+        contradictory[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+        contradictory[1][8] = 9
+        self.puzzles += [UNIQUE_PUZZLE, contradictory]
+
+    def test_candidates_match_per_cell(self):
+        """Las máscaras del lote coinciden con los candidatos calculados celda por celda"""
+        masks = candidate_masks(to_array(self.puzzles))
+        counts = candidate_counts(to_array(self.puzzles))
+
+        for n, puzzle in enumerate(self.puzzles):
+            for r in range(9):
+                for c in range(9):
+                    if puzzle[r][c] != 0:
+                        self.assertEqual(masks[n, r, c], 0)
+                        continue
+                    expected = self.difficulty_system._get_possible_values(puzzle, r, c)
+                    digits = {d for d in range(1, 10) if masks[n, r, c] >> (d - 1) & 1}
+                    self.assertEqual(digits, expected)
+                    self.assertEqual(counts[n, r, c], len(expected))
+
+    def test_propagation_matches_scalar(self):
+        """La propagación del lote llega al mismo tablero que propagate"""
+        propagated, stats = propagate_batch(to_array(self.puzzles))
+
+        for n, puzzle in enumerate(self.puzzles):
+            expected = [row[:] for row in puzzle]
+            expected_stats = propagate(expected)
+
+            self.assertEqual(bool(stats['contradiction'][n]), expected_stats['contradiction'])
+            if not expected_stats['contradiction']:
+                self.assertEqual(propagated[n].tolist(), expected)
+                self.assertEqual(stats['remaining'][n], expected_stats['remaining'])
+
+        self.assertEqual(stats['remaining'][2], 0)
+
+    def test_difficulty_batch_matches_scalar(self):
+        """Las dificultades del lote son las de calculate_difficulty, tablero por tablero"""
+        solution = [row[:] for row in self.difficulty_system.board.solution]
+        repeated = [row[:] for row in UNIQUE_PUZZLE]
+        repeated[0][2] = 5  # Dígito repetido en la fila 0
+        boards = self.puzzles + [solution, [[0] * 9 for _ in range(9)], repeated]
+
+        difficulty, metrics = self.difficulty_system.calculate_difficulty_batch(boards)
+        for n, board in enumerate(boards):
+            self.assertEqual(difficulty[n], self.difficulty_system.calculate_difficulty(board))
+            for name in ('permutation_difficulty', 'graph_difficulty', 'combinatorial_difficulty'):
+                self.assertAlmostEqual(metrics[name][n], getattr(self.difficulty_system, name), places=12)
+        self.assertEqual(metrics['row_permutations'][-1], 0.0)
+
+        # El resultado no depende del tamaño de los bloques
+        chunked = difficulty_metrics(to_array(boards), chunk_size=2)
+        for name, values in difficulty_metrics(to_array(boards)).items():
+            self.assertTrue((chunked[name] == values).all())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
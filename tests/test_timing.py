@@ -8,14 +8,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sudoku.board import SudokuBoard
 
-def test_timing_comprehensive():
+def test_timing_comprehensive(solver_name: str = 'bitmask'):
     """Test exhaustivo del cronómetro con 50 sudokus por dificultad"""
     print("=" * 80)
     print("🧪 TEST EXHAUSTIVO DEL CRONÓMETRO DE RESOLUCIÓN")
     print("📊 Resolviendo 50 sudokus por cada dificultad")
+    print(f"🔧 Motor de resolución: {solver_name}")
     print("=" * 80)
     
     board = SudokuBoard()
+    board.solver_mode = solver_name
     
     # Configuración de test
     difficulties = ['facil', 'dificil']
@@ -138,4 +140,5 @@ def test_timing_comprehensive():
     print("=" * 80)
 
 if __name__ == "__main__":
-    test_timing_comprehensive()
+    # Uso: python tests/test_timing.py [bitmask|mrv|dlx|coloring]
+    test_timing_comprehensive(sys.argv[1] if len(sys.argv) > 1 else 'bitmask')
@@ -2,6 +2,10 @@
 Pruebas unitarias para el juego de Sudoku
 """
 
+import io
+import itertools
+import json
+import random
 import unittest
 import sys
 import os
@@ -11,6 +15,20 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sudoku.board import SudokuBoard
 from sudoku.utils import SudokuValidator, SudokuHints
+from sudoku.grid_index import CONSTRAINT_GRAPH, NUM_CELLS, PEERS, PEER_MASK
+from sudoku.advanced_difficulty import TARGET_RANGES, AdvancedDifficultySystem, GenerationPolicy, _dispersed_removal_order
+from sudoku.bank import PuzzleBank
+from sudoku.batch import parse_puzzle
+from sudoku.cli import export_puzzles
+from sudoku.digging import HoleDigger, dig_holes
+from sudoku.evaluator import DifficultyEvaluator
+from sudoku.pool import PuzzlePool, generate_entry
+from sudoku.propagation import has_conflicts
+from sudoku.solvers import has_unique_solution
+from sudoku.stream import iter_puzzles
+from sudoku.symmetry import (MASK_LIBRARY, SYMMETRIES, apply_mask, has_unique_mask, is_balanced, is_symmetric,
+                             random_symmetric_mask, unavoidable_sets)
+from sudoku.transforms import BASE_GRIDS, parse_grid, permute_columns, permute_rows, random_grid, relabel_digits, transpose
 
 class TestSudokuBoard(unittest.TestCase):
     """Pruebas para la clase SudokuBoard"""
@@ -114,6 +132,647 @@ class TestSudokuBoard(unittest.TestCase):
                 if self.board.is_cell_editable(i, j):
                     self.assertEqual(self.board.get_cell_value(i, j), 0)
 
+    def test_bitmask_solver_matches_coloring(self):
+        """Prueba que el modo de máscaras de bits encuentra la misma solución que el clásico"""
+        self.board.generate_puzzle('facil')
+
+        bitmask_board = [row[:] for row in self.board.initial_board]
+        coloring_board = [row[:] for row in self.board.initial_board]
+
+        self.board.solver_mode = 'bitmask'
+        self.assertTrue(self.board.solve_backtracking(bitmask_board))
+        self.board.solver_mode = 'coloring'
+        self.assertTrue(self.board.solve_backtracking(coloring_board))
+
+        self.assertEqual(bitmask_board, coloring_board)
+
+    def test_bitmask_solver_unsolvable(self):
+        """Prueba que el modo de máscaras de bits detecta tableros sin solución"""
+        test_board = [[0 for _ in range(9)] for _ in range(9)]
+        test_board[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+        test_board[1][8] = 9
+
+        self.assertFalse(self.board.solve_backtracking(test_board))
+        self.assertEqual(test_board[0][8], 0)
+
+    def test_mrv_solver(self):
+        """Prueba que el modo MRV resuelve respetando los números iniciales y cuenta nodos"""
+        self.board.generate_puzzle('dificil')
+        test_board = [row[:] for row in self.board.initial_board]
+
+        self.board.solver_mode = 'mrv'
+        self.assertTrue(self.board.solve_backtracking(test_board))
+        self.assertGreater(self.board.last_solve_nodes, 0)
+
+        for i in range(9):
+            for j in range(9):
+                self.assertTrue(self.board.is_proper_coloring_at(test_board, i, j, test_board[i][j]))
+                if self.board.initial_board[i][j] != 0:
+                    self.assertEqual(test_board[i][j], self.board.initial_board[i][j])
+
+    def test_mrv_solver_unsolvable(self):
+        """Prueba que el modo MRV falla sin modificar un tablero sin solución"""
+        test_board = [[0 for _ in range(9)] for _ in range(9)]
+        test_board[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+        test_board[1][8] = 9
+        original = [row[:] for row in test_board]
+
+        self.board.solver_mode = 'mrv'
+        self.assertFalse(self.board.solve_backtracking(test_board))
+        self.assertEqual(test_board, original)
+
+
+class TestGridIndex(unittest.TestCase):
+    """Pruebas para el índice estático de la cuadrícula"""
+
+    def test_peers(self):
+        """Prueba que cada celda tiene exactamente 20 vecinos coherentes con su bitset"""
+        for cell in range(NUM_CELLS):
+            self.assertEqual(len(PEERS[cell]), 20)
+            self.assertNotIn(cell, PEERS[cell])
+            self.assertEqual(PEER_MASK[cell], sum(1 << p for p in PEERS[cell]))
+
+    def test_neighbors_match_constraint_graph(self):
+        """Prueba que get_neighbors y el grafo de restricciones comparten el mismo índice"""
+        board = SudokuBoard()
+        self.assertEqual(board.get_neighbors(4, 4), CONSTRAINT_GRAPH[(4, 4)])
+        self.assertIn((3, 5), board.get_neighbors(4, 4))
+        self.assertNotIn((0, 0), board.get_neighbors(4, 4))
+
+
+class TestTransforms(unittest.TestCase):
+    """Pruebas para la generación de tableros por transformaciones de simetría"""
+
+    def assertCompleteGrid(self, grid):
+        """Verifica que el tablero esté completo y sin conflictos"""
+        self.assertEqual(len(grid), 9)
+        self.assertTrue(all(sorted(row) == list(range(1, 10)) for row in grid))
+        self.assertFalse(has_conflicts(grid))
+
+    def test_base_grids_are_valid(self):
+        """Todos los tableros de la biblioteca son soluciones válidas"""
+        for text in BASE_GRIDS:
+            self.assertCompleteGrid(parse_grid(text))
+
+    def test_transformations_preserve_validity(self):
+        """Cada transformación individual conserva la validez"""
+        grid = parse_grid(BASE_GRIDS[1])
+        self.assertCompleteGrid(relabel_digits(grid, [0, 9, 8, 7, 6, 5, 4, 3, 2, 1]))
+        self.assertCompleteGrid(permute_rows(grid, [5, 3, 4, 8, 6, 7, 1, 0, 2]))
+        self.assertCompleteGrid(permute_columns(grid, [6, 7, 8, 2, 0, 1, 3, 5, 4]))
+        self.assertCompleteGrid(transpose(grid))
+
+    def test_random_grid(self):
+        """Los tableros generados son válidos, variados y reproducibles con una semilla"""
+        grids = [random_grid(random.Random(seed)) for seed in range(50)]
+        for grid in grids:
+            self.assertCompleteGrid(grid)
+        self.assertGreater(len({str(grid) for grid in grids}), 45)
+        self.assertEqual(random_grid(random.Random(7)), random_grid(random.Random(7)))
+
+    def test_board_transform_mode(self):
+        """El modo 'transform' del tablero genera tableros completos válidos"""
+        board = SudokuBoard()
+        board.grid_generation = 'transform'
+        self.assertCompleteGrid(board.generate_complete_board())
+
+        board.grid_generation = 'inexistente'
+        with self.assertRaises(ValueError):
+            board.generate_complete_board()
+
+
+class TestPuzzlePool(unittest.TestCase):
+    """Pruebas para la reserva de puzzles generados en segundo plano"""
+
+    def test_pool_refills_in_background(self):
+        """El pool de procesos rellena la reserva y el tablero toma puzzles de ella"""
+        pool = PuzzlePool(difficulties=('facil',), watermark=1).start()
+        try:
+            self.assertTrue(pool.wait_until_full(timeout=120))
+            entry = pool.queues['facil'][0]
+
+            board = SudokuBoard()
+            board.puzzle_pool = pool
+            puzzle, difficulty = board.generate_puzzle('facil')
+
+            self.assertIs(puzzle, entry['puzzle'])
+            self.assertEqual(board.initial_board, entry['puzzle'])
+            self.assertEqual(board.solution, entry['solution'])
+            self.assertEqual(difficulty, entry['difficulty'])
+            self.assertEqual(board.difficulty_metrics, entry['metrics'])
+
+            # El puzzle tomado se repone desde el pool de procesos
+            self.assertTrue(pool.wait_until_full(timeout=120))
+            self.assertEqual(pool.generated, 2)
+        finally:
+            pool.stop()
+        self.assertFalse(pool.running)
+
+    def test_empty_pool_falls_back(self):
+        """Sin puzzles listos take() no bloquea y get() genera de forma síncrona"""
+        pool = PuzzlePool(difficulties=('dificil',), watermark=1)
+        self.assertIsNone(pool.take('dificil'))
+        self.assertIsNone(pool.take('inexistente'))
+
+        entry = pool.get('dificil')
+        self.assertEqual(pool.misses, 1)
+        self.assertEqual(len(entry['puzzle']), 9)
+        self.assertEqual(len(entry['solution']), 9)
+        self.assertIn('final_difficulty', entry['metrics'])
+
+
+class TestParallelGeneration(unittest.TestCase):
+    """Pruebas para la generación reproducible y en paralelo"""
+
+    def test_seed_is_reproducible_across_jobs(self):
+        """Con semilla el resultado es el mismo en un proceso o en varios"""
+        sequential = AdvancedDifficultySystem().generate_advanced_puzzle('dificil', seed=42)
+        parallel = AdvancedDifficultySystem().generate_advanced_puzzle('dificil', seed=42, jobs=2)
+        for _, _, metrics in (sequential, parallel):
+            del metrics['generation']['elapsed']
+        self.assertEqual(sequential, parallel)
+
+        other = AdvancedDifficultySystem().generate_advanced_puzzle('dificil', seed=43)
+        self.assertNotEqual(sequential[0], other[0])
+
+    def test_seed_does_not_touch_global_random(self):
+        """Generar con semilla no altera el estado del generador global"""
+        state = random.getstate()
+        AdvancedDifficultySystem().generate_advanced_puzzle('facil', seed=1)
+        self.assertEqual(random.getstate(), state)
+
+
+class TestGenerationPolicy(unittest.TestCase):
+    """Pruebas para el presupuesto de intentos y tiempo de la generación"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.difficulty_system = AdvancedDifficultySystem()
+
+    def test_default_reports_all_attempts(self):
+        """Sin política se evalúan los 100 intentos"""
+        _, _, metrics = self.difficulty_system.generate_advanced_puzzle('facil', seed=3)
+        self.assertEqual(metrics['generation']['attempts'], 100)
+        self.assertFalse(metrics['generation']['threshold_met'])
+
+    def test_quality_threshold_stops_early(self):
+        """Se detiene en cuanto un candidato en rango alcanza el umbral"""
+        policy = GenerationPolicy(quality_threshold=0.01)
+        _, _, metrics = self.difficulty_system.generate_advanced_puzzle('facil', seed=3, policy=policy)
+
+        generation = metrics['generation']
+        self.assertTrue(generation['threshold_met'])
+        self.assertLess(generation['attempts'], 100)
+        low, high = metrics['target_range']
+        self.assertTrue(low <= metrics['final_difficulty'] <= high)
+
+    def test_attempts_and_deadline(self):
+        """El número de intentos y el plazo acotan la generación"""
+        policy = GenerationPolicy(max_attempts=5)
+        _, _, metrics = self.difficulty_system.generate_advanced_puzzle('dificil', policy=policy)
+        self.assertEqual(metrics['generation']['attempts'], 5)
+
+        policy = GenerationPolicy(max_time=0.0)
+        puzzle, _, metrics = self.difficulty_system.generate_advanced_puzzle('dificil', policy=policy)
+        self.assertTrue(metrics['generation']['deadline_expired'])
+        self.assertEqual(metrics['generation']['attempts'], 1)
+        self.assertEqual(sum(row.count(0) for row in puzzle), 51)
+
+    def test_fallback_attempts_reported(self):
+        """Las variaciones del último recurso de solución única se cuentan aparte"""
+        policy = GenerationPolicy(max_attempts=1)
+        _, _, metrics = self.difficulty_system.generate_advanced_puzzle(
+            'dificil', require_unique=True, seed=2, policy=policy)
+        generation = metrics['generation']
+        self.assertEqual(generation['attempts'], 1)
+        self.assertGreater(generation['fallback_attempts'], 1)
+        self.assertTrue(metrics['unique_solution'])
+
+    def test_unique_fallback_digs_when_draws_fail(self):
+        """Si ninguna variación tiene solución única, el último recurso cava huecos con HoleDigger"""
+        random.seed(0)
+        solution = random_grid()
+        # Con el plazo vencido solo se prueba una variación (sin solución única con esta semilla)
+        puzzle, draws = self.difficulty_system._create_unique_variation(solution, 'dificil', deadline=0.0)
+        self.assertEqual(draws, 2)
+        self.assertTrue(has_unique_solution(puzzle))
+        self.assertEqual(sum(row.count(0) for row in puzzle), 51)
+
+
+class TestDifficultyMetrics(unittest.TestCase):
+    """Pruebas de que las optimizaciones del cálculo de dificultad no cambian los puntajes"""
+
+    # (tablero base, celdas removidas) -> (dificultad, permutaciones, grafos, combinatoria)
+    EXPECTED = {
+        (0, 40): (5.2, 0.7559856024704397, 0.3330662670662671, 0.17299081830994306),
+        (1, 51): (5.5, 0.7565730337078651, 0.35552021834374775, 0.20821421395450368),
+        (2, 51): (5.5, 0.7550561797752808, 0.36442678889737695, 0.2167908114138971),
+        (3, 60): (5.9, 0.7613506076587939, 0.35390273274969175, 0.30586008321266345),
+    }
+
+    @staticmethod
+    def make_puzzle(base, removed):
+        puzzle = parse_grid(BASE_GRIDS[base])
+        for cell in random.Random(base).sample(range(81), removed):
+            puzzle[cell // 9][cell % 9] = 0
+        return puzzle
+
+    def test_scores_unchanged(self):
+        """Los puntajes coinciden exactamente con los de la implementación original"""
+        system = AdvancedDifficultySystem()
+        for (base, removed), expected in self.EXPECTED.items():
+            difficulty = system.calculate_difficulty(self.make_puzzle(base, removed))
+            self.assertEqual((difficulty, system.permutation_difficulty, system.graph_difficulty,
+                              system.combinatorial_difficulty), expected)
+
+    def test_band_permutation_counts(self):
+        """Los conteos de permutaciones de bandas y pilas coinciden con permutar y validar el tablero"""
+        system = AdvancedDifficultySystem()
+        valid = self.make_puzzle(2, 51)
+        conflicting = [row[:] for row in valid]
+        conflicting[4][0] = conflicting[4][1] = 5  # Dígito repetido en la fila 4
+        for board in (valid, conflicting):
+            for band in range(3):
+                rows = board[band * 3:band * 3 + 3]
+                expected = sum(not has_conflicts(board[:band * 3] + [rows[i] for i in perm] + board[band * 3 + 3:])
+                               for perm in itertools.permutations(range(3)))
+                self.assertEqual(system._count_valid_row_permutations(rows, board, band * 3), expected)
+                cols = [[board[r][band * 3 + i] for r in range(9)] for i in range(3)]
+                self.assertEqual(system._count_valid_column_permutations(cols, board, band * 3), expected)
+        self.assertEqual(system._count_valid_row_permutations(valid[:3], valid, 0), 6)
+        self.assertEqual(system._count_valid_row_permutations(conflicting[3:6], conflicting, 3), 0)
+        # La validez precalculada por calculate_difficulty se usa sin volver a recorrer el tablero
+        self.assertEqual(system._count_valid_row_permutations(valid[:3], valid, 0, False), 0)
+        self.assertEqual(system._count_valid_row_permutations(conflicting[3:6], conflicting, 3, True), 6)
+
+    def test_clustering_matches_graph(self):
+        """El clustering con bitsets coincide con contar triángulos sobre CONSTRAINT_GRAPH"""
+        system = AdvancedDifficultySystem()
+        puzzle = self.make_puzzle(3, 60)
+        empty = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] == 0]
+        expected = 0
+        for cell in empty:
+            neighbors = [n for n in CONSTRAINT_GRAPH[cell] if puzzle[n[0]][n[1]] == 0]
+            triangles = sum(1 for a, b in itertools.combinations(neighbors, 2) if b in CONSTRAINT_GRAPH[a])
+            expected += triangles / (len(neighbors) * (len(neighbors) - 1) / 2)
+        empty_mask = sum(1 << (r * 9 + c) for r, c in empty)
+        self.assertAlmostEqual(system._calculate_clustering_coefficient(PEER_MASK, empty_mask), expected / len(empty))
+        self.assertEqual(system._calculate_clustering_coefficient(PEER_MASK, 1 << 40), 0.0)
+
+    def test_candidate_masks(self):
+        """Las máscaras de candidatos coinciden con _get_possible_values"""
+        system = AdvancedDifficultySystem()
+        puzzle = self.make_puzzle(1, 51)
+        masks = system._candidate_masks(puzzle)
+        for cell in range(81):
+            row, col = divmod(cell, 9)
+            expected = system._get_possible_values(puzzle, row, col) if puzzle[row][col] == 0 else set()
+            self.assertEqual({digit for digit in range(1, 10) if masks[cell] >> (digit - 1) & 1}, expected)
+
+
+class TestDifficultDistribution(unittest.TestCase):
+    """Pruebas para la remoción dispersa de celdas de los puzzles difíciles"""
+
+    @staticmethod
+    def dispersion_score(cell, removed):
+        """Puntaje entero de dispersión calculado desde cero"""
+        row, col = divmod(cell, 9)
+        score = 0
+        for other in removed:
+            distance = abs(row - other // 9) + abs(col - other % 9)
+            if distance <= 2:
+                score -= 3
+            elif distance <= 4:
+                score -= 1
+        if row in (0, 8) or col in (0, 8):
+            score += 2
+        block = (row // 3, col // 3)
+        if sum(1 for other in removed if (other // 27, other % 9 // 3) == block) < 2:
+            score += 1
+        return score
+
+    def test_each_removal_has_max_score(self):
+        """Cada celda elegida tiene el mayor puntaje (o el máximo es menor que -1)"""
+        random.seed(11)
+        for _ in range(5):
+            order = _dispersed_removal_order(81)
+            self.assertEqual(sorted(order), list(range(81)))
+            for step, cell in enumerate(order):
+                removed = order[:step]
+                scores = {other: self.dispersion_score(other, removed)
+                          for other in range(81) if other not in removed}
+                best = max(scores.values())
+                if best >= -1:
+                    self.assertEqual(scores[cell], best)
+
+    def test_removes_requested_cells(self):
+        """El puzzle conserva los valores no removidos"""
+        complete = parse_grid(BASE_GRIDS[0])
+        puzzle = AdvancedDifficultySystem()._create_difficult_distribution(complete, 51)
+        empty = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] == 0]
+        self.assertEqual(len(empty), 51)
+        for r in range(9):
+            for c in range(9):
+                self.assertIn(puzzle[r][c], (0, complete[r][c]))
+
+
+class TestDigging(unittest.TestCase):
+    """Pruebas para la generación de puzzles de solución única cavando huecos"""
+
+    def test_matches_full_uniqueness_check(self):
+        """Cada remoción se acepta exactamente cuando el puzzle sigue siendo único"""
+        rng = random.Random(4)
+        solution = random_grid(rng)
+        digger = HoleDigger(solution)
+        for cell in rng.sample(range(81), 81):
+            board = [row[:] for row in digger.board]
+            board[cell // 9][cell % 9] = 0
+            self.assertEqual(digger.try_remove(cell), has_unique_solution(board))
+        self.assertTrue(has_unique_solution(digger.board))
+
+    def test_target_clues(self):
+        """Se detiene en el número de pistas pedido conservando la solución"""
+        random.seed(8)
+        solution = random_grid()
+        puzzle = dig_holes(solution, target_clues=30)
+        givens = [(r, c) for r in range(9) for c in range(9) if puzzle[r][c] != 0]
+        self.assertEqual(len(givens), 30)
+        self.assertTrue(all(puzzle[r][c] == solution[r][c] for r, c in givens))
+        self.assertTrue(has_unique_solution(puzzle))
+
+    def test_dig_strategy(self):
+        """La estrategia 'dig' genera puzzles únicos con las pistas objetivo"""
+        system = AdvancedDifficultySystem('dig', target_clues=28)
+        for difficulty in ('facil', 'dificil'):
+            puzzle, _, metrics = system.generate_advanced_puzzle(difficulty, require_unique=True, seed=2)
+            self.assertTrue(metrics['unique_solution'])
+            self.assertEqual(sum(1 for row in puzzle for num in row if num != 0), 28)
+
+    def test_unknown_strategy(self):
+        """Una estrategia desconocida es un error"""
+        with self.assertRaises(ValueError):
+            AdvancedDifficultySystem('aleatoria')
+
+
+class TestDifficultyEvaluator(unittest.TestCase):
+    """Pruebas para la evaluación incremental de la dificultad"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.difficulty_system = AdvancedDifficultySystem()
+        self.solution = parse_grid(BASE_GRIDS[1])
+        self.puzzle = self.difficulty_system._create_difficult_distribution(self.solution, 51)
+
+    def assert_matches_full(self, evaluator):
+        """El puntaje y las métricas coinciden con calculate_difficulty sobre el tablero actual"""
+        difficulty = evaluator.difficulty()
+        components = (self.difficulty_system.permutation_difficulty, self.difficulty_system.graph_difficulty,
+                      self.difficulty_system.combinatorial_difficulty)
+        reference = AdvancedDifficultySystem()
+        self.assertEqual(difficulty, reference.calculate_difficulty(evaluator.board))
+        for value, expected in zip(components, (reference.permutation_difficulty, reference.graph_difficulty,
+                                                reference.combinatorial_difficulty)):
+            self.assertAlmostEqual(value, expected, places=12)
+
+    def test_matches_full_recompute(self):
+        """Tras cada edición coincide con recalcular todo"""
+        rng = random.Random(4)
+        evaluator = DifficultyEvaluator(self.puzzle, self.difficulty_system)
+        self.assert_matches_full(evaluator)
+        for _ in range(150):
+            cell = rng.randrange(81)
+            if evaluator.board[cell // 9][cell % 9]:
+                evaluator.remove(cell)
+            else:
+                evaluator.restore(cell, self.solution[cell // 9][cell % 9])
+            self.assert_matches_full(evaluator)
+
+    def test_repeated_digit(self):
+        """Un dígito repetido anula las permutaciones igual que en calculate_difficulty"""
+        evaluator = DifficultyEvaluator(self.puzzle, self.difficulty_system)
+        row = 4
+        given = next(num for num in self.puzzle[row] if num)
+        cell = row * 9 + self.puzzle[row].index(0)
+        evaluator.restore(cell, given)
+        self.assertGreaterEqual(evaluator.duplicates, 1)  # Al menos en la fila
+        self.assert_matches_full(evaluator)
+        evaluator.remove(cell)
+        self.assertEqual(evaluator.duplicates, 0)
+        self.assert_matches_full(evaluator)
+
+    def test_remove_restore_round_trip(self):
+        """Quitar y restaurar pistas deja exactamente el estado de un evaluador nuevo"""
+        evaluator = DifficultyEvaluator(self.puzzle)
+        givens = [cell for cell in range(81) if self.puzzle[cell // 9][cell % 9]]
+        for cell in givens[:10]:
+            evaluator.remove(cell)
+        for cell in reversed(givens[:10]):
+            evaluator.restore(cell)
+        fresh = DifficultyEvaluator(self.puzzle)
+        self.assertEqual(evaluator.board, self.puzzle)
+        for name in ('candidates', 'histogram', 'degree', 'triangles', 'edges', 'clustering_total', 'pair_total'):
+            self.assertEqual(getattr(evaluator, name), getattr(fresh, name))
+
+    def test_invalid_edits(self):
+        """No se puede quitar una celda vacía ni restaurar una llena o sin número previo"""
+        evaluator = DifficultyEvaluator(self.puzzle)
+        empty = next(cell for cell in range(81) if not self.puzzle[cell // 9][cell % 9])
+        given = next(cell for cell in range(81) if self.puzzle[cell // 9][cell % 9])
+        self.assertRaises(ValueError, evaluator.remove, empty)
+        self.assertRaises(ValueError, evaluator.restore, given)
+        self.assertRaises(ValueError, evaluator.restore, empty)
+
+
+class TestAnnealing(unittest.TestCase):
+    """Pruebas para la generación por recocido simulado hacia un puntaje exacto"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.difficulty_system = AdvancedDifficultySystem()
+
+    def test_converges_on_target(self):
+        """El puzzle queda en objetivo ± tolerancia y es un subconjunto de la solución"""
+        puzzle, _, metrics = self.difficulty_system.generate_scored_puzzle(5.2, seed=1)
+        self.assertTrue(metrics['generation']['converged'])
+        self.assertLessEqual(abs(metrics['final_difficulty'] - 5.2), 0.1 + 1e-9)
+        solution = self.difficulty_system.board.solution
+        for r in range(9):
+            for c in range(9):
+                self.assertIn(puzzle[r][c], (0, solution[r][c]))
+
+    def test_unreachable_target(self):
+        """Con un objetivo inalcanzable retorna el más cercano sin pasar de max_steps"""
+        _, _, metrics = self.difficulty_system.generate_scored_puzzle(9.5, seed=2, max_steps=20)
+        self.assertFalse(metrics['generation']['converged'])
+        self.assertEqual(metrics['generation']['steps'], 20)
+
+    def test_unique_and_clue_range(self):
+        """Con require_unique todos los pasos conservan la solución única"""
+        puzzle, _, metrics = self.difficulty_system.generate_scored_puzzle(
+            9.5, require_unique=True, seed=3, max_steps=20, clue_range=(28, 32))
+        self.assertTrue(metrics['unique_solution'])
+        self.assertTrue(28 <= sum(1 for row in puzzle for num in row if num != 0) <= 32)
+
+
+class TestStream(unittest.TestCase):
+    """Pruebas para la generación perezosa y la exportación masiva"""
+
+    @staticmethod
+    def take(count, **options):
+        generator = iter_puzzles('facil', grid_generation='transform', **options)
+        try:
+            return [(entry['puzzle'], entry['solution']) for entry in itertools.islice(generator, count)]
+        finally:
+            generator.close()
+
+    def test_seed_is_reproducible_across_jobs(self):
+        """Con semilla la secuencia no depende del número de procesos"""
+        sequential = self.take(2, seed=9)
+        self.assertEqual(sequential, self.take(2, seed=9))
+        self.assertEqual(sequential, self.take(2, seed=9, jobs=2))
+        self.assertNotEqual(sequential[0], sequential[1])
+
+    def test_export_formats(self):
+        """Cada línea es un objeto JSON o un puzzle de 81 caracteres"""
+        output = io.StringIO()
+        self.assertEqual(export_puzzles(output, 2, seed=4, grid_generation='transform'), 2)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(records), 2)
+        for record in records:
+            puzzle, solution = parse_puzzle(record['puzzle']), parse_puzzle(record['solution'])
+            self.assertEqual(sum(row.count(0) for row in puzzle), 51)
+            self.assertTrue(all(puzzle[r][c] in (0, solution[r][c]) for r in range(9) for c in range(9)))
+            self.assertIn('final_difficulty', record['metrics'])
+
+        output = io.StringIO()
+        export_puzzles(output, 2, output_format='line', seed=4, grid_generation='transform')
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines, [record['puzzle'] for record in records])
+
+
+class TestSymmetry(unittest.TestCase):
+    """Pruebas para los patrones de pistas simétricos"""
+
+    def test_library_masks(self):
+        """Los patrones de la biblioteca son simétricos, balanceados y de 30 pistas"""
+        for symmetry in SYMMETRIES:
+            self.assertTrue(MASK_LIBRARY[symmetry])
+            for mask in MASK_LIBRARY[symmetry]:
+                self.assertTrue(is_symmetric(mask, symmetry))
+                self.assertTrue(is_balanced(mask))
+                self.assertEqual(mask.bit_count(), 30)
+
+    def test_unavoidable_sets(self):
+        """Vaciar un conjunto inevitable deja más de una solución"""
+        solution = random_grid(random.Random(6))
+        full = (1 << 81) - 1
+        for cells in unavoidable_sets(solution):
+            self.assertFalse(has_unique_solution(apply_mask(solution, full & ~cells)))
+
+    def test_fast_check_matches_solver(self):
+        """La comprobación sobre la máscara coincide con la búsqueda completa"""
+        rng = random.Random(7)
+        solution = random_grid(rng)
+        for symmetry in SYMMETRIES:
+            for mask in MASK_LIBRARY[symmetry][:4] + (random_symmetric_mask(symmetry, 30, rng),):
+                self.assertEqual(has_unique_mask(solution, mask),
+                                 has_unique_solution(apply_mask(solution, mask)))
+
+    def test_symmetric_strategy(self):
+        """La estrategia 'symmetric' genera puzzles simétricos de solución única"""
+        system = AdvancedDifficultySystem('symmetric', symmetry='rotation')
+        policy = GenerationPolicy(max_attempts=5)
+        puzzle, _, metrics = system.generate_advanced_puzzle('facil', require_unique=True, seed=1, policy=policy)
+        mask = sum(1 << (r * 9 + c) for r in range(9) for c in range(9) if puzzle[r][c])
+        self.assertTrue(is_symmetric(mask, 'rotation'))
+        self.assertEqual(mask.bit_count(), 30)
+        self.assertTrue(metrics['unique_solution'])
+
+        with self.assertRaises(ValueError):
+            random_symmetric_mask('espiral')
+
+
+class TestPuzzleBank(unittest.TestCase):
+    """Pruebas para el banco de puzzles en SQLite"""
+
+    def setUp(self):
+        """Configuración inicial para cada prueba"""
+        self.bank = PuzzleBank(':memory:')
+        self.entries = [generate_entry('facil'), generate_entry('dificil')]
+
+    def tearDown(self):
+        self.bank.close()
+
+    def test_insert_and_dedup(self):
+        """Los puzzles repetidos se descartan al insertar"""
+        self.assertEqual(self.bank.add_many(self.entries), 2)
+        self.assertFalse(self.bank.add(self.entries[0]))
+        self.assertEqual(len(self.bank), 2)
+
+    def test_sample_by_range(self):
+        """El muestreo por rango respeta final_difficulty y conserva la entrada completa"""
+        self.bank.add_many(self.entries)
+        for entry in self.entries:
+            value = entry['metrics']['final_difficulty']
+            sampled = self.bank.sample(value, value, count=2)
+            self.assertIn(entry, sampled)
+            self.assertTrue(all(e['metrics']['final_difficulty'] == value for e in sampled))
+
+        self.assertEqual(self.bank.sample(10.5, 11), [])
+        self.assertEqual(len(self.bank.sample(count=5)), 2)
+        classification = self.entries[0]['metrics']['classification']
+        self.assertGreaterEqual(self.bank.count(classification=classification), 1)
+
+    def test_sample_distinct_by_index(self):
+        """El muestreo devuelve puzzles distintos del rango y no siempre el mismo"""
+        entries = []
+        for i in range(20):
+            puzzle = [[0] * 9 for _ in range(9)]
+            puzzle[i // 9][i % 9] = 1
+            metrics = dict(self.entries[0]['metrics'], final_difficulty=float(i + 1))
+            entries.append(dict(self.entries[0], puzzle=puzzle, metrics=metrics))
+        self.bank.add_many(entries)
+
+        sampled = self.bank.sample(5, 9, count=10)
+        values = sorted(e['metrics']['final_difficulty'] for e in sampled)
+        self.assertEqual(values, [5.0, 6.0, 7.0, 8.0, 9.0])
+        random.seed(1)
+        drawn = {self.bank.sample(5, 9)[0]['metrics']['final_difficulty'] for _ in range(30)}
+        self.assertGreater(len(drawn), 1)
+
+    def test_sample_uniform_with_tied_scores(self):
+        """Con muchos puntajes empatados todos los puzzles del rango salen con frecuencia similar"""
+        entries = []
+        for i in range(60):
+            puzzle = [[0] * 9 for _ in range(9)]
+            puzzle[i // 9][i % 9] = 1
+            metrics = dict(self.entries[0]['metrics'], final_difficulty=[4.0, 4.1, 9.0][i % 3])
+            entries.append(dict(self.entries[0], puzzle=puzzle, metrics=metrics))
+        self.assertEqual(self.bank.add_many(entries), 60)
+
+        random.seed(2)
+        counts = {}
+        for _ in range(2000):
+            key = str(self.bank.sample(4.0, 4.1)[0]['puzzle'])
+            counts[key] = counts.get(key, 0) + 1
+        # 40 puzzles en el rango, unas 50 veces cada uno
+        self.assertEqual(len(counts), 40)
+        self.assertTrue(20 <= min(counts.values()) and max(counts.values()) <= 90)
+
+    def test_board_uses_bank(self):
+        """El tablero toma del banco un puzzle del rango objetivo"""
+        self.bank.add_many(self.entries)
+        board = SudokuBoard()
+        board.puzzle_bank = self.bank
+
+        expected = self.bank.sample_for('facil')
+        if expected is None:
+            self.skipTest("El puzzle generado quedó fuera del rango objetivo")
+        puzzle, _ = board.generate_puzzle('facil')
+        low, high = TARGET_RANGES['facil']
+        self.assertTrue(low <= board.difficulty_metrics['final_difficulty'] <= high)
+        self.assertIn(puzzle, [entry['puzzle'] for entry in self.entries])
+
 
 class TestSudokuValidator(unittest.TestCase):
     """Pruebas para la clase SudokuValidator"""